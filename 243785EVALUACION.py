@@ -1,27 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
-import numpy as np
-import pandas as pd
-from scipy import stats
-import os
+from motor_estadistico import cache_resumenes, convertir_datos, intervalo_confianza, prueba_media
+from carga_datos import ArchivoDatos, vista_previa
+from tareas import BarraTareas, EjecutorTareas
 
 
-def validar_y_convertir_datos(datos_str):
+def convertir_texto(datos):
     try:
-        if not datos_str.strip():
-            raise ValueError("No se ingresaron datos")
-        
-        datos_str = datos_str.replace('\n', ',').replace(';', ',').strip()
-        items_datos = [item.strip() for item in datos_str.split(',') if item.strip()]
-        datos = [float(item) for item in items_datos if item]
-        
-        if not datos:
-            raise ValueError("No hay valores numéricos válidos")
-            
-        return np.array(datos)
+        return convertir_datos(datos)
     except ValueError as e:
-        messagebox.showerror("Error", f"Los Datos son inválidos: {str(e)}")
-        return None
+        raise ValueError(f"Los Datos son inválidos: {str(e)}")
+
+def validar_y_convertir_datos(datos):
+    "Resumen (n, media, M2) del campo, de la caché si no cambió; lanza ValueError fuera del hilo de Tk."
+    return cache_resumenes.resumen(datos, convertir_texto)
 
 def validar_datos_muestra(datos, prueba_seleccionada):
     n = len(datos)
@@ -35,98 +27,19 @@ def validar_datos_muestra(datos, prueba_seleccionada):
 
 def calcular_intervalo_confianza_z(datos, confianza):
     "Intervalo de confianza Z con validación."
-    n = len(datos)
-    media = np.mean(datos)
-    desv_std = np.std(datos, ddof=1)
-    error_std = desv_std / np.sqrt(n)
-    z_critico = stats.norm.ppf((1 + confianza) / 2)
-    margen = z_critico * error_std
-    
-    return {
-        "inferior": media - margen,
-        "superior": media + margen,
-        "estadisticas": {
-            "n": n, "media": media, "desv_std": desv_std, 
-            "error_std": error_std, "critico": z_critico, 
-            "margen": margen, "prueba": "Z"
-        }
-    }
+    return intervalo_confianza(datos, confianza, "Z").como_dict()
 
 def calcular_intervalo_confianza_t(datos, confianza):
     "Intervalo de confianza t con validación."
-    n = len(datos)
-    media = np.mean(datos)
-    desv_std = np.std(datos, ddof=1)
-    error_std = desv_std / np.sqrt(n)
-    t_critico = stats.t.ppf((1 + confianza) / 2, df=n-1)
-    margen = t_critico * error_std
-    
-    return {
-        "inferior": media - margen,
-        "superior": media + margen,
-        "estadisticas": {
-            "n": n, "media": media, "desv_std": desv_std, 
-            "error_std": error_std, "critico": t_critico, 
-            "margen": margen, "gl": n-1, "prueba": "t"
-        }
-    }
+    return intervalo_confianza(datos, confianza, "t").como_dict()
 
 def realizar_prueba_hipotesis_z(datos, valor_nulo, alpha, direccion):
     "Prueba Z de hipótesis con validación."
-    n = len(datos)
-    media = np.mean(datos)
-    desv_std = np.std(datos, ddof=1)
-    error_std = desv_std / np.sqrt(n)
-    estadistico = (media - valor_nulo) / error_std
-    
-    if "dos colas" in direccion:
-        valor_p = 2 * (1 - stats.norm.cdf(abs(estadistico)))
-        hipotesis_alt = f"μ ≠ {valor_nulo}"
-    elif "cola izquierda" in direccion:
-        valor_p = stats.norm.cdf(estadistico)
-        hipotesis_alt = f"μ < {valor_nulo}"
-    else:  # cola derecha
-        valor_p = 1 - stats.norm.cdf(estadistico)
-        hipotesis_alt = f"μ > {valor_nulo}"
-    
-    return {
-        "estadistico": estadistico, 
-        "valor_p": valor_p,
-        "estadisticas": {
-            "n": n, "media": media, "desv_std": desv_std, 
-            "error_std": error_std, "hipotesis_alt": hipotesis_alt, 
-            "prueba": "Z"
-        }
-    }
+    return prueba_media(datos, valor_nulo, alpha, direccion, "Z").como_dict()
 
 def realizar_prueba_hipotesis_t(datos, valor_nulo, alpha, direccion):
     "Prueba t de hipótesis con validación."
-    n = len(datos)
-    gl = n - 1
-    media = np.mean(datos)
-    desv_std = np.std(datos, ddof=1)
-    error_std = desv_std / np.sqrt(n)
-    estadistico = (media - valor_nulo) / error_std
-    
-    if "dos colas" in direccion:
-        valor_p = 2 * (1 - stats.t.cdf(abs(estadistico), df=gl))
-        hipotesis_alt = f"μ ≠ {valor_nulo}"
-    elif "cola izquierda" in direccion:
-        valor_p = stats.t.cdf(estadistico, df=gl)
-        hipotesis_alt = f"μ < {valor_nulo}"
-    else:  # cola derecha
-        valor_p = 1 - stats.t.cdf(estadistico, df=gl)
-        hipotesis_alt = f"μ > {valor_nulo}"
-    
-    return {
-        "estadistico": estadistico, 
-        "valor_p": valor_p,
-        "estadisticas": {
-            "n": n, "media": media, "desv_std": desv_std, 
-            "error_std": error_std, "hipotesis_alt": hipotesis_alt, 
-            "gl": gl, "prueba": "t"
-        }
-    }
+    return prueba_media(datos, valor_nulo, alpha, direccion, "t").como_dict()
 
 def generar_resultados_intervalo(inferior, superior, estadisticas, confianza, widget_resultado):
     "Texto de resultados para intervalos de confianza."
@@ -527,14 +440,35 @@ def crear_pestanas(contenido, colores):
     
     return cuaderno, widgets_ic, widgets_prueba
 
-def cargar_datos(destino=None):
-    "Carga datos desde un archivo."
+# Columnas cargadas desde archivo, por campo de datos: (vista previa, arreglo)
+datos_cargados = {}
+
+def obtener_datos(widget):
+    "Columna cargada si el campo no fue editado; si no, el texto para convertirlo."
+    datos_str = widget.get('1.0', tk.END).strip()
+    vista, datos = datos_cargados.get(widget, (None, None))
+    if datos_str == vista:
+        return datos
+    return datos_str
+
+def mostrar_error(e):
+    "Errores de las tareas en segundo plano."
+    if isinstance(e, ValueError):
+        messagebox.showerror("Error de validación", str(e))
+    else:
+        messagebox.showerror("Error en cálculo", f"Error técnico: {str(e)}")
+
+def cargar_datos(tareas, destino=None):
+    "Carga datos desde un archivo en segundo plano."
     ruta_archivo = filedialog.askopenfilename(
         title="Seleccionar archivo de datos",
         filetypes=[
             ("Archivos CSV", "*.csv"),
             ("Archivos Excel", "*.xlsx"),
             ("Archivos Parquet", "*.parquet"),
+            ("Arreglos NumPy", "*.npy"),
+            ("Binarios float32/float64", "*.f32 *.f64"),
+            ("Archivos Arrow/Feather", "*.arrow *.feather"),
             ("Todos los archivos", "*.*")
         ]
     )
@@ -542,33 +476,30 @@ def cargar_datos(destino=None):
     if not ruta_archivo:
         return
         
-    try:
-        extension = os.path.splitext(ruta_archivo)[1].lower()
+    def leer(tarea):
+        datos = ArchivoDatos(ruta_archivo)
+        if not destino or not datos.columnas:
+            return datos, None
+        # La lectura por bloques informa su avance y se puede cancelar entre bloques
+        return datos, datos.cargar_columna(datos.columnas[0], tarea.progreso)
         
-        if extension == '.csv':
-            datos = pd.read_csv(ruta_archivo)
-        elif extension == '.xlsx':
-            datos = pd.read_excel(ruta_archivo)
-        elif extension == '.parquet':
-            datos = pd.read_parquet(ruta_archivo)
+    tareas.enviar("carga", leer, lambda resultado: mostrar_datos_cargados(destino, *resultado),
+                  lambda e: messagebox.showerror("Error", f"Error al cargar el archivo: {str(e)}"),
+                  mensaje="Cargando archivo...")
+
+def mostrar_datos_cargados(destino, datos, datos_numericos):
+    "Vista previa de la columna cargada en el campo de datos."
+    if destino:
+        destino.delete('1.0', tk.END)
+        columnas = datos.columnas
+        if len(columnas) > 0:
+            vista = vista_previa(datos_numericos, columnas[0])
+            destino.insert(tk.END, vista)
+            datos_cargados[destino] = (vista, datos_numericos)
+            messagebox.showinfo("Éxito", f"Datos cargados correctamente: {len(datos_numericos)} registros")
         else:
-            messagebox.showerror("Error", "Formato de archivo no compatible")
-            return
-            
-        if destino:
-            destino.delete('1.0', tk.END)
-            columnas_numericas = datos.select_dtypes(include=[np.number]).columns
-            if len(columnas_numericas) > 0:
-                datos_numericos = datos[columnas_numericas[0]].dropna().tolist()
-                destino.insert(tk.END, ', '.join(map(str, datos_numericos)))
-            else:
-                messagebox.showwarning("Advertencia", 
-                                      "No se encontraron columnas numéricas en el archivo")
-                
-        messagebox.showinfo("Éxito", f"Datos cargados correctamente: {len(datos)} registros")
-        
-    except Exception as e:
-        messagebox.showerror("Error", f"Error al cargar el archivo: {str(e)}")
+            messagebox.showwarning("Advertencia", 
+                                  "No se encontraron columnas numéricas en el archivo")
 
 def guardar_resultados(fuente=None):
     "Resultados en un archivo."
@@ -623,80 +554,75 @@ def main():
     contenido = ttk.Frame(contenedor_principal, style="Panel.TFrame")
     contenido.pack(side="right", fill="both", expand=True, padx=10, pady=10)
     
+    # Barra de progreso de las cargas y cálculos en segundo plano
+    barra_tareas = BarraTareas(contenido, bg=colores["claro"])
+    barra_tareas.pack(side="bottom", fill="x")
+    tareas = EjecutorTareas(raiz, barra_tareas)
+    
     # Crear pestañas y widgets
     cuaderno, widgets_ic, widgets_prueba = crear_pestanas(contenido, colores)
     
     # Configurar comandos de los botones
     def calcular_ic():
         try:
-            datos_str = widgets_ic["entrada_datos"].get("1.0", tk.END).strip()
-            datos = validar_y_convertir_datos(datos_str)
-            if datos is None:
-                return
-
+            datos = obtener_datos(widgets_ic["entrada_datos"])
             confianza = float(widgets_ic["entrada_confianza"].get()) / 100
             tipo_prueba = widgets_ic["combo_tipo_prueba"].get()
-            
-            validar_datos_muestra(datos, tipo_prueba)
+        except Exception as e:
+            mostrar_error(e)
+            return
 
+        # La conversión y el cálculo corren en segundo plano; un nuevo clic reemplaza al anterior
+        def calcular(tarea):
+            muestra = validar_y_convertir_datos(datos)
+            validar_datos_muestra(muestra, tipo_prueba)
             if "Z" in tipo_prueba:
-                resultado = calcular_intervalo_confianza_z(datos, confianza)
-            else:
-                resultado = calcular_intervalo_confianza_t(datos, confianza)
-
-            generar_resultados_intervalo(
-                resultado["inferior"], 
-                resultado["superior"], 
-                resultado["estadisticas"], 
-                confianza, 
-                widgets_ic["resultado"]
-            )
-
-        except ValueError as e:
-            messagebox.showerror("Error de validación", str(e))
-        except Exception as e:
-            messagebox.showerror("Error en cálculo", f"Error técnico: {str(e)}")
+                return calcular_intervalo_confianza_z(muestra, confianza)
+            return calcular_intervalo_confianza_t(muestra, confianza)
+
+        tareas.enviar("intervalo", calcular, lambda resultado: generar_resultados_intervalo(
+                          resultado["inferior"], 
+                          resultado["superior"], 
+                          resultado["estadisticas"], 
+                          confianza, 
+                          widgets_ic["resultado"]
+                      ), mostrar_error, mensaje="Calculando intervalo...")
 
     def calcular_prueba():
         try:
-            datos_str = widgets_prueba["entrada_datos"].get('1.0', tk.END).strip()
-            datos = validar_y_convertir_datos(datos_str)
-            if datos is None:
-                return
-
+            datos = obtener_datos(widgets_prueba["entrada_datos"])
             valor_nulo = float(widgets_prueba["entrada_nulo"].get())
             alpha = float(widgets_prueba["combo_alpha"].get())
             direccion = widgets_prueba["combo_direccion"].get()
             tipo_prueba = widgets_prueba["combo_tipo_prueba"].get()
-            
-            validar_datos_muestra(datos, tipo_prueba)
+        except Exception as e:
+            mostrar_error(e)
+            return
 
+        # La conversión y el cálculo corren en segundo plano; un nuevo clic reemplaza al anterior
+        def calcular(tarea):
+            muestra = validar_y_convertir_datos(datos)
+            validar_datos_muestra(muestra, tipo_prueba)
             if "Z" in tipo_prueba:
-                resultado = realizar_prueba_hipotesis_z(datos, valor_nulo, alpha, direccion)
-            else:
-                resultado = realizar_prueba_hipotesis_t(datos, valor_nulo, alpha, direccion)
-
-            generar_resultados_prueba(
-                resultado["estadistico"], 
-                resultado["valor_p"], 
-                resultado["estadisticas"], 
-                valor_nulo, 
-                alpha, 
-                widgets_prueba["resultado"]
-            )
-
-        except ValueError as e:
-            messagebox.showerror("Error de validación", str(e))
-        except Exception as e:
-            messagebox.showerror("Error en cálculo", f"Error técnico: {str(e)}")
+                return realizar_prueba_hipotesis_z(muestra, valor_nulo, alpha, direccion)
+            return realizar_prueba_hipotesis_t(muestra, valor_nulo, alpha, direccion)
+
+        tareas.enviar("prueba", calcular, lambda resultado: generar_resultados_prueba(
+                          resultado["estadistico"], 
+                          resultado["valor_p"], 
+                          resultado["estadisticas"], 
+                          valor_nulo, 
+                          alpha, 
+                          widgets_prueba["resultado"]
+                      ), mostrar_error, mensaje="Realizando prueba...")
 
     # Configurar eventos
     widgets_ic["boton_calcular"].config(command=calcular_ic)
-    widgets_ic["boton_cargar"].config(command=lambda: cargar_datos(widgets_ic["entrada_datos"]))
+    widgets_ic["boton_cargar"].config(command=lambda: cargar_datos(tareas, widgets_ic["entrada_datos"]))
     widgets_ic["boton_guardar"].config(command=lambda: guardar_resultados(widgets_ic["resultado"]))
     
     widgets_prueba["boton_calcular"].config(command=calcular_prueba)
-    widgets_prueba["boton_cargar"].config(command=lambda: cargar_datos(widgets_prueba["entrada_datos"]))
+    widgets_prueba["boton_cargar"].config(command=lambda: cargar_datos(tareas, widgets_prueba["entrada_datos"]))
     widgets_prueba["boton_guardar"].config(command=lambda: guardar_resultados(widgets_prueba["resultado"]))
     
     raiz.mainloop()
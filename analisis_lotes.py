@@ -0,0 +1,350 @@
+"""Análisis por lotes: intervalo y prueba de media para muchas columnas o grupos a la vez.
+
+Los resúmenes (n, media, desviación estándar) de todas las columnas se
+calculan con operaciones por columna sobre una sola matriz, y los de los
+grupos con una sola agregación de conteo, suma y suma de cuadrados. Los
+valores críticos y p se evalúan sobre arreglos de grados de libertad, sin
+recorrer las columnas ni los grupos en Python. Como cada tabla es una
+familia de pruebas, se agregan los valores p ajustados por Bonferroni,
+Holm y Benjamini–Hochberg y la decisión con cada uno.
+
+Las comparaciones de dos medias (Welch, t agrupada o pareada) de muchos
+pares de columnas o de grupos usan los mismos resúmenes: cada columna o
+grupo se resume una sola vez aunque aparezca en varios pares. Las
+proporciones (columnas booleanas o 0/1) se resumen con conteos de éxitos
+y ensayos en lugar de media y desviación estándar.
+"""
+import os
+from itertools import combinations
+
+import numpy as np
+
+from carga_datos import EXTENSIONES_MAPEADAS, ArchivoDatos, acumular_columnas_csv, contar_columna, leer_columnas
+from motor_estadistico import (DOS_COLAS, METODOS_AJUSTE, PAREADA, WELCH, WILSON, AcumuladorMedia,
+                               ajustar_valores_p, intervalos_proporcion, intervalos_vectorizados,
+                               normalizar_metodo, pruebas_dos_muestras, pruebas_dos_proporciones,
+                               pruebas_pareadas, pruebas_proporcion, pruebas_vectorizadas)
+
+
+def resumen_columnas(tabla):
+    """n, media y desviación estándar muestral de cada columna, omitiendo NaN"""
+    return resumen_matriz(tabla.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def resumen_matriz(matriz):
+    """n, media y desviación estándar muestral de cada columna de una matriz float, omitiendo NaN"""
+    validos = ~np.isnan(matriz)
+    n = validos.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media = np.where(validos, matriz, 0.0).sum(axis=0) / n
+        desviaciones = np.where(validos, matriz - media, 0.0)
+        desv_std = np.sqrt(np.square(desviaciones).sum(axis=0) / (n - 1))
+    return n, media, desv_std
+
+
+def resumen_grupos(valores, claves):
+    """Grupos, n, media y desviación estándar de los valores de cada grupo.
+
+    Usa una sola pasada de conteo, suma y suma de cuadrados por grupo
+    (np.bincount sobre los códigos de grupo). Los valores se centran antes en
+    la media global para evitar la cancelación numérica de sum(x²) - n·x̄².
+    """
+    import pandas as pd
+    valores = np.asarray(valores, dtype=np.float64)
+    codigos, grupos = pd.factorize(pd.Series(claves), sort=True)
+    validos = (codigos >= 0) & ~np.isnan(valores)
+    codigos = codigos[validos]
+    valores = valores[validos]
+    desplazamiento = valores.mean() if valores.size else 0.0
+    centrados = valores - desplazamiento
+
+    n = np.bincount(codigos, minlength=len(grupos))
+    suma = np.bincount(codigos, weights=centrados, minlength=len(grupos))
+    suma_cuadrados = np.bincount(codigos, weights=centrados * centrados, minlength=len(grupos))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media_centrada = suma / n
+        m2 = np.maximum(suma_cuadrados - suma * media_centrada, 0.0)
+        desv_std = np.sqrt(m2 / (n - 1))
+    return grupos, n, media_centrada + desplazamiento, desv_std
+
+
+def tabla_resultados(nombres, n, media, desv_std, confianza=0.95, valor_nulo=0.0, alpha=0.05,
+                     direccion=DOS_COLAS, prueba="t", etiqueta="columna", ajustes=METODOS_AJUSTE):
+    """DataFrame con el intervalo y la prueba de media de cada muestra resumida.
+
+    Por cada corrección de ajustes se agregan las columnas valor_p_<método> y
+    rechaza_<método>, tomando todas las filas de la tabla como una familia.
+    """
+    import pandas as pd
+    intervalos = intervalos_vectorizados(n, media, desv_std, confianza, prueba)
+    pruebas = pruebas_vectorizadas(n, media, desv_std, valor_nulo, alpha, direccion, prueba)
+    resultados = pd.DataFrame({
+        etiqueta: list(nombres),
+        "n": np.asarray(n, dtype=np.int64),
+        "media": intervalos["media"],
+        "desv_std": intervalos["desv_std"],
+        "error_std": intervalos["error_std"],
+        "gl": intervalos["gl"],
+        "critico_ic": intervalos["critico"],
+        "inferior": intervalos["inferior"],
+        "superior": intervalos["superior"],
+        "estadistico": pruebas["estadistico"],
+        "critico_prueba": pruebas["critico"],
+        "valor_p": pruebas["valor_p"],
+        "rechaza": pruebas["rechaza"],
+    })
+    return _agregar_ajustes(resultados, alpha, ajustes)
+
+
+def _agregar_ajustes(resultados, alpha, ajustes):
+    """Columnas valor_p_<método> y rechaza_<método> de cada corrección, con la tabla como familia"""
+    for metodo, ajustados in ajustar_valores_p(resultados["valor_p"].to_numpy(), ajustes).items():
+        resultados[f"valor_p_{metodo}"] = ajustados
+        resultados[f"rechaza_{metodo}"] = ajustados <= alpha
+    return resultados
+
+
+def analizar_columnas(tabla, confianza=0.95, valor_nulo=0.0, alpha=0.05, direccion=DOS_COLAS, prueba="t",
+                      ajustes=METODOS_AJUSTE):
+    """Intervalo de confianza y prueba de media de todas las columnas de un DataFrame numérico"""
+    n, media, desv_std = resumen_columnas(tabla)
+    return tabla_resultados(tabla.columns, n, media, desv_std, confianza, valor_nulo, alpha,
+                            direccion, prueba, ajustes=ajustes)
+
+
+def resumen_acumuladores(acumuladores):
+    """n, media y desviación estándar de cada AcumuladorMedia"""
+    n = np.array([acumulador.n for acumulador in acumuladores])
+    media = np.array([acumulador.media if acumulador.n else np.nan for acumulador in acumuladores])
+    desv_std = np.array([acumulador.desv_std for acumulador in acumuladores])
+    return n, media, desv_std
+
+
+def resumen_archivo(ruta, columnas=None, filtros=None):
+    """Columnas, n, media y desviación estándar de las columnas indicadas (por defecto las numéricas).
+
+    Los archivos que ArchivoDatos lee por bloques o mapeados en memoria se
+    resumen sin cargarlos completos: los CSV, con todas las columnas en una
+    sola pasada por bloques; los Parquet y binarios, columna por columna
+    (son columnares, así que cada columna se lee por separado de todos modos).
+    """
+    archivo = ArchivoDatos(ruta, filtros=filtros)
+    columnas = list(columnas or archivo.columnas)
+    if not columnas:
+        raise ValueError("No se encontraron columnas numéricas en el archivo")
+    if archivo.por_bloques and os.path.splitext(ruta)[1].lower() == ".csv":
+        if filtros:
+            raise ValueError("Los filtros de filas solo se admiten en archivos Parquet")
+        return (columnas, *resumen_acumuladores(acumular_columnas_csv(ruta, columnas)))
+    if archivo.por_bloques or os.path.splitext(ruta)[1].lower() in EXTENSIONES_MAPEADAS:
+        acumuladores = []
+        for columna in columnas:
+            datos = archivo.cargar_columna(columna)
+            if not isinstance(datos, AcumuladorMedia):
+                datos = AcumuladorMedia.desde_arreglo(datos)
+            acumuladores.append(datos)
+        return (columnas, *resumen_acumuladores(acumuladores))
+    return (columnas, *resumen_columnas(leer_columnas(ruta, columnas, filtros)))
+
+
+def analizar_archivo(ruta, columnas=None, filtros=None, **parametros):
+    """Analiza las columnas indicadas (por defecto todas las numéricas) de un archivo"""
+    return tabla_resultados(*resumen_archivo(ruta, columnas, filtros), **parametros)
+
+
+def analizar_grupos(tabla, columna_valor, columna_grupo, **parametros):
+    """Intervalo de confianza y prueba de media de columna_valor para cada valor de columna_grupo"""
+    grupos, n, media, desv_std = resumen_grupos(tabla[columna_valor].to_numpy(dtype=np.float64, na_value=np.nan),
+                                                tabla[columna_grupo])
+    return tabla_resultados(grupos, n, media, desv_std, etiqueta=columna_grupo, **parametros)
+
+
+def analizar_archivo_por_grupos(ruta, columna_valor, columna_grupo, filtros=None, **parametros):
+    """Lee solo la columna de valores y la de grupos del archivo y las analiza por grupo"""
+    tabla = leer_columnas(ruta, [columna_valor, columna_grupo], filtros)
+    return analizar_grupos(tabla, columna_valor, columna_grupo, **parametros)
+
+
+def tabla_comparaciones(primeros, segundos, r, alpha=0.05, ajustes=METODOS_AJUSTE, etiqueta="columna"):
+    """DataFrame con la prueba e intervalo de μ₁ - μ₂ de cada par (r: salida de pruebas_dos_muestras/pareadas)"""
+    import pandas as pd
+    resultados = pd.DataFrame({
+        f"{etiqueta}_1": list(primeros),
+        f"{etiqueta}_2": list(segundos),
+        "n_1": np.asarray(r["n1"], dtype=np.int64),
+        "n_2": np.asarray(r["n2"], dtype=np.int64),
+        "diferencia": r["diferencia"],
+        "error_std": r["error_std"],
+        "gl": r["gl"],
+        "critico_ic": r["critico_ic"],
+        "inferior": r["inferior"],
+        "superior": r["superior"],
+        "estadistico": r["estadistico"],
+        "critico_prueba": r["critico"],
+        "valor_p": r["valor_p"],
+        "rechaza": r["rechaza"],
+    })
+    return _agregar_ajustes(resultados, alpha, ajustes)
+
+
+def _comparar_resumenes(nombres, n, media, desv_std, pares, metodo, diferencia_nula, alpha, direccion,
+                        confianza, prueba, ajustes, etiqueta):
+    """Compara pares de muestras independientes ya resumidas, indexando los resúmenes por posición"""
+    posicion = {nombre: i for i, nombre in enumerate(nombres)}
+    try:
+        i = np.array([posicion[a] for a, _ in pares], dtype=np.int64)
+        j = np.array([posicion[b] for _, b in pares], dtype=np.int64)
+    except KeyError as e:
+        raise ValueError(f"No se encontró {etiqueta} {e}") from None
+    n, media, desv_std = (np.asarray(arreglo) for arreglo in (n, media, desv_std))
+    r = pruebas_dos_muestras(n[i], media[i], desv_std[i], n[j], media[j], desv_std[j], diferencia_nula,
+                             alpha, direccion, metodo, confianza, prueba)
+    return tabla_comparaciones([a for a, _ in pares], [b for _, b in pares], r, alpha, ajustes, etiqueta)
+
+
+def comparar_columnas(tabla, pares, metodo=WELCH, diferencia_nula=0.0, alpha=0.05, direccion=DOS_COLAS,
+                      confianza=0.95, prueba="t", ajustes=METODOS_AJUSTE):
+    """Prueba e intervalo de la diferencia de medias para cada par (columna_1, columna_2) de un DataFrame.
+
+    Con metodo "pareada" se usan las diferencias fila a fila (las filas con
+    algún NaN en el par se omiten); con "welch" o "agrupada", cada columna se
+    resume una sola vez con todos sus datos válidos.
+    """
+    pares = [tuple(par) for par in pares]
+    if not pares:
+        raise ValueError("No se indicaron pares de columnas para comparar")
+    if normalizar_metodo(metodo) == PAREADA:
+        faltantes = [c for par in pares for c in par if c not in tabla.columns]
+        if faltantes:
+            raise ValueError(f"No se encontró la columna '{faltantes[0]}'")
+        primeros = tabla[[a for a, _ in pares]].to_numpy(dtype=np.float64, na_value=np.nan)
+        segundos = tabla[[b for _, b in pares]].to_numpy(dtype=np.float64, na_value=np.nan)
+        n, media, desv_std = resumen_matriz(primeros - segundos)
+        r = pruebas_pareadas(n, media, desv_std, diferencia_nula, alpha, direccion, confianza, prueba)
+        return tabla_comparaciones([a for a, _ in pares], [b for _, b in pares], r, alpha, ajustes)
+    columnas = list(dict.fromkeys(c for par in pares for c in par))
+    faltantes = [c for c in columnas if c not in tabla.columns]
+    if faltantes:
+        raise ValueError(f"No se encontró la columna '{faltantes[0]}'")
+    return _comparar_resumenes(columnas, *resumen_columnas(tabla[columnas]), pares, metodo, diferencia_nula,
+                               alpha, direccion, confianza, prueba, ajustes, "columna")
+
+
+def comparar_columnas_archivo(ruta, pares, filtros=None, metodo=WELCH, diferencia_nula=0.0, alpha=0.05,
+                              direccion=DOS_COLAS, confianza=0.95, prueba="t", ajustes=METODOS_AJUSTE):
+    """comparar_columnas sobre un archivo, leyendo solo las columnas de los pares.
+
+    Las comparaciones independientes aprovechan resumen_archivo (por bloques
+    o mapeado si el archivo lo permite); las pareadas necesitan las filas
+    alineadas y leen las columnas completas.
+    """
+    pares = [tuple(par) for par in pares]
+    columnas = list(dict.fromkeys(c for par in pares for c in par))
+    if normalizar_metodo(metodo) == PAREADA:
+        return comparar_columnas(leer_columnas(ruta, columnas, filtros), pares, metodo, diferencia_nula,
+                                 alpha, direccion, confianza, prueba, ajustes)
+    return _comparar_resumenes(*resumen_archivo(ruta, columnas, filtros), pares, metodo, diferencia_nula,
+                               alpha, direccion, confianza, prueba, ajustes, "columna")
+
+
+def comparar_grupos(tabla, columna_valor, columna_grupo, pares=None, metodo=WELCH, diferencia_nula=0.0,
+                    alpha=0.05, direccion=DOS_COLAS, confianza=0.95, prueba="t", ajustes=METODOS_AJUSTE):
+    """Diferencia de medias de columna_valor entre pares de grupos (por defecto, todos los pares).
+
+    Los grupos se resumen con una sola agregación (resumen_grupos) y cada par
+    se evalúa sobre esos resúmenes. La prueba pareada no aplica entre grupos.
+    """
+    if normalizar_metodo(metodo) == PAREADA:
+        raise ValueError("La prueba pareada no aplica entre grupos: use 'welch' o 'agrupada'")
+    grupos, n, media, desv_std = resumen_grupos(
+        tabla[columna_valor].to_numpy(dtype=np.float64, na_value=np.nan), tabla[columna_grupo])
+    grupos = list(grupos)
+    pares = list(combinations(grupos, 2)) if pares is None else [tuple(par) for par in pares]
+    return _comparar_resumenes(grupos, n, media, desv_std, pares, metodo, diferencia_nula, alpha, direccion,
+                               confianza, prueba, ajustes, columna_grupo)
+
+
+def comparar_grupos_archivo(ruta, columna_valor, columna_grupo, filtros=None, **parametros):
+    """Lee solo la columna de valores y la de grupos del archivo y compara los grupos"""
+    tabla = leer_columnas(ruta, [columna_valor, columna_grupo], filtros)
+    return comparar_grupos(tabla, columna_valor, columna_grupo, **parametros)
+
+
+def tabla_proporciones(nombres, exitos, ensayos, confianza=0.95, valor_nulo=0.5, alpha=0.05, direccion=DOS_COLAS,
+                       metodo=WILSON, etiqueta="columna", ajustes=METODOS_AJUSTE):
+    """DataFrame con el intervalo (Wald, Wilson o Agresti–Coull) y la prueba z de cada proporción"""
+    import pandas as pd
+    intervalos = intervalos_proporcion(exitos, ensayos, confianza, metodo)
+    pruebas = pruebas_proporcion(exitos, ensayos, valor_nulo, alpha, direccion)
+    resultados = pd.DataFrame({
+        etiqueta: list(nombres),
+        "exitos": np.asarray(exitos, dtype=np.int64),
+        "ensayos": np.asarray(ensayos, dtype=np.int64),
+        "proporcion": pruebas["proporcion"],
+        "error_std": pruebas["error_std"],
+        "critico_ic": intervalos["critico"],
+        "inferior": intervalos["inferior"],
+        "superior": intervalos["superior"],
+        "estadistico": pruebas["estadistico"],
+        "critico_prueba": pruebas["critico"],
+        "valor_p": pruebas["valor_p"],
+        "rechaza": pruebas["rechaza"],
+    })
+    return _agregar_ajustes(resultados, alpha, ajustes)
+
+
+def contar_columnas_archivo(ruta, columnas, filtros=None):
+    """Éxitos y ensayos de cada columna binaria, contados sin convertir las columnas a float"""
+    if not columnas:
+        raise ValueError("Indique las columnas binarias (booleanas o 0/1) a analizar")
+    conteos = []
+    for columna in columnas:
+        try:
+            conteos.append(contar_columna(ruta, columna, filtros))
+        except ValueError as e:
+            raise ValueError(f"Columna '{columna}': {e}") from None
+    return np.array([c[0] for c in conteos], dtype=np.int64), np.array([c[1] for c in conteos], dtype=np.int64)
+
+
+def analizar_proporciones_archivo(ruta, columnas, filtros=None, **parametros):
+    """Intervalo y prueba z de la proporción de éxitos de cada columna binaria de un archivo"""
+    return tabla_proporciones(columnas, *contar_columnas_archivo(ruta, columnas, filtros), **parametros)
+
+
+def comparar_proporciones_archivo(ruta, pares, filtros=None, diferencia_nula=0.0, alpha=0.05, direccion=DOS_COLAS,
+                                  confianza=0.95, ajustes=METODOS_AJUSTE):
+    """Prueba z e intervalo de p₁ - p₂ para cada par de columnas binarias; cada columna se cuenta una vez.
+
+    La tabla trae los dos errores estándar: error_std_prueba (proporción
+    agrupada si diferencia_nula es 0) para el estadístico y error_std_ic
+    (varianzas por separado) para el intervalo.
+    """
+    pares = [tuple(par) for par in pares]
+    if not pares:
+        raise ValueError("No se indicaron pares de columnas para comparar")
+    columnas = list(dict.fromkeys(c for par in pares for c in par))
+    exitos, ensayos = contar_columnas_archivo(ruta, columnas, filtros)
+    posicion = {columna: i for i, columna in enumerate(columnas)}
+    i = np.array([posicion[a] for a, _ in pares], dtype=np.int64)
+    j = np.array([posicion[b] for _, b in pares], dtype=np.int64)
+    r = pruebas_dos_proporciones(exitos[i], ensayos[i], exitos[j], ensayos[j], diferencia_nula, alpha,
+                                 direccion, confianza)
+    resultados = tabla_comparaciones([a for a, _ in pares], [b for _, b in pares], r, alpha, ajustes)
+    resultados.insert(4, "proporcion_1", r["proporcion1"])
+    resultados.insert(5, "proporcion_2", r["proporcion2"])
+    resultados = resultados.rename(columns={"error_std": "error_std_ic"})
+    resultados.insert(resultados.columns.get_loc("error_std_ic"), "error_std_prueba", r["error_std_prueba"])
+    return resultados.drop(columns="gl")
+
+
+def exportar_resultados(resultados, ruta):
+    """Guarda la tabla de resultados en CSV, Excel, Parquet o JSON según la extensión"""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".xlsx":
+        resultados.to_excel(ruta, index=False)
+    elif extension == ".parquet":
+        resultados.to_parquet(ruta, index=False)
+    elif extension == ".json":
+        resultados.to_json(ruta, orient="records", force_ascii=False, indent=2)
+    else:
+        resultados.to_csv(ruta, index=False)
@@ -0,0 +1,89 @@
+"""Tiempo de arranque de cada interfaz: importaciones (-X importtime) y primera ventana.
+
+Para cada punto de entrada lanza un intérprete nuevo con -X importtime que
+ejecuta el script como __main__, pero reemplaza mainloop() por un solo
+update() que dibuja la ventana y termina. Informa el tiempo hasta la
+primera ventana medido desde fuera (incluye el arranque del intérprete),
+el tiempo total de importación y los módulos de primer nivel más pesados.
+Sin pantalla ($DISPLAY) solo se importa el script, sin ejecutar main().
+
+Uso: python benchmarks/bench_arranque.py [repeticiones]
+"""
+import os
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUNTOS_DE_ENTRADA = ("lastOne.py", "pr2.py", "243785EVALUACION.py")
+
+# Ejecuta el script hasta que su ventana se dibuja por primera vez
+PRIMERA_VENTANA = """
+import runpy, sys, tkinter
+def primera_ventana(self, n=0):
+    self.update()
+    self.destroy()
+tkinter.Misc.mainloop = primera_ventana
+sys.path.insert(0, {raiz!r})
+runpy.run_path({ruta!r}, run_name="__main__")
+"""
+
+# Sin pantalla: solo las importaciones del script
+SOLO_IMPORTAR = """
+import runpy, sys
+sys.path.insert(0, {raiz!r})
+runpy.run_path({ruta!r}, run_name="bench_arranque")
+"""
+
+
+def hay_pantalla():
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def importaciones(salida_errores):
+    """(módulo, microsegundos acumulados) de las importaciones de primer nivel según -X importtime"""
+    modulos = []
+    for linea in salida_errores.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea.split("|")
+        # Las importaciones anidadas llevan sangría en el nombre
+        if not nombre.startswith("  "):
+            modulos.append((nombre.strip(), int(acumulado)))
+    return modulos
+
+
+def medir(ruta, con_ventana):
+    plantilla = PRIMERA_VENTANA if con_ventana else SOLO_IMPORTAR
+    codigo = plantilla.format(raiz=RAIZ, ruta=ruta)
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                             capture_output=True, text=True, cwd=RAIZ)
+    segundos = time.perf_counter() - inicio
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+    return segundos, importaciones(proceso.stderr)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    con_ventana = hay_pantalla()
+    medida = "primera ventana" if con_ventana else "importación (sin pantalla)"
+    print(f"Tiempo hasta {medida}, mejor de {repeticiones}")
+    for nombre in PUNTOS_DE_ENTRADA:
+        ruta = os.path.join(RAIZ, nombre)
+        mejor, modulos = min(medir(ruta, con_ventana) for _ in range(repeticiones))
+        total = sum(acumulado for _, acumulado in modulos) / 1000
+        pesados = sorted(modulos, key=lambda m: m[1], reverse=True)[:4]
+        print(f"{nombre:<22} {mejor * 1000:8.1f} ms  importaciones {total:7.1f} ms")
+        for modulo, acumulado in pesados:
+            print(f"{'':<24}{modulo:<28} {acumulado / 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
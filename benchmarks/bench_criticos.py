@@ -0,0 +1,54 @@
+"""Compara los valores críticos de scipy.stats con los de CacheCriticos.
+
+Simula la forma de uso de las interfaces: muchas consultas con pocos
+(prueba, gl, cola, α) distintos, y el caso por lotes con un arreglo de gl.
+
+Uso: python benchmarks/bench_criticos.py [cantidad_de_consultas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_estadistico import CacheCriticos
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = np.random.default_rng(0)
+    gl = rng.integers(1, 2000, cantidad)
+    alphas = rng.choice([0.05, 0.01, 0.10, 0.037], cantidad)
+
+    inicio = time.perf_counter()
+    esperado = [stats.t.ppf(1 - a / 2, g) for g, a in zip(gl, alphas)]
+    segundos_scipy = time.perf_counter() - inicio
+
+    cache = CacheCriticos()
+    inicio = time.perf_counter()
+    obtenido = [cache.valor("t", g, "dos colas", a) for g, a in zip(gl, alphas)]
+    segundos_cache = time.perf_counter() - inicio
+    assert np.allclose(esperado, obtenido)
+
+    print(f"{cantidad} consultas escalares")
+    print(f"{'scipy.stats.t.ppf':<22} {segundos_scipy * 1e6 / cantidad:8.2f} µs/consulta")
+    print(f"{'CacheCriticos.valor':<22} {segundos_cache * 1e6 / cantidad:8.2f} µs/consulta  "
+          f"{cache.estadisticas()}")
+
+    inicio = time.perf_counter()
+    esperado = stats.t.ppf(0.975, gl)
+    segundos_scipy = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    obtenido = cache.valores("t", gl, "dos colas", 0.05)
+    segundos_cache = time.perf_counter() - inicio
+    assert np.allclose(esperado, obtenido)
+    print(f"arreglo de {cantidad} gl")
+    print(f"{'scipy.stats.t.ppf':<22} {segundos_scipy * 1000:8.2f} ms")
+    print(f"{'CacheCriticos.valores':<22} {segundos_cache * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
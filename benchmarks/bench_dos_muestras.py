@@ -0,0 +1,48 @@
+"""Pruebas de dos muestras para muchos pares: arreglos de resúmenes frente a un ciclo.
+
+pruebas_dos_muestras evalúa Welch (o la t agrupada) para todos los pares a
+la vez sobre arreglos de n, media y desviación estándar. Se compara con
+llamar a scipy.stats.ttest_ind_from_stats par por par en un tramo corto y se
+comprueba que los valores p coinciden.
+
+Uso: python benchmarks/bench_dos_muestras.py [pares]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_estadistico import pruebas_dos_muestras
+
+# Pares que se evalúan uno por uno con scipy (el ciclo es demasiado lento para todos)
+PARES_DIRECTOS = 5_000
+
+
+def main():
+    pares = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    n1, n2 = rng.integers(2, 5000, pares), rng.integers(2, 5000, pares)
+    media1, media2 = rng.normal(100, 1, pares), rng.normal(100, 1, pares)
+    desv1, desv2 = rng.uniform(1, 20, pares), rng.uniform(1, 20, pares)
+
+    from scipy import stats
+    for metodo in ("welch", "agrupada"):
+        inicio = time.perf_counter()
+        resultado = pruebas_dos_muestras(n1, media1, desv1, n2, media2, desv2, metodo=metodo)
+        vectorizado = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        directos = [stats.ttest_ind_from_stats(media1[i], desv1[i], n1[i], media2[i], desv2[i], n2[i],
+                                               equal_var=metodo == "agrupada").pvalue
+                    for i in range(PARES_DIRECTOS)]
+        estimado = (time.perf_counter() - inicio) * pares / PARES_DIRECTOS
+        assert np.allclose(resultado["valor_p"][:PARES_DIRECTOS], directos)
+        print(f"{metodo:<9} {pares} pares en {vectorizado:.2f} s; par por par con scipy "
+              f"≈ {estimado:.0f} s ({estimado / vectorizado:.0f}x más lento)")
+
+
+if __name__ == "__main__":
+    main()
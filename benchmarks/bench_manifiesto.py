@@ -0,0 +1,66 @@
+"""Escalamiento de manifiesto.py con el número de procesos.
+
+Genera varios CSV con columnas numéricas y un manifiesto con varios
+trabajos (distintos μ₀ y α) por cada columna, y lo ejecuta con 1, 2, 4, ...
+procesos hasta el número de núcleos. La lectura de cada archivo domina el
+tiempo; cada bloque lee juntas las columnas de sus trabajos y los que
+repiten columna se resuelven desde la caché del proceso.
+
+Uso: python benchmarks/bench_manifiesto.py [directorio] [archivos] [filas_por_archivo]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifiesto import EscritorResultados, ejecutar_manifiesto
+
+COLUMNAS = 8
+TRABAJOS_POR_COLUMNA = 20
+
+
+def generar(directorio, archivos, filas):
+    import pandas as pd
+    os.makedirs(directorio, exist_ok=True)
+    rng = np.random.default_rng(0)
+    rutas = []
+    for i in range(archivos):
+        ruta = os.path.join(directorio, f"datos_{i}.csv")
+        if not os.path.exists(ruta):
+            pd.DataFrame({f"m{j}": rng.normal(100 + j, 15, filas) for j in range(COLUMNAS)}).to_csv(ruta, index=False)
+        rutas.append(ruta)
+    trabajos = [{"ruta": ruta, "columna": f"m{j}", "mu0": 100 + j + k * 0.1, "alpha": 0.05, "prueba": "t"}
+                for ruta in rutas for j in range(COLUMNAS) for k in range(TRABAJOS_POR_COLUMNA)]
+    for posicion, trabajo in enumerate(trabajos):
+        trabajo["id"] = posicion + 1
+    return trabajos
+
+
+def main():
+    directorio = sys.argv[1] if len(sys.argv) > 1 else tempfile.mkdtemp(prefix="bench_manifiesto_")
+    archivos = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    filas = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+    trabajos = generar(directorio, archivos, filas)
+    nucleos = os.cpu_count() or 1
+    print(f"{len(trabajos)} trabajos sobre {archivos} archivos de {filas} filas, {nucleos} núcleos")
+
+    procesos = sorted({2 ** i for i in range(nucleos.bit_length()) if 2 ** i <= nucleos} | {nucleos})
+    base = None
+    for cantidad in procesos:
+        inicio = time.perf_counter()
+        # Bloques de una columna (20 trabajos) para repartir el trabajo entre procesos
+        total, errores = ejecutar_manifiesto(trabajos, EscritorResultados(io.StringIO()), cantidad,
+                                             TRABAJOS_POR_COLUMNA)
+        segundos = time.perf_counter() - inicio
+        base = base or segundos
+        print(f"{cantidad:3d} procesos {segundos:8.2f} s  aceleración {base / segundos:5.2f}x  "
+              f"({total} trabajos, {errores} con error)")
+
+
+if __name__ == "__main__":
+    main()
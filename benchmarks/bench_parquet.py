@@ -0,0 +1,98 @@
+"""Tiempo y memoria de la lectura de Parquet: archivo completo vs. columna vs. grupos de filas.
+
+Genera (si no existe) un Parquet ancho con una columna 'region' y varias
+columnas numéricas, y mide cada modo de lectura en un proceso aparte para
+que el pico de memoria (ru_maxrss) de uno no contamine al siguiente. La
+generación también corre aparte porque Linux conserva ru_maxrss tras exec.
+
+Sin ruta, el archivo se genera en la carpeta temporal del sistema y se
+borra al terminar; una ruta indicada se conserva para reutilizarla.
+
+Uso: python benchmarks/bench_parquet.py [ruta.parquet] [tamaño_en_GB]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+COLUMNAS_NUMERICAS = 16
+FILAS_POR_GRUPO = 1_000_000
+REGIONES = np.array(["MX", "US", "BR", "AR", "CO"])
+
+
+def generar(ruta, gigabytes):
+    """Escribe el archivo grupo por grupo para no tenerlo completo en memoria"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    bytes_por_fila = COLUMNAS_NUMERICAS * 8 + 2
+    grupos = max(1, int(gigabytes * 1e9 / bytes_por_fila / FILAS_POR_GRUPO))
+    rng = np.random.default_rng(0)
+    escritor = None
+    for grupo in range(grupos):
+        # Regiones ordenadas por grupo para que las estadísticas de los grupos sirvan al filtro
+        region = np.repeat(REGIONES[grupo % len(REGIONES)], FILAS_POR_GRUPO)
+        columnas = {"region": pa.array(region)}
+        for i in range(COLUMNAS_NUMERICAS):
+            columnas[f"m{i}"] = pa.array(rng.normal(100 + i, 15, FILAS_POR_GRUPO))
+        tabla = pa.table(columnas)
+        if escritor is None:
+            escritor = pq.ParquetWriter(ruta, tabla.schema)
+        escritor.write_table(tabla, row_group_size=FILAS_POR_GRUPO)
+    escritor.close()
+
+
+def medir(modo, ruta):
+    """Ejecuta un modo de lectura e imprime segundos y pico de memoria en MB"""
+    import pandas as pd
+    from carga_datos import acumular_columna_parquet, leer_columna
+    from motor_estadistico import intervalo_confianza
+
+    inicio = time.perf_counter()
+    if modo == "completo":
+        tabla = pd.read_parquet(ruta)
+        datos = tabla["m0"].to_numpy()
+    elif modo == "columna":
+        datos = leer_columna(ruta, "m0")
+    elif modo == "grupos":
+        datos = acumular_columna_parquet(ruta, "m0")
+    else:
+        datos = acumular_columna_parquet(ruta, "m0", [("region", "==", "MX")])
+    resultado = intervalo_confianza(datos, 0.95)
+    segundos = time.perf_counter() - inicio
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{modo:<16} {segundos:8.2f} s  pico {pico:9.1f} MB  n={resultado.n}  "
+          f"IC=[{resultado.inferior:.4f}, {resultado.superior:.4f}]")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--medir":
+        medir(sys.argv[2], sys.argv[3])
+        return
+    if len(sys.argv) > 2 and sys.argv[1] == "--generar":
+        generar(sys.argv[2], float(sys.argv[3]))
+        return
+    temporal = len(sys.argv) < 2
+    ruta = os.path.join(tempfile.gettempdir(), "bench_parquet.parquet") if temporal else sys.argv[1]
+    gigabytes = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    try:
+        if not os.path.exists(ruta):
+            print(f"Generando {ruta} (~{gigabytes} GB)...")
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--generar", ruta, str(gigabytes)],
+                           check=True)
+        print(f"{ruta}: {os.path.getsize(ruta) / 1e9:.2f} GB en disco")
+        for modo in ("completo", "columna", "grupos", "grupos+filtro"):
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", modo, ruta], check=True)
+    finally:
+        if temporal and os.path.exists(ruta):
+            os.remove(ruta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compara convertir_datos con el parseo original de parse_data / validar_y_convertir_datos.
+
+Uso: python benchmarks/bench_parseo.py [cantidad_de_valores]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_estadistico import convertir_datos
+
+
+def parse_data_original(data_str):
+    """Versión original de parse_data en lastOne.py (sin messagebox)"""
+    clean_data = data_str.replace(';', ',').replace('\t', ',').replace('\n', ',')
+    data_list = [float(x.strip()) for x in clean_data.split(',') if x.strip()]
+    return np.array(data_list)
+
+
+def medir(funcion, texto, repeticiones=5):
+    """Mejor tiempo en segundos y pico de memoria en MB de funcion(texto)"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    tracemalloc.start()
+    funcion(texto)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mejor, pico / 1e6
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    valores = np.random.default_rng(0).normal(50, 10, cantidad)
+    texto = ", ".join(map(str, valores))
+    print(f"{cantidad} valores, {len(texto) / 1e6:.1f} MB de texto")
+
+    assert np.array_equal(parse_data_original(texto), convertir_datos(texto))
+
+    for nombre, funcion in [("parse_data original", parse_data_original),
+                            ("convertir_datos", convertir_datos)]:
+        segundos, pico = medir(funcion, texto)
+        print(f"{nombre:<22} {segundos * 1000:9.1f} ms  pico {pico:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Proporciones desde columnas binarias: conteos frente a pasar la columna a float64.
+
+contar_exitos cuenta los 1 de una columna booleana (1 byte por dato) o
+empaquetada en bits (1 bit por dato, np.packbits) sin convertirla. Se
+compara con el camino de la media continua, que necesita la columna como
+float64 (8 bytes por dato), y se comprueba que los conteos coinciden.
+También se cuenta una columna booleana de Parquet con contar_columna.
+
+Uso: python benchmarks/bench_proporciones.py [filas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from carga_datos import contar_columna
+from motor_estadistico import AcumuladorMedia, contar_exitos
+
+
+def medir(nombre, funcion, bytes_por_dato):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    print(f"    {nombre:<28} {(time.perf_counter() - inicio) * 1000:8.1f} ms  ({bytes_por_dato} por dato)")
+    return resultado
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000_000
+    rng = np.random.default_rng(0)
+    conversiones = rng.random(filas) < 0.03
+    empaquetadas = np.packbits(conversiones)
+    print(f"{filas} filas, tasa de conversión 3 %")
+
+    esperado = (int(conversiones.sum()), filas)
+    assert medir("booleana (count_nonzero)", lambda: contar_exitos(conversiones), "1 byte") == esperado
+    assert medir("bits empaquetados", lambda: contar_exitos(empaquetadas, n=filas), "1 bit") == esperado
+    acumulador = medir("float64 + media (continuo)",
+                       lambda: AcumuladorMedia.desde_arreglo(conversiones.astype(np.float64)), "8 bytes")
+    assert round(acumulador.media * filas) == esperado[0]
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "conversiones.parquet")
+        pq.write_table(pa.table({"convirtio": conversiones}), ruta, row_group_size=1_000_000)
+        assert medir("Parquet booleano (pyarrow)", lambda: contar_columna(ruta, "convirtio"), "1 bit") == esperado
+
+
+if __name__ == "__main__":
+    main()
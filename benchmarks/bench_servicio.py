@@ -0,0 +1,118 @@
+"""Rendimiento de servicio_http.py con clientes locales concurrentes.
+
+Levanta el servicio en 127.0.0.1 (puerto libre) dentro del mismo proceso y
+abre varias conexiones persistentes que envían solicitudes de intervalo y de
+prueba a la vez. Compara resolver cada solicitud por separado (lotes de 1)
+con juntarlas en lotes, verifica los resultados contra
+intervalo_desde_resumen / prueba_desde_resumen e imprime /estadisticas.
+También mide una solicitud con una lista de 10 000 intervalos.
+
+Uso: python benchmarks/bench_servicio.py [conexiones] [solicitudes_por_conexion]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_estadistico import intervalo_desde_resumen, prueba_desde_resumen
+from servicio_http import MAXIMO_POR_LOTE, ServicioEstadistico
+
+ELEMENTOS_LISTA = 10_000
+
+
+async def solicitar(lector, escritor, metodo, ruta, cuerpo=None):
+    """(estado, JSON) de una solicitud HTTP/1.1 por una conexión abierta"""
+    datos = b"" if cuerpo is None else json.dumps(cuerpo).encode("utf-8")
+    escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(datos)}\r\n\r\n".encode("latin-1") + datos)
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    longitud = 0
+    while (linea := await lector.readline()) != b"\r\n":
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        if nombre.lower() == "content-length":
+            longitud = int(valor)
+    return estado, json.loads(await lector.readexactly(longitud))
+
+
+async def cliente(puerto, solicitudes, semilla):
+    rng = np.random.default_rng(semilla)
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    respuestas = []
+    for i in range(solicitudes):
+        cuerpo = {"n": int(rng.integers(5, 500)), "media": float(rng.normal(100, 5)),
+                  "desv_std": float(rng.uniform(1, 20)), "prueba": "t"}
+        if i % 2:
+            cuerpo.update(mu0=100.0, alpha=0.05, direccion="dos-colas")
+            respuestas.append((cuerpo, await solicitar(lector, escritor, "POST", "/prueba", cuerpo)))
+        else:
+            cuerpo.update(confianza=95)
+            respuestas.append((cuerpo, await solicitar(lector, escritor, "POST", "/intervalo", cuerpo)))
+    escritor.close()
+    return respuestas
+
+
+def verificar(cuerpo, estado, respuesta):
+    assert estado == 200, respuesta
+    n, media, desv_std = cuerpo["n"], cuerpo["media"], cuerpo["desv_std"]
+    if "confianza" in cuerpo:
+        esperado = intervalo_desde_resumen(n, media, desv_std, 0.95, "t")
+        assert np.isclose(respuesta["inferior"], esperado.inferior)
+        assert np.isclose(respuesta["superior"], esperado.superior)
+    else:
+        esperado = prueba_desde_resumen(n, media, desv_std, 100.0, 0.05, "dos colas", "t")
+        assert np.isclose(respuesta["valor_p"], esperado.valor_p)
+        assert respuesta["rechaza"] == esperado.rechaza
+
+
+async def medir(conexiones, solicitudes, maximo_por_lote):
+    servicio = ServicioEstadistico(maximo_por_lote=maximo_por_lote)
+    servidor = await servicio.iniciar("127.0.0.1", 0)
+    puerto = servidor.sockets[0].getsockname()[1]
+    async with servidor:
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*(cliente(puerto, solicitudes, i) for i in range(conexiones)))
+        segundos = time.perf_counter() - inicio
+        for respuestas in resultados:
+            for cuerpo, (estado, respuesta) in respuestas:
+                verificar(cuerpo, estado, respuesta)
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        _, estadisticas = await solicitar(lector, escritor, "GET", "/estadisticas")
+        # Una sola solicitud con una lista grande: aquí pesa más el cálculo que el HTTP
+        rng = np.random.default_rng(0)
+        lista = [{"n": int(n), "media": float(m), "desv_std": float(d), "confianza": 95}
+                 for n, m, d in zip(rng.integers(5, 500, ELEMENTOS_LISTA), rng.normal(100, 5, ELEMENTOS_LISTA),
+                                    rng.uniform(1, 20, ELEMENTOS_LISTA))]
+        inicio_lista = time.perf_counter()
+        estado, respuesta = await solicitar(lector, escritor, "POST", "/intervalo", lista)
+        segundos_lista = time.perf_counter() - inicio_lista
+        assert estado == 200 and len(respuesta) == ELEMENTOS_LISTA
+        escritor.close()
+        # Deja que el servidor atienda el cierre de las conexiones antes de terminar
+        await asyncio.sleep(0.05)
+    return segundos, segundos_lista, estadisticas
+
+
+def main():
+    conexiones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    solicitudes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    total = conexiones * solicitudes
+    print(f"{conexiones} conexiones x {solicitudes} solicitudes = {total}")
+    for maximo_por_lote, nombre in ((1, "sin lotes"), (MAXIMO_POR_LOTE, "con lotes")):
+        segundos, segundos_lista, estadisticas = asyncio.run(medir(conexiones, solicitudes, maximo_por_lote))
+        lotes = estadisticas["lotes"]
+        print(f"{nombre:<10} {total / segundos:9.0f} solicitudes/s  "
+              f"lotes {lotes['lotes']} (promedio {lotes['lote_promedio']:.1f}, máximo {lotes['lote_maximo']})")
+        print(f"    lista de {ELEMENTOS_LISTA} intervalos en una solicitud: {segundos_lista * 1000:.1f} ms")
+        for ruta, datos in estadisticas["rutas"].items():
+            print(f"    {ruta:<12} p50 {datos['p50_ms']:6.2f} ms  p90 {datos['p90_ms']:6.2f} ms  "
+                  f"p99 {datos['p99_ms']:6.2f} ms  máx {datos['max_ms']:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
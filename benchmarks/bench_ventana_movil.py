@@ -0,0 +1,53 @@
+"""Intervalos por ventana móvil: sumas acumuladas frente a recalcular cada ventana.
+
+intervalos_moviles obtiene la suma y la suma de cuadrados de cada ventana
+como diferencia de sumas acumuladas (O(1) por paso). Se compara con
+recalcular media y desviación de cada ventana sobre sliding_window_view
+(O(ventana) por paso) en un tramo corto, y se comprueba que ambos coinciden.
+
+Uso: python benchmarks/bench_ventana_movil.py [filas] [ventana]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_estadistico import intervalos_moviles
+
+# Ventanas que se recalculan una por una (el método directo es demasiado lento para la serie completa)
+VENTANAS_DIRECTAS = 20_000
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    ventana = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    rng = np.random.default_rng(0)
+    # Serie con deriva lenta y un nivel alejado de 0, como una exportación de sensores
+    serie = 1000 + np.cumsum(rng.normal(0, 0.01, filas)) + rng.normal(0, 1, filas)
+
+    inicio = time.perf_counter()
+    resultado = intervalos_moviles(serie, ventana, 0.95)
+    segundos = time.perf_counter() - inicio
+    print(f"{filas} filas, ventana {ventana}: {len(resultado['media'])} intervalos en {segundos:.2f} s")
+
+    tramo = serie[:VENTANAS_DIRECTAS + ventana - 1]
+    inicio = time.perf_counter()
+    vistas = sliding_window_view(tramo, ventana)
+    media = vistas.mean(axis=1)
+    desv_std = vistas.std(axis=1, ddof=1)
+    directo = time.perf_counter() - inicio
+    estimado = directo * len(resultado["media"]) / VENTANAS_DIRECTAS
+    print(f"recalculando cada ventana: {VENTANAS_DIRECTAS} intervalos en {directo:.2f} s "
+          f"(≈ {estimado:.0f} s para la serie completa, {estimado / segundos:.0f}x más lento)")
+
+    error_media = np.max(np.abs(resultado["media"][:VENTANAS_DIRECTAS] - media))
+    error_desv = np.max(np.abs(resultado["desv_std"][:VENTANAS_DIRECTAS] - desv_std) / desv_std)
+    print(f"diferencia máxima: media {error_media:.2e}, desviación (relativa) {error_desv:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Calculadora estadística por línea de comandos, sin interfaz gráfica.
+
+Calcula el intervalo de confianza y la prueba de media de una o varias
+columnas de un archivo (por defecto todas las numéricas), o de una columna
+por cada grupo de otra; con --par o --comparar-grupos compara dos medias
+(Welch, t agrupada o pareada) con su intervalo para la diferencia. Con
+--proporcion, las columnas son binarias (booleanas o 0/1) y se analizan
+como proporciones a partir de sus conteos. Escribe la tabla de resultados en CSV o JSON por
+la salida estándar, o en el archivo indicado (CSV, Excel, Parquet o JSON
+según la extensión). No importa tkinter, así que funciona en servidores
+sin pantalla.
+
+Ejemplos:
+    python calculadora_cli.py datos.csv
+    python calculadora_cli.py datos.parquet -c ingreso -c gasto --prueba Z --mu0 100 --direccion derecha
+    python calculadora_cli.py ventas.parquet -c monto --grupo region --filtro "anio >= 2020" -o resultados.json
+    python calculadora_cli.py sensores.parquet --ajuste bh
+    python calculadora_cli.py ab.csv --par control,tratamiento --par control,tratamiento_2 --metodo welch
+    python calculadora_cli.py ventas.parquet -c monto --grupo region --comparar-grupos
+    python calculadora_cli.py visitas.parquet --proporcion -c convirtio --mu0 0.03 --intervalo wilson
+    python calculadora_cli.py ab.parquet --proporcion --par convirtio_a,convirtio_b
+"""
+import argparse
+import sys
+
+from analisis_lotes import (analizar_archivo, analizar_archivo_por_grupos, analizar_proporciones_archivo,
+                            comparar_columnas_archivo, comparar_grupos_archivo, comparar_proporciones_archivo,
+                            exportar_resultados)
+from carga_datos import interpretar_filtro
+from motor_estadistico import (COLA_DERECHA, COLA_IZQUIERDA, DOS_COLAS, METODOS_AJUSTE, METODOS_DOS_MUESTRAS,
+                               METODOS_PROPORCION)
+
+DIRECCIONES = {"dos-colas": DOS_COLAS, "izquierda": COLA_IZQUIERDA, "derecha": COLA_DERECHA}
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Intervalos de confianza y pruebas de media desde un archivo, sin interfaz gráfica.")
+    parser.add_argument("ruta", help="archivo CSV, Excel, Parquet, .npy, .f32/.f64 o Arrow/Feather")
+    parser.add_argument("-c", "--columna", action="append", dest="columnas", metavar="COLUMNA",
+                        help="columna a analizar; se puede repetir (por defecto, todas las numéricas)")
+    parser.add_argument("--grupo", help="analiza la columna indicada por cada valor de esta columna")
+    parser.add_argument("--par", action="append", dest="pares", metavar="COL_1,COL_2",
+                        help="compara la media de COL_1 con la de COL_2; se puede repetir")
+    parser.add_argument("--comparar-grupos", action="store_true",
+                        help="con --grupo, compara la media de cada par de grupos")
+    parser.add_argument("--metodo", choices=list(METODOS_DOS_MUESTRAS), default="welch",
+                        help="comparación de dos medias: welch, agrupada (Student) o pareada (por defecto welch)")
+    parser.add_argument("--proporcion", action="store_true",
+                        help="analiza columnas binarias (booleanas o 0/1) como proporciones con prueba z")
+    parser.add_argument("--intervalo", choices=list(METODOS_PROPORCION), default="wilson",
+                        help="intervalo para una proporción (por defecto wilson)")
+    parser.add_argument("--prueba", choices=["Z", "t"], default="t", help="distribución (por defecto t)")
+    parser.add_argument("--confianza", type=float, default=95,
+                        help="nivel de confianza en %% o en (0, 1) (por defecto 95)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="nivel de significancia (por defecto 0.05)")
+    parser.add_argument("--direccion", choices=list(DIRECCIONES), default="dos-colas",
+                        help="hipótesis alternativa (por defecto dos-colas)")
+    parser.add_argument("--mu0", type=float, default=None,
+                        help="valor de la hipótesis nula; en las comparaciones, de μ₁ - μ₂ (por defecto 0, "
+                             "o p₀ = 0.5 con --proporcion)")
+    parser.add_argument("--filtro", action="append", default=[], metavar="EXPRESION",
+                        help="filtro de filas de Parquet, p. ej. \"region == 'MX'\"; se puede repetir")
+    parser.add_argument("--ajuste", action="append", dest="ajustes", metavar="METODO",
+                        choices=list(METODOS_AJUSTE) + ["ninguno"],
+                        help="corrección por pruebas múltiples (bonferroni, holm, bh o ninguno); "
+                             "se puede repetir (por defecto, las tres)")
+    parser.add_argument("-o", "--salida", help="archivo de resultados (.csv, .xlsx, .parquet o .json)")
+    parser.add_argument("--formato", choices=["csv", "json"], default="csv",
+                        help="formato en la salida estándar (por defecto csv)")
+    return parser
+
+
+def validar_argumentos(parser, argumentos):
+    """Confianza como proporción y α dentro de (0, 1); termina con error si no lo están"""
+    confianza = argumentos.confianza / 100 if argumentos.confianza > 1 else argumentos.confianza
+    if not 0 < confianza < 1:
+        parser.error("el nivel de confianza debe estar en (0, 1) o en % entre 1 y 100 (sin incluirlos)")
+    if not 0 < argumentos.alpha < 1:
+        parser.error("el nivel de significancia (α) debe estar entre 0 y 1")
+    if argumentos.grupo and len(argumentos.columnas or []) != 1:
+        parser.error("--grupo requiere exactamente una --columna")
+    if argumentos.comparar_grupos and not argumentos.grupo:
+        parser.error("--comparar-grupos requiere --grupo")
+    if argumentos.pares and (argumentos.grupo or argumentos.columnas):
+        parser.error("--par no se combina con --columna ni --grupo")
+    if argumentos.proporcion and (argumentos.grupo or not (argumentos.columnas or argumentos.pares)):
+        parser.error("--proporcion requiere --columna o --par (y no admite --grupo)")
+    if argumentos.mu0 is None:
+        argumentos.mu0 = 0.5 if argumentos.proporcion and not argumentos.pares else 0.0
+    if argumentos.pares:
+        argumentos.pares = [par.split(",") for par in argumentos.pares]
+        if any(len(par) != 2 for par in argumentos.pares):
+            parser.error("cada --par debe tener la forma COL_1,COL_2")
+    return confianza
+
+
+def ejecutar(argumentos, confianza):
+    """DataFrame de resultados según los argumentos"""
+    parametros = {
+        "confianza": confianza, "valor_nulo": argumentos.mu0, "alpha": argumentos.alpha,
+        "direccion": DIRECCIONES[argumentos.direccion], "prueba": argumentos.prueba,
+        "ajustes": [metodo for metodo in argumentos.ajustes or METODOS_AJUSTE if metodo != "ninguno"],
+    }
+    filtros = [interpretar_filtro(filtro) for filtro in argumentos.filtro] or None
+    if argumentos.proporcion:
+        parametros.pop("prueba")
+        if argumentos.pares:
+            parametros["diferencia_nula"] = parametros.pop("valor_nulo")
+            return comparar_proporciones_archivo(argumentos.ruta, argumentos.pares, filtros, **parametros)
+        return analizar_proporciones_archivo(argumentos.ruta, argumentos.columnas, filtros,
+                                             metodo=argumentos.intervalo, **parametros)
+    if argumentos.pares or argumentos.comparar_grupos:
+        parametros["diferencia_nula"] = parametros.pop("valor_nulo")
+        parametros["metodo"] = argumentos.metodo
+        if argumentos.pares:
+            return comparar_columnas_archivo(argumentos.ruta, argumentos.pares, filtros, **parametros)
+        return comparar_grupos_archivo(argumentos.ruta, argumentos.columnas[0], argumentos.grupo,
+                                       filtros=filtros, **parametros)
+    if argumentos.grupo:
+        return analizar_archivo_por_grupos(argumentos.ruta, argumentos.columnas[0], argumentos.grupo,
+                                           filtros=filtros, **parametros)
+    return analizar_archivo(argumentos.ruta, argumentos.columnas, filtros, **parametros)
+
+
+def main(args=None):
+    parser = crear_parser()
+    argumentos = parser.parse_args(args)
+    confianza = validar_argumentos(parser, argumentos)
+
+    try:
+        resultados = ejecutar(argumentos, confianza)
+        if argumentos.salida:
+            exportar_resultados(resultados, argumentos.salida)
+        elif argumentos.formato == "json":
+            resultados.to_json(sys.stdout, orient="records", force_ascii=False, indent=2)
+            sys.stdout.write("\n")
+        else:
+            resultados.to_csv(sys.stdout, index=False)
+    except (ValueError, KeyError, OSError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
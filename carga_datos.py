@@ -0,0 +1,509 @@
+"""Lectura de archivos de datos sin interfaz gráfica.
+
+Las columnas se devuelven como arreglos float64 para pasarlas directamente
+al motor estadístico, sin convertirlas a texto y volver a parsearlas. Los
+CSV y Parquet muy grandes se leen por bloques (grupos de filas en Parquet)
+y solo se conservan sus estadísticos suficientes (AcumuladorMedia), de modo
+que la memoria usada no depende del tamaño del archivo. Los formatos
+binarios (.npy, float32/float64 sin encabezado y Arrow/Feather) se mapean en
+memoria y se recorren por bloques sin copiarlos; de los Arrow/Feather solo
+se lee la columna pedida, lote por lote. Si el archivo está comprimido
+(LZ4 o ZSTD, lo habitual en Feather v2), cada lote de esa columna se
+descomprime al leerlo, pero nunca el archivo completo. Las columnas binarias
+(booleanas o 0/1) de las proporciones se reducen a conteos de éxitos y
+ensayos sin convertirlas a float64.
+
+pandas y pyarrow se importan dentro de las funciones que leen archivos,
+para no cargarlos al arrancar las interfaces.
+"""
+import os
+
+import numpy as np
+
+from motor_estadistico import AcumuladorMedia, contar_exitos
+
+# Binarios sin encabezado: un solo arreglo de valores del tipo indicado
+TIPOS_BINARIOS = {".f32": np.float32, ".f64": np.float64}
+EXTENSIONES_MAPEADAS = (".npy", ".arrow", ".feather") + tuple(TIPOS_BINARIOS)
+EXTENSIONES_SOPORTADAS = (".csv", ".xlsx", ".parquet") + EXTENSIONES_MAPEADAS
+
+# Los CSV y Parquet más grandes que esto se leen por bloques en lugar de cargarse completos
+TAMANO_MAXIMO_EN_MEMORIA = 256 * 1024 * 1024
+FILAS_POR_BLOQUE = 500_000
+# Filas leídas para detectar los tipos de las columnas de un CSV o Excel
+FILAS_MUESTRA = 2000
+
+
+def _extension(ruta):
+    return os.path.splitext(ruta)[1].lower()
+
+
+def leer_tabla(ruta):
+    """Lee un archivo CSV, Excel o Parquet en un DataFrame"""
+    import pandas as pd
+    extension = _extension(ruta)
+    if extension == ".csv":
+        return pd.read_csv(ruta)
+    if extension == ".xlsx":
+        return pd.read_excel(ruta)
+    if extension == ".parquet":
+        return pd.read_parquet(ruta)
+    raise ValueError("Formato de archivo no soportado")
+
+
+def columnas_numericas(tabla, booleanas=False):
+    """Nombres de las columnas numéricas del DataFrame (y las booleanas, si se pide)"""
+    return list(tabla.select_dtypes(include=[np.number, "bool"] if booleanas else [np.number]).columns)
+
+
+def _campo_numerico(campo, booleanas=False):
+    import pyarrow.types as tipos
+    return (tipos.is_integer(campo.type) or tipos.is_floating(campo.type)
+            or booleanas and tipos.is_boolean(campo.type))
+
+
+def columnas_numericas_archivo(ruta, booleanas=False):
+    """Columnas numéricas obtenidas solo del esquema del archivo, sin leerlo completo.
+
+    Parquet: el pie del archivo. Excel y CSV: las primeras FILAS_MUESTRA filas.
+    Con booleanas también se incluyen las columnas booleanas (para proporciones).
+    """
+    import pandas as pd
+    extension = _extension(ruta)
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+        return [campo.name for campo in pq.read_schema(ruta) if _campo_numerico(campo, booleanas)]
+    if extension == ".csv":
+        return columnas_numericas(pd.read_csv(ruta, nrows=FILAS_MUESTRA), booleanas)
+    if extension == ".xlsx":
+        return columnas_numericas(pd.read_excel(ruta, nrows=FILAS_MUESTRA), booleanas)
+    if extension in EXTENSIONES_MAPEADAS:
+        return columnas_mapeadas(ruta, booleanas)
+    raise ValueError("Formato de archivo no soportado")
+
+
+def columnas_archivo(ruta):
+    """Nombres de todas las columnas del archivo (numéricas o no), leyendo solo el encabezado"""
+    import pandas as pd
+    extension = _extension(ruta)
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(ruta).names)
+    if extension == ".csv":
+        return list(pd.read_csv(ruta, nrows=0).columns)
+    if extension == ".xlsx":
+        return list(pd.read_excel(ruta, nrows=0).columns)
+    if extension in (".arrow", ".feather"):
+        return list(_abrir_arrow(ruta).schema.names)
+    if extension in EXTENSIONES_MAPEADAS:
+        return columnas_mapeadas(ruta)
+    raise ValueError("Formato de archivo no soportado")
+
+
+def leer_columnas(ruta, columnas, filtros=None):
+    """Lee solo las columnas indicadas del archivo en un DataFrame"""
+    import pandas as pd
+    extension = _extension(ruta)
+    if filtros and extension != ".parquet":
+        raise ValueError("Los filtros de filas solo se admiten en archivos Parquet")
+    if extension == ".parquet":
+        return pd.read_parquet(ruta, columns=list(columnas), filters=filtros or None)
+    if extension == ".csv":
+        return pd.read_csv(ruta, usecols=list(columnas))
+    if extension == ".xlsx":
+        return pd.read_excel(ruta, usecols=list(columnas))
+    if extension in (".arrow", ".feather"):
+        # La tabla se arma con los lotes ya proyectados a las columnas pedidas, sin read_all()
+        import pyarrow as pa
+        lector = _abrir_arrow(ruta, columnas)
+        lotes = (lector.get_batch(i) for i in range(lector.num_record_batches))
+        return pa.Table.from_batches(lotes, schema=lector.schema).select(list(columnas)).to_pandas()
+    if extension in EXTENSIONES_MAPEADAS:
+        return pd.DataFrame({columna: columna_mapeada(ruta, columna) for columna in columnas})
+    raise ValueError("Formato de archivo no soportado")
+
+
+def leer_columna(ruta, columna, filtros=None):
+    """Lee una sola columna del archivo como arreglo float64 sin nulos"""
+    return columna_como_arreglo(leer_columnas(ruta, [columna], filtros), columna)
+
+
+def columna_como_arreglo(tabla, columna):
+    """Valores no nulos de una columna como arreglo float64"""
+    datos = tabla[columna].to_numpy(dtype=np.float64, na_value=np.nan)
+    return datos[~np.isnan(datos)]
+
+
+def usar_lectura_por_bloques(ruta):
+    """Indica si el archivo es un CSV o Parquet demasiado grande para cargarlo completo"""
+    return (_extension(ruta) in (".csv", ".parquet")
+            and os.path.getsize(ruta) > TAMANO_MAXIMO_EN_MEMORIA)
+
+
+def acumular_columna_csv(ruta, columna, filas_por_bloque=FILAS_POR_BLOQUE, progreso=None):
+    """Lee una sola columna de un CSV por bloques y acumula sus estadísticos.
+
+    Si se indica, progreso(fraccion) se llama tras cada bloque con la
+    fracción del archivo ya leída (aproximada por la posición en bytes).
+    """
+    return acumular_columnas_csv(ruta, [columna], filas_por_bloque, progreso)[0]
+
+
+def acumular_columnas_csv(ruta, columnas, filas_por_bloque=FILAS_POR_BLOQUE, progreso=None):
+    """AcumuladorMedia de cada columna indicada, leyendo el CSV por bloques en una sola pasada"""
+    import pandas as pd
+    columnas = list(columnas)
+    acumuladores = [AcumuladorMedia() for _ in columnas]
+    tamano = os.path.getsize(ruta) or 1
+    with open(ruta, "rb") as archivo:
+        bloques = pd.read_csv(archivo, usecols=columnas, dtype=dict.fromkeys(columnas, np.float64),
+                              chunksize=filas_por_bloque)
+        for bloque in bloques:
+            for columna, acumulador in zip(columnas, acumuladores):
+                datos = bloque[columna].to_numpy()
+                acumulador.agregar_arreglo(datos[~np.isnan(datos)])
+            if progreso is not None:
+                progreso(min(archivo.tell() / tamano, 1.0))
+    return acumuladores
+
+
+def acumular_arreglo(datos, filas_por_bloque=FILAS_POR_BLOQUE, progreso=None):
+    """Acumula un arreglo (posiblemente mapeado en memoria) por bloques, omitiendo NaN.
+
+    Cada bloque se convierte a float64 por separado, así las copias temporales
+    tienen el tamaño de un bloque y no el del arreglo completo.
+    """
+    acumulador = AcumuladorMedia()
+    for inicio in range(0, len(datos), filas_por_bloque):
+        bloque = np.asarray(datos[inicio:inicio + filas_por_bloque], dtype=np.float64)
+        acumulador.agregar_arreglo(bloque[~np.isnan(bloque)])
+        if progreso is not None:
+            progreso(min(inicio + filas_por_bloque, len(datos)) / len(datos))
+    return acumulador
+
+
+def _abrir_npy(ruta):
+    return np.load(ruta, mmap_mode="r", allow_pickle=False)
+
+
+def _abrir_arrow(ruta, columnas=None):
+    """Lector de un Arrow/Feather mapeado en memoria; al abrirlo solo se lee el esquema.
+
+    Con columnas, los lotes que devuelve get_batch solo traen esas columnas
+    (en el orden del esquema), así que no se descomprimen las demás.
+    """
+    import pyarrow as pa
+    lector = pa.ipc.open_file(pa.memory_map(ruta, "r"))
+    if columnas is None:
+        return lector
+    nombres = lector.schema.names
+    faltantes = [columna for columna in columnas if columna not in nombres]
+    if faltantes:
+        raise ValueError(f"No se encontró la columna '{faltantes[0]}'")
+    indices = sorted(nombres.index(columna) for columna in set(columnas))
+    return pa.ipc.open_file(pa.memory_map(ruta, "r"), options=pa.ipc.IpcReadOptions(included_fields=indices))
+
+
+def _lotes_arrow(ruta, columna):
+    """Columna (pyarrow) de cada lote de un Arrow/Feather, leyendo solo esa columna"""
+    lector = _abrir_arrow(ruta, [columna])
+    for i in range(lector.num_record_batches):
+        yield lector.get_batch(i).column(0)
+
+
+def columnas_mapeadas(ruta, booleanas=False):
+    """Columnas numéricas (y booleanas, si se pide) de un archivo binario, leyendo solo su encabezado"""
+    extension = _extension(ruta)
+    if extension in TIPOS_BINARIOS:
+        return ["valores"]
+    if extension == ".npy":
+        arreglo = _abrir_npy(ruta)
+        if arreglo.dtype.names:
+            return [nombre for nombre in arreglo.dtype.names
+                    if np.issubdtype(arreglo.dtype[nombre], np.number)
+                    or booleanas and arreglo.dtype[nombre] == np.bool_]
+        if arreglo.ndim == 1:
+            return ["valores"]
+        return [f"columna_{i}" for i in range(arreglo.shape[1])]
+    return [campo.name for campo in _abrir_arrow(ruta).schema if _campo_numerico(campo, booleanas)]
+
+
+def columna_mapeada(ruta, columna):
+    """Vista mapeada en memoria de una columna de un .npy o binario sin encabezado"""
+    extension = _extension(ruta)
+    if extension in TIPOS_BINARIOS:
+        return np.memmap(ruta, dtype=TIPOS_BINARIOS[extension], mode="r")
+    arreglo = _abrir_npy(ruta)
+    if arreglo.dtype.names:
+        return arreglo[columna]
+    if arreglo.ndim > 1:
+        return arreglo[:, int(columna.rsplit("_", 1)[1])]
+    return arreglo
+
+
+def acumular_columna_mapeada(ruta, columna, filas_por_bloque=FILAS_POR_BLOQUE, progreso=None):
+    """Acumula una columna de un archivo binario mapeado en memoria, sin copiarlo completo"""
+    if _extension(ruta) not in (".arrow", ".feather"):
+        return acumular_arreglo(columna_mapeada(ruta, columna), filas_por_bloque, progreso)
+    import pyarrow.compute as pc
+    acumulador = AcumuladorMedia()
+    lotes = _abrir_arrow(ruta).num_record_batches
+    for i, fragmento in enumerate(_lotes_arrow(ruta, columna)):
+        # En archivos sin comprimir y sin nulos, to_numpy devuelve una vista del búfer mapeado;
+        # comprimidos, solo se descomprime este lote de la columna
+        valores = pc.drop_null(fragmento) if fragmento.null_count else fragmento
+        acumulador.combinar(acumular_arreglo(valores.to_numpy(zero_copy_only=False), filas_por_bloque))
+        if progreso is not None:
+            progreso((i + 1) / lotes)
+    return acumulador
+
+
+_OPERADORES_FILTRO = ("==", "!=", "<=", ">=", "<", ">", "=", "in")
+
+
+def interpretar_filtro(texto):
+    """Convierte un filtro como "region == 'MX'" o "anio >= 2020" en (columna, operador, valor)"""
+    for operador in _OPERADORES_FILTRO:
+        separador = f" {operador} " if operador == "in" else operador
+        if separador in texto:
+            columna, valor = (parte.strip() for parte in texto.split(separador, 1))
+            break
+    else:
+        raise ValueError(f"Filtro no válido: {texto}")
+    if operador == "=":
+        operador = "=="
+    if operador == "in":
+        valores = [_interpretar_valor(v) for v in valor.strip("()[]").split(",") if v.strip()]
+        return columna, operador, valores
+    return columna, operador, _interpretar_valor(valor)
+
+
+def _interpretar_valor(texto):
+    texto = texto.strip()
+    if len(texto) >= 2 and texto[0] == texto[-1] and texto[0] in "'\"":
+        return texto[1:-1]
+    try:
+        return int(texto)
+    except ValueError:
+        pass
+    try:
+        return float(texto)
+    except ValueError:
+        return texto
+
+
+def _grupo_puede_cumplir(minimo, maximo, operador, valor):
+    """Según el mínimo y máximo de un grupo de filas, indica si alguna fila puede cumplir el filtro"""
+    try:
+        if operador == "==":
+            return minimo <= valor <= maximo
+        if operador == "!=":
+            return not (minimo == maximo == valor)
+        if operador == "<":
+            return minimo < valor
+        if operador == "<=":
+            return minimo <= valor
+        if operador == ">":
+            return maximo > valor
+        if operador == ">=":
+            return maximo >= valor
+        if operador == "in":
+            return any(minimo <= v <= maximo for v in valor)
+    except TypeError:
+        # Tipos no comparables: no se puede descartar el grupo
+        pass
+    return True
+
+
+def _grupo_cumple(grupo, indices, filtro):
+    columna, operador, valor = filtro
+    estadisticas = grupo.column(indices[columna]).statistics
+    if estadisticas is None or not estadisticas.has_min_max:
+        return True
+    return _grupo_puede_cumplir(estadisticas.min, estadisticas.max, operador, valor)
+
+
+def _mascara_filtro(tabla, columna, operador, valor):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    if operador == "in":
+        return pc.is_in(tabla.column(columna), value_set=pa.array(valor))
+    funciones = {"==": pc.equal, "!=": pc.not_equal, "<": pc.less,
+                 "<=": pc.less_equal, ">": pc.greater, ">=": pc.greater_equal}
+    return funciones[operador](tabla.column(columna), valor)
+
+
+def _grupos_parquet(ruta, columna, filtros=None, progreso=None):
+    """Columna (pyarrow) de cada grupo de filas de un Parquet que pasa los filtros.
+
+    Los grupos cuyas estadísticas (mínimo/máximo) descartan los filtros no se
+    leen. Si se indica, progreso(fraccion) se llama tras cada grupo.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    archivo = pq.ParquetFile(ruta)
+    metadatos = archivo.metadata
+    filtros = list(filtros or [])
+    indices = {metadatos.schema.column(i).name: i for i in range(metadatos.num_columns)}
+    columnas_leidas = list(dict.fromkeys([columna] + [f[0] for f in filtros]))
+
+    for grupo in range(metadatos.num_row_groups):
+        if all(_grupo_cumple(metadatos.row_group(grupo), indices, filtro) for filtro in filtros):
+            tabla = archivo.read_row_group(grupo, columns=columnas_leidas)
+            if filtros:
+                mascara = _mascara_filtro(tabla, *filtros[0])
+                for filtro in filtros[1:]:
+                    mascara = pc.and_(mascara, _mascara_filtro(tabla, *filtro))
+                tabla = tabla.filter(mascara)
+            yield tabla.column(columna)
+        if progreso is not None:
+            progreso((grupo + 1) / metadatos.num_row_groups)
+
+
+def acumular_columna_parquet(ruta, columna, filtros=None, progreso=None):
+    """Lee una columna de un Parquet grupo de filas por grupo y acumula sus estadísticos"""
+    import pyarrow.compute as pc
+    acumulador = AcumuladorMedia()
+    for datos in _grupos_parquet(ruta, columna, filtros, progreso):
+        valores = pc.drop_null(datos).to_numpy().astype(np.float64, copy=False)
+        acumulador.agregar_arreglo(valores[~np.isnan(valores)])
+    return acumulador
+
+
+def _contar_arrow(datos):
+    """(éxitos, ensayos) de una columna pyarrow booleana o 0/1, sin pasarla a numpy.
+
+    Las columnas booleanas de Arrow ya están empaquetadas en bits: pc.sum
+    cuenta los bits en 1 directamente. En las numéricas, las comparaciones
+    con 0 y 1 producen máscaras de bits del mismo tipo; los NaN cuentan como
+    faltantes.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.types as tipos
+    validos = len(datos) - datos.null_count
+    if tipos.is_boolean(datos.type):
+        return pc.sum(datos).as_py() or 0, validos
+    if not (tipos.is_integer(datos.type) or tipos.is_floating(datos.type)):
+        raise ValueError("Los datos de una proporción deben ser booleanos o numéricos (0 o 1)")
+    exitos = pc.sum(pc.equal(datos, 1)).as_py() or 0
+    ceros = pc.sum(pc.equal(datos, 0)).as_py() or 0
+    if tipos.is_floating(datos.type):
+        validos -= pc.sum(pc.is_nan(datos)).as_py() or 0
+    if exitos + ceros != validos:
+        raise ValueError("Los datos de una proporción deben ser 0 o 1")
+    return exitos, validos
+
+
+def _contar_serie(serie):
+    """(éxitos, ensayos) de una columna de pandas booleana o 0/1, omitiendo nulos"""
+    serie = serie.dropna()
+    if serie.dtype.kind == "b" or str(serie.dtype) == "boolean":
+        return contar_exitos(serie.to_numpy(dtype=bool))
+    if serie.dtype.kind == "O" and serie.map(type).eq(bool).all():
+        return contar_exitos(serie.to_numpy(dtype=bool))
+    return contar_exitos(serie.to_numpy())
+
+
+def contar_columna(ruta, columna, filtros=None, filas_por_bloque=FILAS_POR_BLOQUE):
+    """(éxitos, ensayos) de una columna booleana o 0/1 de un archivo, sin convertirla a float64.
+
+    Parquet y Arrow/Feather se cuentan con pyarrow sobre las máscaras de bits
+    (Parquet grupo de filas por grupo, aplicando los filtros); los .npy y
+    binarios mapeados se cuentan por bloques en su tipo original; CSV y
+    Excel se leen con pandas (los CSV, por bloques).
+    """
+    extension = _extension(ruta)
+    if filtros and extension != ".parquet":
+        raise ValueError("Los filtros de filas solo se admiten en archivos Parquet")
+    exitos = ensayos = 0
+    if extension == ".parquet":
+        for datos in _grupos_parquet(ruta, columna, filtros):
+            for fragmento in datos.chunks:
+                parcial = _contar_arrow(fragmento)
+                exitos, ensayos = exitos + parcial[0], ensayos + parcial[1]
+    elif extension in (".arrow", ".feather"):
+        for fragmento in _lotes_arrow(ruta, columna):
+            parcial = _contar_arrow(fragmento)
+            exitos, ensayos = exitos + parcial[0], ensayos + parcial[1]
+    elif extension in EXTENSIONES_MAPEADAS:
+        datos = columna_mapeada(ruta, columna)
+        for inicio in range(0, len(datos), filas_por_bloque):
+            parcial = contar_exitos(datos[inicio:inicio + filas_por_bloque])
+            exitos, ensayos = exitos + parcial[0], ensayos + parcial[1]
+    elif extension == ".csv":
+        import pandas as pd
+        for bloque in pd.read_csv(ruta, usecols=[columna], chunksize=filas_por_bloque):
+            parcial = _contar_serie(bloque[columna])
+            exitos, ensayos = exitos + parcial[0], ensayos + parcial[1]
+    elif extension == ".xlsx":
+        exitos, ensayos = _contar_serie(leer_columnas(ruta, [columna])[columna])
+    else:
+        raise ValueError("Formato de archivo no soportado")
+    return exitos, ensayos
+
+
+class ArchivoDatos:
+    """Archivo abierto del que se elige una columna numérica para cargar.
+
+    Al abrirlo solo se lee el esquema; los datos se leen al cargar la columna.
+    En archivos Parquet se pueden indicar filtros de filas como tuplas
+    (columna, operador, valor), p. ej. ("region", "==", "MX"). Con booleanas
+    también se ofrecen las columnas booleanas (se cargan como 0/1).
+    """
+
+    def __init__(self, ruta, por_bloques=None, filtros=None, booleanas=False):
+        self.ruta = ruta
+        self.por_bloques = usar_lectura_por_bloques(ruta) if por_bloques is None else por_bloques
+        self.filtros = filtros
+        self.columnas = columnas_numericas_archivo(ruta, booleanas)
+
+    def cargar_columna(self, columna, progreso=None):
+        """Arreglo con la columna, o su AcumuladorMedia si el archivo se lee por bloques.
+
+        progreso(fraccion) se llama entre bloques en las lecturas por bloques;
+        puede lanzar una excepción para interrumpir la lectura.
+        """
+        self._validar_filtros()
+        if _extension(self.ruta) in EXTENSIONES_MAPEADAS:
+            return acumular_columna_mapeada(self.ruta, columna, progreso=progreso)
+        if self.por_bloques and _extension(self.ruta) == ".parquet":
+            return acumular_columna_parquet(self.ruta, columna, self.filtros, progreso)
+        if self.por_bloques:
+            return acumular_columna_csv(self.ruta, columna, progreso=progreso)
+        return leer_columna(self.ruta, columna, self.filtros)
+
+    def cargar_serie(self, columna):
+        """Valores de la columna en el orden del archivo (sin nulos), aunque se lea por bloques.
+
+        Para cálculos que necesitan la serie completa, como las ventanas móviles.
+        """
+        self._validar_filtros()
+        extension = _extension(self.ruta)
+        if extension in (".arrow", ".feather"):
+            import pyarrow.compute as pc
+            partes = [pc.drop_null(fragmento).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+                      for fragmento in _lotes_arrow(self.ruta, columna)]
+            datos = np.concatenate(partes) if partes else np.empty(0)
+        elif extension in EXTENSIONES_MAPEADAS:
+            datos = np.asarray(columna_mapeada(self.ruta, columna), dtype=np.float64)
+        else:
+            return leer_columna(self.ruta, columna, self.filtros)
+        return datos[~np.isnan(datos)]
+
+    def _validar_filtros(self):
+        # Los filtros se aplican al leer el Parquet; en otros formatos se ignorarían en silencio
+        if self.filtros and _extension(self.ruta) != ".parquet":
+            raise ValueError("Los filtros de filas solo se admiten en archivos Parquet")
+
+
+def vista_previa(datos, columna=None, max_valores=10):
+    """Texto corto con los primeros valores (o el resumen) y el total de datos cargados"""
+    origen = f" de '{columna}'" if columna is not None else ""
+    if isinstance(datos, AcumuladorMedia):
+        return (f"[{len(datos)} datos leídos por bloques{origen}] "
+                f"media = {datos.media:g}, s = {datos.desv_std:g}")
+    valores = ", ".join(f"{valor:g}" for valor in datos[:max_valores])
+    if len(datos) > max_valores:
+        valores += ", …"
+    return f"[{len(datos)} datos cargados{origen}] {valores}"
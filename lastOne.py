@@ -1,31 +1,86 @@
+import copy
 import tkinter as tk
-from tkinter import ttk, scrolledtext, filedialog, messagebox
+from collections import OrderedDict
+from tkinter import ttk, scrolledtext, filedialog, messagebox, simpledialog
 import numpy as np
-import scipy.stats as stats
-import pandas as pd
-import os
 import tkinter.font as tkfont
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from scipy.stats import norm, t
-from tkhtmlview import HTMLLabel
+from motor_estadistico import (METODOS_PROPORCION, AcumuladorMedia, PruebaSecuencial, ResumenIncremental,
+                               cache_resumenes, contar_exitos, convertir_datos, intervalo_confianza,
+                               intervalos_moviles, intervalos_proporcion, proporcion_desde_conteos, prueba_media)
+from carga_datos import ArchivoDatos, columnas_archivo, columnas_numericas_archivo, contar_columna, vista_previa
+from analisis_lotes import analizar_archivo, analizar_archivo_por_grupos, comparar_columnas_archivo, exportar_resultados
+from tareas import BarraTareas, EjecutorTareas, VigilanteEdicion
 
-def parse_data(data_str):
-    """Convierte una cadena de datos separados por comas a una lista de números"""
+# Ejecutor de las cargas y cálculos en segundo plano; se crea en main() junto con la ventana
+task_runner = None
+
+def show_error(prefix):
+    """Callback de error para las tareas en segundo plano"""
+    return lambda e: messagebox.showerror("Error", f"{prefix}: {str(e)}")
+
+def convert_text(data):
     try:
-        # Reemplazar varios separadores posibles y eliminar espacios
-        clean_data = data_str.replace(';', ',').replace('\t', ',').replace('\n', ',')
-        data_list = [float(x.strip()) for x in clean_data.split(',') if x.strip()]
-        return np.array(data_list)
-    except ValueError:
-        messagebox.showerror("Error", "Los datos ingresados no son válidos. Deben ser números separados por comas.")
-        return None
+        return convertir_datos(data)
+    except ValueError as e:
+        raise ValueError(f"Los datos ingresados no son válidos: {e}. Deben ser números separados por comas.")
 
-def plot_distribution(test_stat, critical_value, test_type, direction, n, frame):
-    """Grafica la distribución t-student o normal Z con los valores críticos y el valor de prueba y la integra en un frame de tkinter"""
-    x_values = np.linspace(-4, 4, 1000)
+def parse_data(data):
+    """Devuelve los estadísticos suficientes (n, media, M2) de los datos separados por comas.
+    
+    Se llama desde el hilo de la tarea, por eso lanza ValueError en lugar de mostrar el error.
+    El texto pasa por la caché compartida por ambas pestañas: si no cambió, no se vuelve a
+    convertir ni a recorrer. Las columnas cargadas desde archivo se resumen directamente."""
+    return cache_resumenes.resumen(data, convert_text)
+
+# Estadísticos del último texto de cada campo de datos en modo en vivo; al editar
+# solo se convierten los valores agregados o quitados
+live_summaries = {}
+
+def summarize_data(data, data_entry, live):
+    """Estadísticos de los datos; en vivo, se actualizan respecto a la última edición del campo"""
+    if live and isinstance(data, str):
+        return live_summaries[data_entry].actualizar(data)
+    return parse_data(data)
+
+# Columnas cargadas desde archivo, por campo de datos: (texto de vista previa, arreglo)
+loaded_data = {}
+# Archivo y columna de origen de cada campo cargado, para releer la serie completa (ventana móvil)
+loaded_sources = {}
+# Columnas cargadas para proporciones, por campo de datos: (texto de vista previa, (éxitos, ensayos))
+loaded_counts = {}
+
+def get_sample_data(data_entry, live=False):
+    """Devuelve la columna cargada si el campo no fue editado; si no, el texto del campo para parsearlo"""
+    data_str = data_entry.get()
+    
+    if not data_str:
+        if not live:
+            messagebox.showerror("Error", "Ingrese los datos de la muestra")
+        return None
+        
+    preview, data = loaded_data.get(data_entry, (None, None))
+    if data_str == preview:
+        return data
+    return data_str
+
+# Figura, canvas y artistas de la gráfica de cada pestaña (por frame); se crean una sola vez
+# y en cada cálculo solo se actualizan la curva, las líneas verticales y el sombreado
+plots = {}
+
+def get_plot(frame):
+    """Devuelve la gráfica del frame, creándola la primera vez"""
+    plot = plots.get(frame)
+    if plot is not None:
+        return plot
+    
+    # matplotlib se importa con la primera gráfica y no al abrir la ventana
+    from matplotlib.figure import Figure
+    from matplotlib.collections import PolyCollection
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
     
-    fig, ax = plt.subplots()
+    # Figure en lugar de plt.subplots para que pyplot no guarde una referencia a cada figura
+    fig = Figure()
+    ax = fig.add_subplot()
     
     # Configurar el color de fondo y el contraste de las letras
     fig.patch.set_facecolor('#403d39')
@@ -40,84 +95,169 @@ def plot_distribution(test_stat, critical_value, test_type, direction, n, frame)
     ax.xaxis.label.set_color('white')
     ax.title.set_color('white')
     
+    ax.set_title('Distribución de prueba con valores críticos y estadístico de prueba', color='white', fontsize=12)
+    ax.set_xlabel('Valor de la variable', color='white', fontsize=11)
+    ax.set_ylabel('Densidad de probabilidad', color='white', fontsize=11)
+    
+    plot = {'fig': fig, 'ax': ax, 'background': None, 'limits': None}
+    plot['curve'], = ax.plot([], [], color='#f08c00', linewidth=4)
+    # Los artistas que cambian en cada cálculo son animados: se dibujan sobre el fondo guardado (blit)
+    plot['test_stat'] = ax.axvline(x=0, color='#197278', linestyle='--', linewidth=2, animated=True)
+    plot['critical'] = ax.axvline(x=0, color='#9e2a2b', linestyle='--', linewidth=2, animated=True)
+    plot['critical_neg'] = ax.axvline(x=0, color='#9e2a2b', linestyle='--', linewidth=2, animated=True)
+    plot['fill'] = PolyCollection([], color='#9e2a2b', alpha=0.3, animated=True)
+    ax.add_collection(plot['fill'])
+    # La leyenda se crea una vez; en cada cálculo solo cambian sus textos
+    plot['legend'] = ax.legend([plot['curve'], plot['test_stat'], plot['critical']], ['', '', ''])
+    plot['legend'].set_animated(True)
+    for text in plot['legend'].get_texts():
+        text.set_color('#000000')
+
+    # Crear el canvas de matplotlib y agregarlo al frame de tkinter
+    plot['canvas'] = FigureCanvasTkAgg(fig, master=frame)
+    plot['canvas'].get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    plot['canvas'].mpl_connect('draw_event', lambda event: save_background(plot))
+    
+    plots[frame] = plot
+    return plot
+
+def draw_animated(plot):
+    """Dibuja los artistas animados (líneas, sombreado y leyenda) sobre el canvas"""
+    for artist in (plot['fill'], plot['critical_neg'], plot['critical'], plot['test_stat'], plot['legend']):
+        if artist.get_visible():
+            plot['ax'].draw_artist(artist)
+
+def save_background(plot):
+    """Tras un dibujado completo guarda el fondo sin los artistas animados y los dibuja encima"""
+    plot['background'] = plot['canvas'].copy_from_bbox(plot['fig'].bbox)
+    draw_animated(plot)
+
+# Eje x de las curvas de densidad y curvas ya evaluadas por (distribución, gl), de la menos a la más usada
+X_VALUES = np.linspace(-4, 4, 1000)
+MAX_DENSITY_CURVES = 64
+density_curves = OrderedDict()
+
+def get_density_curve(test_type, df=None):
+    """Densidad Z o t sobre X_VALUES; se evalúa una sola vez por distribución y grados de libertad"""
+    key = ("Z", None) if "Z" in test_type else ("t", df)
+    y_values = density_curves.get(key)
+    if y_values is not None:
+        density_curves.move_to_end(key)
+        return y_values
+    
+    from scipy.stats import norm, t
+    y_values = norm.pdf(X_VALUES) if key[0] == "Z" else t.pdf(X_VALUES, df)
+    y_values.flags.writeable = False  # Se comparte entre gráficas
+    density_curves[key] = y_values
+    if len(density_curves) > MAX_DENSITY_CURVES:
+        density_curves.popitem(last=False)
+    return y_values
+
+def shade_regions(y_values, slices):
+    """Polígonos bajo la curva para cada región de rechazo, recortando los arreglos de la curva"""
+    regions = []
+    for region in slices:
+        xs, ys = X_VALUES[region], y_values[region]
+        if len(xs):
+            regions.append(np.column_stack([np.r_[xs[0], xs, xs[-1]], np.r_[0, ys, 0]]))
+    return regions
+
+def plot_distribution(test_stat, critical_value, test_type, direction, n, frame):
+    """Grafica la distribución t-student o normal Z con los valores críticos y el valor de prueba en el frame de tkinter.
+    
+    Reutiliza la figura del frame: si la curva y los límites no cambian, solo se redibujan las líneas,
+    el sombreado y la leyenda sobre el fondo guardado."""
+    plot = get_plot(frame)
+    
     if "Z" in test_type:
         # Distribución Z (normal estándar)
-        y_values = norm.pdf(x_values)
-        ax.plot(x_values, y_values, label='Distribución Z', color='#f08c00', linewidth=4)
+        y_values = get_density_curve(test_type)
+        curve_label = 'Distribución Z'
     else:
         # Distribución t
         df = n - 1
-        y_values = t.pdf(x_values, df)
-        ax.plot(x_values, y_values, label=f'Distribución t (df={df})', color='#f08c00', linewidth=4)
+        y_values = get_density_curve(test_type, df)
+        curve_label = f'Distribución t (df={df})'
         
     # Graficar el valor crítico y el valor de prueba
-    ax.axvline(x=test_stat, color='#197278', linestyle='--', label=f'Estadístico de prueba ({test_stat:.2f})', linewidth=2)
+    plot['test_stat'].set_xdata([test_stat, test_stat])
+    plot['critical'].set_xdata([critical_value, critical_value])
+    plot['critical_neg'].set_xdata([-critical_value, -critical_value])
+    plot['critical_neg'].set_visible(direction == "Dos colas")
     
+    # X_VALUES está ordenado: cada región de rechazo es un tramo contiguo de la curva
     if direction == "Dos colas":
-        ax.axvline(x=critical_value, color='#9e2a2b', linestyle='--', linewidth=2, label=f'Valor crítico ({critical_value:.2f})')
-        ax.axvline(x=-critical_value, color='#9e2a2b', linestyle='--', linewidth=2)
-        ax.fill_between(x_values, 0, y_values, where=(x_values <= -critical_value) | (x_values >= critical_value), color='#9e2a2b', alpha=0.3)
+        slices = [slice(0, np.searchsorted(X_VALUES, -critical_value, side='right')),
+                  slice(np.searchsorted(X_VALUES, critical_value, side='left'), None)]
+        lines_x = [test_stat, critical_value, -critical_value]
     elif direction == "Cola izquierda":
-        ax.axvline(x=critical_value, color='#9e2a2b', linestyle='--', linewidth=2, label=f'Valor crítico ({critical_value:.2f})')
-        ax.fill_between(x_values, 0, y_values, where=(x_values <= critical_value), color='#9e2a2b', alpha=0.3)
+        slices = [slice(0, np.searchsorted(X_VALUES, critical_value, side='right'))]
+        lines_x = [test_stat, critical_value]
     else:  # Cola derecha
-        ax.axvline(x=critical_value, color='#9e2a2b', linestyle='--', linewidth=2, label=f'Valor crítico ({critical_value:.2f})')
-        ax.fill_between(x_values, 0, y_values, where=(x_values >= critical_value), color='#9e2a2b', alpha=0.3)
+        slices = [slice(np.searchsorted(X_VALUES, critical_value, side='left'), None)]
+        lines_x = [test_stat, critical_value]
+    plot['fill'].set_verts(shade_regions(y_values, slices))
     
-    ax.legend(facecolor='#000000', edgecolor='white', framealpha=0.5)
-    for text in ax.legend().get_texts():
-        text.set_color('#000000')
-        
-    ax.set_title('Distribución de prueba con valores críticos y estadístico de prueba', color='white', fontsize=12)
-    ax.set_xlabel('Valor de la variable', color='white', fontsize=11)
-    ax.set_ylabel('Densidad de probabilidad', color='white', fontsize=11)
-
-    # Crear el canvas de matplotlib y agregarlo al frame de tkinter
-    canvas = FigureCanvasTkAgg(fig, master=frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    ax = plot['ax']
+    labels = [curve_label, f'Estadístico de prueba ({test_stat:.2f})', f'Valor crítico ({critical_value:.2f})']
+    for text, label in zip(plot['legend'].get_texts(), labels):
+        text.set_text(label)
+    
+    # Solo se redibuja todo si cambia la curva o si alguna línea queda fuera de los límites actuales
+    limits = (curve_label, min([-4] + lines_x), max([4] + lines_x))
+    if limits != plot['limits'] or plot['background'] is None:
+        plot['limits'] = limits
+        plot['curve'].set_data(X_VALUES, y_values)
+        ax.relim()
+        ax.autoscale_view()
+        plot['canvas'].draw_idle()
+    else:
+        plot['canvas'].restore_region(plot['background'])
+        draw_animated(plot)
+        plot['canvas'].blit(plot['fig'].bbox)
 
-def calculate_confidence_interval(data_entry, conf_level_entry, test_type_combobox, results_text, graph_frame):
-    """Calcula el intervalo de confianza para la media"""
-    data_str = data_entry.get()
+def calculate_confidence_interval(data_entry, conf_level_entry, test_type_combobox, results_text, graph_frame, live=False):
+    """Calcula el intervalo de confianza para la media en segundo plano.
     
-    if not data_str:
-        messagebox.showerror("Error", "Ingrese los datos de la muestra")
-        return
-        
-    data = parse_data(data_str)
+    En vivo (al editar) los datos incompletos o inválidos no muestran mensajes de error."""
+    data = get_sample_data(data_entry, live)
     if data is None:
         return
         
     try:
         conf_level = float(conf_level_entry.get())
         if conf_level <= 0 or conf_level >= 100:
-            messagebox.showerror("Error", "El nivel de confianza debe estar entre 0 y 100")
+            if not live:
+                messagebox.showerror("Error", "El nivel de confianza debe estar entre 0 y 100")
             return
-            
-        alpha = (100 - conf_level) / 100
-        n = len(data)
-        mean = np.mean(data)
-        std_dev = np.std(data, ddof=1)  # ddof=1 para usar la desviación estándar muestral
-        
-        test_type = test_type_combobox.get()
-        
-        if "Z" in test_type:
-            # Prueba Z (asumiendo que std_dev es la desviación estándar poblacional)
-            std_error = std_dev / np.sqrt(n)
-            critical_value = stats.norm.ppf(1 - alpha/2)
-            margin_error = critical_value * std_error
-            lower_bound = mean - margin_error
-            upper_bound = mean + margin_error
+    except Exception as e:
+        if not live:
+            messagebox.showerror("Error", f"Error en los cálculos: {str(e)}")
+        return
+        
+    test_type = test_type_combobox.get()
+    # Un nuevo clic (o edición en vivo) reemplaza al cálculo anterior si aún no termina
+    task_runner.enviar("intervalo",
+                       lambda task: intervalo_confianza(summarize_data(data, data_entry, live), conf_level / 100, test_type),
+                       lambda resultado: show_confidence_interval(resultado, conf_level, test_type, results_text, graph_frame),
+                       None if live else show_error("Error en los cálculos"), mensaje="Calculando el intervalo de confianza…")
+
+def show_confidence_interval(resultado, conf_level, test_type, results_text, graph_frame):
+    """Muestra el intervalo de confianza calculado y su gráfica"""
+    try:
+        n = resultado.n
+        mean = resultado.media
+        std_dev = resultado.desv_std
+        std_error = resultado.error_std
+        critical_value = resultado.critico
+        margin_error = resultado.margen
+        lower_bound = resultado.inferior
+        upper_bound = resultado.superior
+        
+        if resultado.prueba == "Z":
             distribution = "normal estándar (Z)"
         else:
-            # Prueba t
-            std_error = std_dev / np.sqrt(n)
-            critical_value = stats.t.ppf(1 - alpha/2, n-1)
-            margin_error = critical_value * std_error
-            lower_bound = mean - margin_error
-            upper_bound = mean + margin_error
-            distribution = f"t-Student con {n-1} grados de libertad"
+            distribution = f"t-Student con {resultado.gl} grados de libertad"
             
         # Mostrar resultados
         results_text_content = f"""
@@ -152,26 +292,18 @@ def calculate_confidence_interval(data_entry, conf_level_entry, test_type_combob
         results_text.delete(1.0, tk.END)
         results_text.insert(tk.INSERT, results_text_content)
         
-        # Limpiar el frame de la gráfica antes de dibujar
-        for widget in graph_frame.winfo_children():
-            widget.destroy()
-        
-        # Llamar a la función de graficado
+        # Actualizar la gráfica de la pestaña (se reutiliza la misma figura)
         plot_distribution(0, critical_value, test_type, "Dos colas", n, graph_frame)
         
     except Exception as e:
         messagebox.showerror("Error", f"Error en los cálculos: {str(e)}")
 
 def calculate_hypothesis_test(data_entry, null_hypo_entry, alpha_entry, test_type_combobox, 
-                              direction_combobox, results_text, graph_frame):
-    """Realiza una prueba de hipótesis para la media"""
-    data_str = data_entry.get()
+                              direction_combobox, results_text, graph_frame, live=False):
+    """Realiza una prueba de hipótesis para la media en segundo plano.
     
-    if not data_str:
-        messagebox.showerror("Error", "Ingrese los datos de la muestra")
-        return
-        
-    data = parse_data(data_str)
+    En vivo (al editar) los datos incompletos o inválidos no muestran mensajes de error."""
+    data = get_sample_data(data_entry, live)
     if data is None:
         return
         
@@ -180,63 +312,169 @@ def calculate_hypothesis_test(data_entry, null_hypo_entry, alpha_entry, test_typ
         alpha = float(alpha_entry.get())
         
         if alpha <= 0 or alpha >= 1:
-            messagebox.showerror("Error", "El nivel de significancia (α) debe estar entre 0 y 1")
+            if not live:
+                messagebox.showerror("Error", "El nivel de significancia (α) debe estar entre 0 y 1")
             return
-            
-        n = len(data)
-        mean = np.mean(data)
-        std_dev = np.std(data, ddof=1)
-        
-        test_type = test_type_combobox.get()
-        direction = direction_combobox.get()
-        
-        # Calcular el estadístico de prueba
-        std_error = std_dev / np.sqrt(n)
-        test_stat = (mean - null_value) / std_error
-        
-        # Calcular el valor p según el tipo de prueba y dirección
-        if "Z" in test_type:
-            # Prueba Z
-            if direction == "Dos colas":
-                p_value = 2 * (1 - stats.norm.cdf(abs(test_stat)))
-                critical_value = stats.norm.ppf(1 - alpha/2)
-                hypothesis_alt = f"μ ≠ {null_value}"
-            elif direction == "Cola izquierda":
-                p_value = stats.norm.cdf(test_stat)
-                critical_value = stats.norm.ppf(alpha)
-                hypothesis_alt = f"μ < {null_value}"
-            else:  # Cola derecha
-                p_value = 1 - stats.norm.cdf(test_stat)
-                critical_value = stats.norm.ppf(1 - alpha)
-                hypothesis_alt = f"μ > {null_value}"
-                
+    except Exception as e:
+        if not live:
+            messagebox.showerror("Error", f"Error en los cálculos: {str(e)}")
+        return
+        
+    test_type = test_type_combobox.get()
+    direction = direction_combobox.get()
+    # Un nuevo clic (o edición en vivo) reemplaza a la prueba anterior si aún no termina
+    task_runner.enviar("prueba",
+                       lambda task: prueba_media(summarize_data(data, data_entry, live), null_value, alpha, direction, test_type),
+                       lambda resultado: show_hypothesis_test(resultado, null_value, alpha, test_type, direction, 
+                                                              results_text, graph_frame),
+                       None if live else show_error("Error en los cálculos"), mensaje="Calculando la prueba de hipótesis…")
+
+def calculate_rolling_intervals(ventana, data_entry, conf_level_entry, test_type_combobox, results_text):
+    """Intervalo de confianza de cada ventana de N observaciones consecutivas, en segundo plano"""
+    data = get_sample_data(data_entry)
+    if data is None:
+        return
+        
+    try:
+        conf_level = float(conf_level_entry.get())
+        if conf_level <= 0 or conf_level >= 100:
+            messagebox.showerror("Error", "El nivel de confianza debe estar entre 0 y 100")
+            return
+    except Exception as e:
+        messagebox.showerror("Error", f"Error en los cálculos: {str(e)}")
+        return
+        
+    window = simpledialog.askinteger("Ventana móvil", "Observaciones por ventana:", parent=ventana, minvalue=2)
+    if window is None:
+        return
+        
+    test_type = test_type_combobox.get()
+    data_file, column = loaded_sources.get(data_entry, (None, None))
+    
+    def compute(task):
+        # Las ventanas necesitan la serie en orden: si la columna se leyó por bloques, se relee completa
+        if isinstance(data, str):
+            series = convert_text(data)
+        elif isinstance(data, np.ndarray):
+            series = data
+        else:
+            series = data_file.cargar_serie(column)
+        task.verificar()
+        return intervalos_moviles(series, window, conf_level / 100, test_type)
+    
+    task_runner.enviar("intervalo", compute,
+                       lambda resultado: show_rolling_intervals(resultado, conf_level, results_text),
+                       show_error("Error en los cálculos"), mensaje="Calculando los intervalos por ventana móvil…")
+
+def show_rolling_intervals(resultado, conf_level, results_text):
+    """Resumen de los intervalos por ventana móvil y gráfica de la banda en su propia ventana"""
+    media, lower, upper = resultado['media'], resultado['inferior'], resultado['superior']
+    width = upper - lower
+    if resultado['prueba'] == "Z":
+        distribution = "normal estándar (Z)"
+    else:
+        distribution = f"t-Student con {resultado['gl']} grados de libertad"
+    
+    results_text_content = f"""
+📊 Intervalos de Confianza por Ventana Móvil
+    📥 Datos de entrada
+
+        🧮 Observaciones: {len(media) + resultado['ventana'] - 1}
+
+        🪟 Tamaño de ventana: {resultado['ventana']}  ({len(media)} ventanas)
+
+        🎯 Nivel de confianza: {conf_level:.1f}%
+
+        📏 Valor crítico ({distribution}): {resultado['critico']:.6f}
+
+    🔍 Resumen de las ventanas
+
+        📈 Media por ventana: mínima {media.min():.6f}, máxima {media.max():.6f}
+
+        📐 Ancho del intervalo: mínimo {width.min():.6f}, promedio {width.mean():.6f}, máximo {width.max():.6f}
+
+    ✅ Última ventana
+
+        📌 Intervalo de confianza al {conf_level:.1f}%: [{lower[-1]:.6f}, {upper[-1]:.6f}]
+        """
+    
+    results_text.delete(1.0, tk.END)
+    results_text.insert(tk.INSERT, results_text_content)
+    plot_rolling_band(resultado, conf_level, results_text.winfo_toplevel())
+
+# Puntos de la banda que se dibujan: la serie se resume por tramos (mínimo del límite inferior,
+# máximo del superior y media de las medias), así la gráfica no depende del largo de la serie
+BAND_POINTS = 2000
+
+def reduce_band(resultado, points=BAND_POINTS):
+    """Posición, media, límite inferior y superior de la banda resumidos a lo más `points` tramos"""
+    media, lower, upper = resultado['media'], resultado['inferior'], resultado['superior']
+    step = max(1, -(-len(media) // points))
+    starts = np.arange(0, len(media), step)
+    counts = np.diff(np.r_[starts, len(media)])
+    x = resultado['inicio'] + starts + (counts - 1) / 2
+    return (x, np.add.reduceat(media, starts) / counts,
+            np.minimum.reduceat(lower, starts), np.maximum.reduceat(upper, starts))
+
+def plot_rolling_band(resultado, conf_level, master):
+    """Dibuja la media y la banda de los intervalos por ventana en una ventana aparte (se reutiliza)"""
+    plot = plots.get('rolling')
+    if plot is None or not plot['window'].winfo_exists():
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        
+        window = tk.Toplevel(master)
+        window.title("Intervalos por ventana móvil")
+        window.geometry("900x450")
+        fig = Figure()
+        ax = fig.add_subplot()
+        fig.patch.set_facecolor('#403d39')
+        ax.set_facecolor('#403d39')
+        ax.tick_params(axis='x', colors='white')
+        ax.tick_params(axis='y', colors='white')
+        for spine in ax.spines.values():
+            spine.set_color('white')
+        ax.set_xlabel('Observación (fin de la ventana)', color='white', fontsize=11)
+        ax.set_ylabel('Media', color='white', fontsize=11)
+        plot = {'window': window, 'fig': fig, 'ax': ax, 'band': None}
+        plot['line'], = ax.plot([], [], color='#f08c00', linewidth=1.5, label='Media de la ventana')
+        plot['canvas'] = FigureCanvasTkAgg(fig, master=window)
+        NavigationToolbar2Tk(plot['canvas'], window)
+        plot['canvas'].get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        plots['rolling'] = plot
+    
+    x, media, lower, upper = reduce_band(resultado)
+    ax = plot['ax']
+    plot['line'].set_data(x, media)
+    if plot['band'] is not None:
+        plot['band'].remove()
+    plot['band'] = ax.fill_between(x, lower, upper, color='#197278', alpha=0.4,
+                                   label=f'IC {conf_level:.1f}% (ventana de {resultado["ventana"]})')
+    ax.set_title(f'Intervalos de confianza por ventana móvil ({len(resultado["media"])} ventanas)',
+                 color='white', fontsize=12)
+    ax.legend(loc='upper left')
+    ax.relim()
+    ax.autoscale_view()
+    plot['canvas'].draw_idle()
+    plot['window'].lift()
+
+def show_hypothesis_test(resultado, null_value, alpha, test_type, direction, results_text, graph_frame):
+    """Muestra el resultado de la prueba de hipótesis y su gráfica"""
+    try:
+        n = resultado.n
+        mean = resultado.media
+        std_dev = resultado.desv_std
+        std_error = resultado.error_std
+        test_stat = resultado.estadistico
+        p_value = resultado.valor_p
+        critical_value = resultado.critico
+        hypothesis_alt = resultado.hipotesis_alt
+        reject = resultado.rechaza
+        
+        if resultado.prueba == "Z":
             distribution = "distribución normal estándar (Z)"
-            
         else:
-            # Prueba t
-            df = n - 1
-            if direction == "Dos colas":
-                p_value = 2 * (1 - stats.t.cdf(abs(test_stat), df))
-                critical_value = stats.t.ppf(1 - alpha/2, df)
-                hypothesis_alt = f"μ ≠ {null_value}"
-            elif direction == "Cola izquierda":
-                p_value = stats.t.cdf(test_stat, df)
-                critical_value = stats.t.ppf(alpha, df)
-                hypothesis_alt = f"μ < {null_value}"
-            else:  # Cola derecha
-                p_value = 1 - stats.t.cdf(test_stat, df)
-                critical_value = stats.t.ppf(1 - alpha, df)
-                hypothesis_alt = f"μ > {null_value}"
-                
-            distribution = f"distribución t con {df} grados de libertad"
-            
-        # Decisión de la prueba
-        if direction == "Dos colas":
-            reject = abs(test_stat) > abs(critical_value)
-        elif direction == "Cola izquierda":
-            reject = test_stat < critical_value
-        else:  # Cola derecha
-            reject = test_stat > critical_value
+            distribution = f"distribución t con {resultado.gl} grados de libertad"
             
         decision = "Se rechaza" if reject else "No se rechaza"
         
@@ -284,22 +522,126 @@ def calculate_hypothesis_test(data_entry, null_hypo_entry, alpha_entry, test_typ
         results_text.delete(1.0, tk.END)
         results_text.insert(tk.INSERT, result_text)
 
-        # Limpiar el frame de la gráfica antes de dibujar
-        for widget in graph_frame.winfo_children():
-            widget.destroy()
-        
-        # Llamar a la función de graficado
+        # Actualizar la gráfica de la pestaña (se reutiliza la misma figura)
         plot_distribution(test_stat, critical_value, test_type, direction, n, graph_frame)
         
     except Exception as e:
         messagebox.showerror("Error", f"Error en los cálculos: {str(e)}")
 
-def load_data(ventana, conf_data_entry=None, hypo_data_entry=None):
-    """Carga datos desde un archivo"""
+# Prueba secuencial de cada campo de datos: ((μ₀, α, dirección), texto ya procesado, PruebaSecuencial).
+# Si el campo solo creció al final, al volver a calcular se procesan únicamente los datos nuevos
+sequential_tests = {}
+SEPARATORS = ",; \t\r\n"
+
+def calculate_sequential_test(data_entry, null_hypo_entry, alpha_entry, direction_combobox, results_text):
+    """Prueba secuencial (mSPRT) con los datos en el orden del campo, en segundo plano"""
+    data = get_sample_data(data_entry)
+    if data is None:
+        return
+        
+    try:
+        null_value = float(null_hypo_entry.get())
+        alpha = float(alpha_entry.get())
+        
+        if alpha <= 0 or alpha >= 1:
+            messagebox.showerror("Error", "El nivel de significancia (α) debe estar entre 0 y 1")
+            return
+    except Exception as e:
+        messagebox.showerror("Error", f"Error en los cálculos: {str(e)}")
+        return
+        
+    direction = direction_combobox.get()
+    params = (null_value, alpha, direction)
+    previous_params, previous_text, previous_test = sequential_tests.get(data_entry, (None, None, None))
+    data_file, column = loaded_sources.get(data_entry, (None, None))
+    
+    def compute(task):
+        if (isinstance(data, str) and params == previous_params and previous_text
+                and data.startswith(previous_text)
+                and (previous_text[-1] in SEPARATORS or data[len(previous_text):][:1] in SEPARATORS)):
+            # Solo llegaron observaciones al final: se continúa la prueba (en una copia) con ellas
+            test = copy.copy(previous_test)
+            new_data = data[len(previous_text):]
+        else:
+            test = PruebaSecuencial(null_value, alpha, direction)
+            new_data = data
+        if isinstance(new_data, str):
+            values = convert_text(new_data) if new_data.strip(SEPARATORS) else np.empty(0)
+        elif isinstance(new_data, np.ndarray):
+            values = new_data
+        else:
+            # Columna leída por bloques: la prueba necesita las observaciones en orden
+            values = data_file.cargar_serie(column)
+        test.agregar_arreglo(values)
+        return test
+    
+    def finish(test):
+        sequential_tests[data_entry] = (params, data if isinstance(data, str) else "", test)
+        show_sequential_test(test.resultado(), direction, results_text)
+    
+    task_runner.enviar("prueba", compute, finish, show_error("Error en los cálculos"),
+                       mensaje="Calculando la prueba secuencial…")
+
+def show_sequential_test(resultado, direction, results_text):
+    """Muestra el estado de la prueba secuencial: decisión, momento de parada y límites actuales"""
+    if resultado.n < 2:
+        messagebox.showerror("Error", "Se necesitan al menos 2 puntos de datos")
+        return
+    
+    def limit(value):
+        return "—" if value is None else f"{value:.6f}"
+    
+    if resultado.rechaza:
+        decision = f"Se rechaza la hipótesis nula; se pudo detener en la observación {resultado.parada}"
+    elif resultado.limite_inferior is None and resultado.limite_superior is None:
+        decision = "Aún no hay suficientes observaciones para evaluar la prueba"
+    else:
+        decision = "Todavía no se rechaza la hipótesis nula: se puede seguir observando"
+    
+    result_text = f"""
+🧪 Prueba Secuencial para la Media (mSPRT, siempre válida)
+    📥 Datos de Entrada
+
+        🔢 Observaciones recibidas (n): {resultado.n}
+
+        📊 Media muestral (x̄): {resultado.media:.6f}
+
+        📈 Desviación estándar muestral (s): {resultado.desv_std:.6f}
+
+        🎯 Valor de la hipótesis nula (μ₀): {resultado.valor_nulo}
+
+        ⚠️ Nivel de significancia (α): {resultado.alpha}
+
+        ↔️ Dirección: {direction}
+
+        🧾 H₁: {resultado.hipotesis_alt}
+
+    🧮 Estado de la prueba
+
+        📏 log Λₙ: {resultado.log_razon:.6f}  (umbral log(1/α) = {resultado.umbral:.6f})
+
+        🚧 Límites actuales para x̄: inferior {limit(resultado.limite_inferior)}, superior {limit(resultado.limite_superior)}
+
+        📉 Valor p siempre válido: {resultado.valor_p:.6f}
+
+    ✅ Resultado
+
+        📝 {decision}
+
+        💡 La decisión es válida aunque se revise tras cada observación y se detenga en cuanto se rechace.
+        """
+    results_text.delete(1.0, tk.END)
+    results_text.insert(tk.INSERT, result_text)
+
+def load_data(ventana, conf_data_entry=None, hypo_data_entry=None, booleanas=False, on_loaded=None):
+    """Carga datos desde un archivo; con booleanas también se ofrecen las columnas booleanas (proporciones)"""
     filetypes = [
         ("Archivos CSV", "*.csv"),
         ("Archivos Excel", "*.xlsx"),
         ("Archivos Parquet", "*.parquet"),
+        ("Arreglos NumPy", "*.npy"),
+        ("Binarios float32/float64", "*.f32 *.f64"),
+        ("Archivos Arrow/Feather", "*.arrow *.feather"),
         ("Todos los archivos", "*.*")
     ]
     
@@ -308,74 +650,476 @@ def load_data(ventana, conf_data_entry=None, hypo_data_entry=None):
     if not filename:
         return
         
+    # Solo se lee el esquema del archivo (en segundo plano); la columna elegida se lee después
+    # (por bloques si es un CSV muy grande)
+    task_runner.enviar("carga", lambda task: ArchivoDatos(filename, booleanas=booleanas),
+                       lambda data_file: select_column(ventana, data_file, conf_data_entry, hypo_data_entry,
+                                                       on_loaded, counts_only=booleanas),
+                       show_error("Error al cargar el archivo"), mensaje="Leyendo el archivo…")
+
+def select_column(ventana, data_file, conf_data_entry=None, hypo_data_entry=None, on_loaded=None, counts_only=False):
+    """Pregunta qué columna numérica usar y la carga en segundo plano.
+
+    Con counts_only (proporciones) solo se cuentan éxitos y ensayos de la columna, sin pasarla a float.
+    """
+    # Verificar que haya datos numéricos
+    numeric_cols = data_file.columnas
+    
+    if len(numeric_cols) == 0:
+        messagebox.showerror("Error", "No se encontraron columnas numéricas en el archivo")
+        return
+        
+    # Si hay más de una columna numérica, preguntar cuál usar
+    selected_col = None
+    if len(numeric_cols) > 1:
+        col_select_window = tk.Toplevel(ventana)
+        col_select_window.title("Seleccionar columna")
+        col_select_window.geometry("300x200")
+        
+        # Variable para almacenar la columna seleccionada
+        selected_var = tk.StringVar(value=numeric_cols[0])
+        
+        tk.Label(col_select_window, text="Seleccione la columna con los datos:").grid(row=0, column=0, padx=10, pady=10)
+        
+        for i, col_name in enumerate(numeric_cols):
+            tk.Radiobutton(col_select_window, text=col_name, variable=selected_var, value=col_name).grid(row=i+1, column=0, sticky="w", padx=20)
+            
+        def confirm_selection():
+            nonlocal selected_col
+            selected_col = selected_var.get()
+            col_select_window.destroy()
+            
+        tk.Button(col_select_window, text="Seleccionar", command=confirm_selection).grid(row=len(numeric_cols)+1, column=0, pady=10)
+        
+        ventana.wait_window(col_select_window)
+        
+        if not selected_col:  # Si no se seleccionó nada
+            return
+    else:
+        selected_col = numeric_cols[0]
+        
+    if counts_only:
+        task_runner.enviar("carga", lambda task: contar_columna(data_file.ruta, selected_col, data_file.filtros),
+                           lambda counts: show_loaded_counts(counts, selected_col, conf_data_entry, hypo_data_entry,
+                                                             data_file, on_loaded),
+                           show_error("Error al cargar el archivo"), mensaje=f"Contando la columna '{selected_col}'…")
+        return
+        
+    # Conservar la columna como arreglo (o sus estadísticos si se leyó por bloques);
+    # la lectura por bloques informa su avance y se puede cancelar entre bloques
+    task_runner.enviar("carga", lambda task: data_file.cargar_columna(selected_col, task.progreso),
+                       lambda selected_data: show_loaded_data(selected_data, selected_col, conf_data_entry, hypo_data_entry,
+                                                              data_file, on_loaded),
+                       show_error("Error al cargar el archivo"), mensaje=f"Cargando la columna '{selected_col}'…")
+
+def show_loaded_data(selected_data, selected_col, conf_data_entry=None, hypo_data_entry=None, data_file=None,
+                     on_loaded=None):
+    """Coloca la vista previa de la columna cargada en el campo de datos"""
+    # El campo solo muestra una vista previa
+    preview = vista_previa(selected_data, selected_col)
+    
+    # Actualizar el campo correspondiente según la pestaña
+    for data_entry in (conf_data_entry, hypo_data_entry):
+        if data_entry is not None:
+            data_entry.delete(0, tk.END)
+            data_entry.insert(0, preview)
+            loaded_data[data_entry] = (preview, selected_data)
+            loaded_sources[data_entry] = (data_file, selected_col)
+            loaded_counts.pop(data_entry, None)
+        
+    messagebox.showinfo("Éxito", f"Se cargaron {len(selected_data)} datos con éxito")
+    if on_loaded is not None:
+        on_loaded()
+
+def show_loaded_counts(counts, selected_col, conf_data_entry=None, hypo_data_entry=None, data_file=None,
+                       on_loaded=None):
+    """Coloca el resumen de éxitos y ensayos de la columna binaria cargada en el campo de datos"""
+    successes, trials = counts
+    if trials == 0:
+        messagebox.showerror("Error", f"La columna '{selected_col}' no tiene datos")
+        return
+    preview = f"[{trials} datos de '{selected_col}'] {successes} éxitos, p̂ = {successes / trials:g}"
+    # Para las pruebas de media, los estadísticos de una columna 0/1 se obtienen de los conteos
+    summary = AcumuladorMedia(trials, successes / trials, successes * (trials - successes) / trials)
+    for data_entry in (conf_data_entry, hypo_data_entry):
+        if data_entry is not None:
+            data_entry.delete(0, tk.END)
+            data_entry.insert(0, preview)
+            loaded_data[data_entry] = (preview, summary)
+            loaded_sources[data_entry] = (data_file, selected_col)
+            loaded_counts[data_entry] = (preview, counts)
+    if on_loaded is not None:
+        on_loaded(counts)
+
+def show_table_results(results, key_column, title, alpha, null_value, results_text):
+    """Muestra una tabla de resultados por columna o por grupo y ofrece exportarla"""
+    results_text.delete(1.0, tk.END)
+    results_text.insert(tk.INSERT, f"""
+{title} (IC al {(1 - alpha) * 100:.1f}%, μ₀ = {null_value}, α = {alpha})
+
+    🚩 H₀ rechazada en {int(results['rechaza'].sum())} de {len(results)}
+    🧮 Con corrección por pruebas múltiples: Bonferroni {int(results['rechaza_bonferroni'].sum())}, Holm {int(results['rechaza_holm'].sum())}, Benjamini–Hochberg {int(results['rechaza_bh'].sum())}
+
+{results[[key_column, 'n', 'media', 'inferior', 'superior', 'valor_p', 'rechaza', 'valor_p_holm', 'valor_p_bh']].to_string(index=False, max_rows=200)}
+""")
+    
+    export_name = filedialog.asksaveasfilename(
+        title="Exportar tabla de resultados",
+        defaultextension=".csv",
+        filetypes=[("Archivos CSV", "*.csv"), ("Archivos Excel", "*.xlsx"),
+                   ("Archivos Parquet", "*.parquet"), ("Archivos JSON", "*.json")]
+    )
+    if not export_name:
+        return
+        
     try:
-        # Leer el archivo según su extensión
-        extension = os.path.splitext(filename)[1].lower()
-        
-        if extension == '.csv':
-            data = pd.read_csv(filename)
-        elif extension == '.xlsx':
-            data = pd.read_excel(filename)
-        elif extension == '.parquet':
-            data = pd.read_parquet(filename)
-        else:
-            messagebox.showerror("Error", "Formato de archivo no soportado")
+        exportar_resultados(results, export_name)
+        messagebox.showinfo("Éxito", f"Resultados guardados en {export_name}")
+    except Exception as e:
+        messagebox.showerror("Error", f"Error al guardar los resultados: {str(e)}")
+
+def analyze_all_columns(null_hypo_entry, alpha_entry, test_type_combobox, direction_combobox, results_text):
+    """Calcula el intervalo y la prueba de media para todas las columnas numéricas de un archivo"""
+    filetypes = [
+        ("Archivos CSV", "*.csv"),
+        ("Archivos Excel", "*.xlsx"),
+        ("Archivos Parquet", "*.parquet"),
+        ("Archivos Arrow/Feather", "*.arrow *.feather"),
+        ("Todos los archivos", "*.*")
+    ]
+    
+    filename = filedialog.askopenfilename(title="Seleccionar archivo de datos", filetypes=filetypes)
+    
+    if not filename:
+        return
+        
+    try:
+        null_value = float(null_hypo_entry.get())
+        alpha = float(alpha_entry.get())
+        
+        if alpha <= 0 or alpha >= 1:
+            messagebox.showerror("Error", "El nivel de significancia (α) debe estar entre 0 y 1")
+            return
+            
+    except Exception as e:
+        messagebox.showerror("Error", f"Error en el análisis por columnas: {str(e)}")
+        return
+        
+    # El intervalo se calcula con confianza 1 - α
+    direction = direction_combobox.get()
+    test_type = test_type_combobox.get()
+    task_runner.enviar("lotes",
+                       lambda task: analizar_archivo(filename, confianza=1 - alpha, valor_nulo=null_value, alpha=alpha,
+                                                     direccion=direction, prueba=test_type),
+                       lambda results: show_table_results(results, "columna", f"📋 Análisis de {len(results)} columnas", 
+                                                          alpha, null_value, results_text),
+                       show_error("Error en el análisis por columnas"), mensaje="Analizando todas las columnas…")
+
+def analyze_by_group(ventana, null_hypo_entry, alpha_entry, test_type_combobox, direction_combobox, results_text):
+    """Calcula el intervalo y la prueba de media de una columna para cada categoría de otra"""
+    filetypes = [
+        ("Archivos CSV", "*.csv"),
+        ("Archivos Excel", "*.xlsx"),
+        ("Archivos Parquet", "*.parquet"),
+        ("Archivos Arrow/Feather", "*.arrow *.feather"),
+        ("Todos los archivos", "*.*")
+    ]
+    
+    filename = filedialog.askopenfilename(title="Seleccionar archivo de datos", filetypes=filetypes)
+    
+    if not filename:
+        return
+        
+    try:
+        null_value = float(null_hypo_entry.get())
+        alpha = float(alpha_entry.get())
+        
+        if alpha <= 0 or alpha >= 1:
+            messagebox.showerror("Error", "El nivel de significancia (α) debe estar entre 0 y 1")
             return
             
-        # Verificar que haya datos numéricos
-        numeric_cols = data.select_dtypes(include=[np.number]).columns
+    except Exception as e:
+        messagebox.showerror("Error", f"Error en el análisis por grupos: {str(e)}")
+        return
+        
+    direction = direction_combobox.get()
+    test_type = test_type_combobox.get()
+    
+    def select_group_columns(columns):
+        numeric_cols, all_cols = columns
         
         if len(numeric_cols) == 0:
             messagebox.showerror("Error", "No se encontraron columnas numéricas en el archivo")
             return
             
-        # Si hay más de una columna numérica, preguntar cuál usar
-        selected_col = None
-        if len(numeric_cols) > 1:
-            col_select_window = tk.Toplevel(ventana)
-            col_select_window.title("Seleccionar columna")
-            col_select_window.geometry("300x200")
-            
-            # Variable para almacenar la columna seleccionada
-            selected_var = tk.StringVar(value=numeric_cols[0])
-            
-            tk.Label(col_select_window, text="Seleccione la columna con los datos:").grid(row=0, column=0, padx=10, pady=10)
-            
-            for i, col_name in enumerate(numeric_cols):
-                tk.Radiobutton(col_select_window, text=col_name, variable=selected_var, value=col_name).grid(row=i+1, column=0, sticky="w", padx=20)
-                
-            def confirm_selection():
-                nonlocal selected_col
-                selected_col = selected_var.get()
-                col_select_window.destroy()
-                
-            tk.Button(col_select_window, text="Seleccionar", command=confirm_selection).grid(row=len(numeric_cols)+1, column=0, pady=10)
+        # Ventana para elegir la columna de valores y la de grupos
+        selection = {}
+        col_select_window = tk.Toplevel(ventana)
+        col_select_window.title("Análisis por grupos")
+        col_select_window.geometry("340x200")
+        
+        tk.Label(col_select_window, text="Columna con los datos:").grid(row=0, column=0, sticky="w", padx=10, pady=10)
+        value_combobox = ttk.Combobox(col_select_window, values=numeric_cols, state="readonly")
+        value_combobox.current(0)
+        value_combobox.grid(row=0, column=1, padx=10)
+        
+        tk.Label(col_select_window, text="Agrupar por:").grid(row=1, column=0, sticky="w", padx=10, pady=10)
+        group_combobox = ttk.Combobox(col_select_window, values=all_cols, state="readonly")
+        group_combobox.current(0)
+        group_combobox.grid(row=1, column=1, padx=10)
+        
+        def confirm_selection():
+            selection['value'] = value_combobox.get()
+            selection['group'] = group_combobox.get()
+            col_select_window.destroy()
             
-            ventana.wait_window(col_select_window)
+        tk.Button(col_select_window, text="Calcular", command=confirm_selection).grid(row=2, column=0, columnspan=2, pady=10)
+        
+        ventana.wait_window(col_select_window)
+        
+        if not selection:  # Si no se seleccionó nada
+            return
             
-            if not selected_col:  # Si no se seleccionó nada
-                return
-                
-            selected_data = data[selected_col].dropna().tolist()
+        task_runner.enviar("lotes",
+                           lambda task: analizar_archivo_por_grupos(filename, selection['value'], selection['group'],
+                                                                    confianza=1 - alpha, valor_nulo=null_value, alpha=alpha,
+                                                                    direccion=direction, prueba=test_type),
+                           lambda results: show_table_results(results, selection['group'], 
+                                                              f"📋 Análisis de '{selection['value']}' en {len(results)} grupos de '{selection['group']}'", 
+                                                              alpha, null_value, results_text),
+                           show_error("Error en el análisis por grupos"), mensaje="Analizando por grupos…")
+        
+    # Las columnas del archivo se leen en segundo plano y la ventana de selección se abre al terminar
+    task_runner.enviar("lotes", lambda task: (columnas_numericas_archivo(filename), columnas_archivo(filename)),
+                       select_group_columns, show_error("Error en el análisis por grupos"),
+                       mensaje="Leyendo las columnas del archivo…")
+
+def calculate_proportion_test(data_entry, null_hypo_entry, alpha_entry, direction_combobox, results_text,
+                              counts=None):
+    """Prueba z e intervalos para la proporción de 1 (éxitos) en datos 0/1, en segundo plano"""
+    if counts is None and not data_entry.get():
+        # Sin datos, se elige la columna de un archivo (también las booleanas); solo se cuenta
+        # y la prueba sigue con los conteos
+        load_data(data_entry.master, None, data_entry, booleanas=True,
+                  on_loaded=lambda counts: calculate_proportion_test(data_entry, null_hypo_entry, alpha_entry,
+                                                                     direction_combobox, results_text, counts))
+        return
+    if counts is None:
+        # Conteos de una columna cargada para proporciones, si el campo no fue editado
+        preview, loaded = loaded_counts.get(data_entry, (None, None))
+        if data_entry.get() == preview:
+            counts = loaded
+    data = counts if counts is not None else get_sample_data(data_entry)
+    if data is None:
+        return
+        
+    try:
+        null_value = float(null_hypo_entry.get())
+        alpha = float(alpha_entry.get())
+        
+        if alpha <= 0 or alpha >= 1:
+            messagebox.showerror("Error", "El nivel de significancia (α) debe estar entre 0 y 1")
+            return
+        if null_value <= 0 or null_value >= 1:
+            messagebox.showerror("Error", "La proporción de la hipótesis nula (p₀) debe estar entre 0 y 1")
+            return
+    except Exception as e:
+        messagebox.showerror("Error", f"Error en los cálculos: {str(e)}")
+        return
+        
+    direction = direction_combobox.get()
+    data_file, column = loaded_sources.get(data_entry, (None, None))
+    
+    def compute(task):
+        # Solo se cuentan éxitos y ensayos; una columna de archivo se cuenta sin pasarla a float
+        if counts is not None:
+            successes, trials = counts
+        elif isinstance(data, str):
+            successes, trials = contar_exitos(convert_text(data))
+        elif data_file is not None:
+            successes, trials = contar_columna(data_file.ruta, column, data_file.filtros)
         else:
-            selected_data = data[numeric_cols[0]].dropna().tolist()
+            successes, trials = contar_exitos(data)
+        result = proporcion_desde_conteos(successes, trials, null_value, alpha, direction, confianza=1 - alpha)
+        intervals = {method: intervalos_proporcion(successes, trials, 1 - alpha, method)
+                     for method in METODOS_PROPORCION}
+        return result, intervals
+    
+    task_runner.enviar("prueba", compute, lambda results: show_proportion_test(*results, direction, results_text),
+                       show_error("Error en los cálculos"), mensaje="Calculando la prueba de proporción…")
+
+def show_proportion_test(resultado, intervals, direction, results_text):
+    """Muestra la prueba z de la proporción y los intervalos de Wald, Wilson y Agresti–Coull"""
+    decision = "rechaza" if resultado.rechaza else "no rechaza"
+    names = {"wald": "Wald", "wilson": "Wilson", "agresti-coull": "Agresti–Coull"}
+    interval_lines = "\n\n".join(
+        f"        📏 {names[method]}: [{float(interval['inferior']):.6f}, {float(interval['superior']):.6f}]"
+        for method, interval in intervals.items())
+    
+    results_text.delete(1.0, tk.END)
+    results_text.insert(tk.INSERT, f"""
+🎯 Prueba Z para una Proporción
+    📥 Datos de Entrada
+
+        ✅ Éxitos (x): {resultado.exitos}
+
+        🔢 Ensayos (n): {resultado.ensayos}
+
+        📊 Proporción muestral (p̂): {resultado.proporcion:.6f}
+
+        🎯 Proporción de la hipótesis nula (p₀): {resultado.valor_nulo}
+
+        ⚠️ Nivel de significancia (α): {resultado.alpha}
+
+        ↔️ Dirección: {direction}
+
+        🧾 H₁: {resultado.hipotesis_alt}
+
+    🧮 Resultados
+
+        📐 Error estándar bajo H₀: {resultado.error_std:.6f}
+
+        📏 Estadístico Z: {resultado.estadistico:.6f}
+
+        🚧 Valor crítico: {resultado.critico:.6f}
+
+        📉 Valor p: {resultado.valor_p:.6f}
+
+    📊 Intervalos al {(1 - resultado.alpha) * 100:.1f}% para p
+
+{interval_lines}
+
+    ✅ Resultado
+
+        Se {decision} la hipótesis nula (α = {resultado.alpha})
+""")
+
+# Métodos de comparación de dos medias que se ofrecen en la ventana de selección
+TWO_SAMPLE_METHODS = {"Welch (varianzas distintas)": "welch", "Student (varianza agrupada)": "agrupada",
+                      "Pareada (por fila)": "pareada"}
+
+def compare_two_columns(ventana, null_hypo_entry, alpha_entry, test_type_combobox, direction_combobox, results_text):
+    """Compara la media de dos columnas de un archivo: prueba e intervalo para μ₁ - μ₂"""
+    filetypes = [
+        ("Archivos CSV", "*.csv"),
+        ("Archivos Excel", "*.xlsx"),
+        ("Archivos Parquet", "*.parquet"),
+        ("Archivos Arrow/Feather", "*.arrow *.feather"),
+        ("Todos los archivos", "*.*")
+    ]
+    
+    filename = filedialog.askopenfilename(title="Seleccionar archivo de datos", filetypes=filetypes)
+    
+    if not filename:
+        return
+        
+    try:
+        null_value = float(null_hypo_entry.get())
+        alpha = float(alpha_entry.get())
+        
+        if alpha <= 0 or alpha >= 1:
+            messagebox.showerror("Error", "El nivel de significancia (α) debe estar entre 0 y 1")
+            return
+            
+    except Exception as e:
+        messagebox.showerror("Error", f"Error en la comparación de columnas: {str(e)}")
+        return
+        
+    direction = direction_combobox.get()
+    test_type = test_type_combobox.get()
+    
+    def select_columns(numeric_cols):
+        if len(numeric_cols) < 2:
+            messagebox.showerror("Error", "Se necesitan al menos dos columnas numéricas en el archivo")
+            return
             
-        # Convertir la lista a una cadena separada por comas
-        data_str = ", ".join(map(str, selected_data))
+        # Ventana para elegir las dos columnas y el método
+        selection = {}
+        col_select_window = tk.Toplevel(ventana)
+        col_select_window.title("Comparar dos columnas")
+        col_select_window.geometry("380x230")
+        
+        tk.Label(col_select_window, text="Muestra 1:").grid(row=0, column=0, sticky="w", padx=10, pady=10)
+        first_combobox = ttk.Combobox(col_select_window, values=numeric_cols, state="readonly")
+        first_combobox.current(0)
+        first_combobox.grid(row=0, column=1, padx=10)
         
-        # Actualizar el campo correspondiente según la pestaña
-        if conf_data_entry is not None:
-            conf_data_entry.delete(0, tk.END)
-            conf_data_entry.insert(0, data_str)
+        tk.Label(col_select_window, text="Muestra 2:").grid(row=1, column=0, sticky="w", padx=10, pady=10)
+        second_combobox = ttk.Combobox(col_select_window, values=numeric_cols, state="readonly")
+        second_combobox.current(1)
+        second_combobox.grid(row=1, column=1, padx=10)
+        
+        tk.Label(col_select_window, text="Método:").grid(row=2, column=0, sticky="w", padx=10, pady=10)
+        method_combobox = ttk.Combobox(col_select_window, values=list(TWO_SAMPLE_METHODS), state="readonly")
+        method_combobox.current(0)
+        method_combobox.grid(row=2, column=1, padx=10)
+        
+        def confirm_selection():
+            selection['first'] = first_combobox.get()
+            selection['second'] = second_combobox.get()
+            selection['method'] = method_combobox.get()
+            col_select_window.destroy()
             
-        if hypo_data_entry is not None:
-            hypo_data_entry.delete(0, tk.END)
-            hypo_data_entry.insert(0, data_str)
+        tk.Button(col_select_window, text="Calcular", command=confirm_selection).grid(row=3, column=0, columnspan=2, pady=10)
+        
+        ventana.wait_window(col_select_window)
+        
+        if not selection:  # Si no se seleccionó nada
+            return
             
-        messagebox.showinfo("Éxito", f"Se cargaron {len(selected_data)} datos con éxito")
+        # El intervalo para la diferencia se calcula con confianza 1 - α
+        task_runner.enviar("lotes",
+                           lambda task: comparar_columnas_archivo(filename, [(selection['first'], selection['second'])],
+                                                                  metodo=TWO_SAMPLE_METHODS[selection['method']],
+                                                                  diferencia_nula=null_value, alpha=alpha,
+                                                                  direccion=direction, confianza=1 - alpha,
+                                                                  prueba=test_type, ajustes=()),
+                           lambda results: show_two_sample_result(results.iloc[0], selection['method'], direction,
+                                                                  alpha, null_value, results_text),
+                           show_error("Error en la comparación de columnas"), mensaje="Comparando columnas…")
         
-    except Exception as e:
-        messagebox.showerror("Error", f"Error al cargar el archivo: {str(e)}")
+    task_runner.enviar("lotes", lambda task: columnas_numericas_archivo(filename), select_columns,
+                       show_error("Error en la comparación de columnas"), mensaje="Leyendo las columnas del archivo…")
+
+def show_two_sample_result(row, method, direction, alpha, null_value, results_text):
+    """Muestra la prueba y el intervalo para la diferencia de medias de dos columnas"""
+    if np.isnan(row['error_std']):
+        messagebox.showerror("Error", "Se necesitan al menos 2 puntos de datos en cada muestra")
+        return
+    
+    symbol = "≠" if direction == "Dos colas" else "<" if direction == "Cola izquierda" else ">"
+    decision = "Se rechaza la hipótesis nula" if row['rechaza'] else "No se rechaza la hipótesis nula"
+    degrees = "—" if np.isnan(row['gl']) else f"{row['gl']:.2f}"
+    
+    results_text.delete(1.0, tk.END)
+    results_text.insert(tk.INSERT, f"""
+⚖️ Comparación de dos medias: {row['columna_1']} - {row['columna_2']}
+    📥 Datos de Entrada
+
+        🧪 Método: {method}
+
+        🔢 Tamaños de muestra (n₁, n₂): {row['n_1']}, {row['n_2']}
+
+        📊 Diferencia de medias (x̄₁ - x̄₂): {row['diferencia']:.6f}
+
+        📐 Error estándar de la diferencia: {row['error_std']:.6f}
+
+        🎲 Grados de libertad: {degrees}
+
+        🧾 H₁: μ₁ - μ₂ {symbol} {null_value}
+
+    🧮 Resultados
+
+        📏 Estadístico de prueba: {row['estadistico']:.6f}
+
+        📉 Valor p: {row['valor_p']:.6f}
+
+        🎯 IC al {(1 - alpha) * 100:.1f}% para μ₁ - μ₂: [{row['inferior']:.6f}, {row['superior']:.6f}]
+
+    ✅ Resultado
+
+        {decision} (α = {alpha})
+""")
 
 def save_results(results_text, title=""):
     """Guarda los resultados en un archivo de texto"""
@@ -395,6 +1139,21 @@ def save_results(results_text, title=""):
     except Exception as e:
         messagebox.showerror("Error", f"Error al guardar los resultados: {str(e)}")
 
+def setup_live_mode(frame, data_entry, watched_widgets, recalculate, row, column):
+    """Casilla "Cálculo en vivo": recalcula cuando se dejan de editar los campos de la pestaña"""
+    live_summaries[data_entry] = ResumenIncremental(convert_text)
+    watchers = [VigilanteEdicion(widget, recalculate) for widget in watched_widgets]
+    live = tk.BooleanVar(frame, False)
+    
+    def toggle():
+        for watcher in watchers:
+            watcher.activar(live.get())
+        if live.get():
+            recalculate()
+    
+    tk.Checkbutton(frame, text="Cálculo en vivo", variable=live, command=toggle, font=("Arial", 12),
+                   bg="#ccc5b9", activebackground="#ccc5b9").grid(row=row, column=column, sticky="w", padx=10)
+
 def setup_confidence_interval_tab(tab):
     """Configura la pestaña de intervalos de confianza"""
     # Variables para almacenar los widgets que necesitarán ser accedidos
@@ -504,6 +1263,24 @@ def setup_confidence_interval_tab(tab):
                                "RESULTADOS DEL INTERVALO DE CONFIANZA"))
     save_button.grid(row=4, column=1, pady=2)
 
+    rolling_button = ttk.Button(conf_widgets['frame'], text="Ventana móvil", style="stBttn.TButton",
+                           command=lambda: calculate_rolling_intervals(
+                               conf_widgets['frame'], 
+                               conf_widgets['data_entry'], 
+                               conf_widgets['conf_level_entry'], 
+                               conf_widgets['test_type'], 
+                               conf_widgets['results']))
+    rolling_button.grid(row=4, column=2, pady=2)
+
+    setup_live_mode(conf_widgets['frame'], conf_widgets['data_entry'],
+                    [conf_widgets['data_entry'], conf_widgets['conf_level_entry'], conf_widgets['test_type']],
+                    lambda: calculate_confidence_interval(
+                        conf_widgets['data_entry'], 
+                        conf_widgets['conf_level_entry'], 
+                        conf_widgets['test_type'], 
+                        conf_widgets['results'], 
+                        conf_widgets['graph_frame'], live=True), row=5, column=0)
+
     # Frame para la gráfica
     conf_widgets['graph_frame'] = tk.Frame(tab)
     conf_widgets['graph_frame'].grid(row=1, column=0, sticky="nsew", padx=10, pady=2)
@@ -633,6 +1410,65 @@ def setup_hypothesis_test_tab(tab):
                                hypo_widgets['results'], 
                                "RESULTADOS DE LA PRUEBA DE HIPÓTESIS"))
     save_button.grid(row=6, column=1)
+
+    batch_button = ttk.Button(hypo_widgets['frame'], text="  Todas las columnas  ", style="stBttn.TButton",
+                           command=lambda: analyze_all_columns(
+                               hypo_widgets['null_hypothesis_entry'], 
+                               hypo_widgets['alpha_entry'], 
+                               hypo_widgets['test_type'], 
+                               hypo_widgets['test_direction'], 
+                               hypo_widgets['results']))
+    batch_button.grid(row=6, column=2)
+
+    group_button = ttk.Button(hypo_widgets['frame'], text="  Por grupos  ", style="stBttn.TButton",
+                           command=lambda: analyze_by_group(
+                               hypo_widgets['frame'], 
+                               hypo_widgets['null_hypothesis_entry'], 
+                               hypo_widgets['alpha_entry'], 
+                               hypo_widgets['test_type'], 
+                               hypo_widgets['test_direction'], 
+                               hypo_widgets['results']))
+    group_button.grid(row=7, column=2)
+
+    sequential_button = ttk.Button(hypo_widgets['frame'], text="  Secuencial  ", style="stBttn.TButton",
+                           command=lambda: calculate_sequential_test(
+                               hypo_widgets['data_entry'], 
+                               hypo_widgets['null_hypothesis_entry'], 
+                               hypo_widgets['alpha_entry'], 
+                               hypo_widgets['test_direction'], 
+                               hypo_widgets['results']))
+    sequential_button.grid(row=7, column=1)
+
+    compare_button = ttk.Button(hypo_widgets['frame'], text="  Dos columnas  ", style="stBttn.TButton",
+                           command=lambda: compare_two_columns(
+                               hypo_widgets['frame'], 
+                               hypo_widgets['null_hypothesis_entry'], 
+                               hypo_widgets['alpha_entry'], 
+                               hypo_widgets['test_type'], 
+                               hypo_widgets['test_direction'], 
+                               hypo_widgets['results']))
+    compare_button.grid(row=8, column=2)
+
+    proportion_button = ttk.Button(hypo_widgets['frame'], text="  Proporción  ", style="stBttn.TButton",
+                           command=lambda: calculate_proportion_test(
+                               hypo_widgets['data_entry'], 
+                               hypo_widgets['null_hypothesis_entry'], 
+                               hypo_widgets['alpha_entry'], 
+                               hypo_widgets['test_direction'], 
+                               hypo_widgets['results']))
+    proportion_button.grid(row=8, column=1)
+
+    setup_live_mode(hypo_widgets['frame'], hypo_widgets['data_entry'],
+                    [hypo_widgets['data_entry'], hypo_widgets['null_hypothesis_entry'], hypo_widgets['alpha_entry'],
+                     hypo_widgets['test_type'], hypo_widgets['test_direction']],
+                    lambda: calculate_hypothesis_test(
+                        hypo_widgets['data_entry'], 
+                        hypo_widgets['null_hypothesis_entry'], 
+                        hypo_widgets['alpha_entry'], 
+                        hypo_widgets['test_type'], 
+                        hypo_widgets['test_direction'], 
+                        hypo_widgets['results'], 
+                        hypo_widgets['graph_frame'], live=True), row=7, column=0)
         
     # Frame para la gráfica
     hypo_widgets['graph_frame'] = tk.Frame(tab)
@@ -695,7 +1531,8 @@ def setup_help_tab(tab):
     <p style="text-align: justify;"><b>NOTA:</b> Para resultados precisos, asegúrese de que los datos sean numéricos y que la muestra sea adecuada para el tipo de prueba seleccionado.</p>
     """
     
-    # Crear el HTMLLabel con el texto de ayuda en HTML
+    # Crear el HTMLLabel con el texto de ayuda en HTML (tkhtmlview se importa solo al mostrar la ayuda)
+    from tkhtmlview import HTMLLabel
     help_area = HTMLLabel(tab, html=help_text, width=80, height=30)
     help_area.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
     
@@ -704,6 +1541,8 @@ def setup_help_tab(tab):
     tab.grid_columnconfigure(0, weight=1)
         
 def main():
+    global task_runner
+    
     # Crear la ventana principal
     ventana = tk.Tk()
     ventana.title("Calculadora estadística")
@@ -721,6 +1560,11 @@ def main():
     
     ventana.grid_columnconfigure(0, weight=1)
     
+    # Barra de estado con el progreso de la tarea en curso y el botón para cancelarla
+    task_bar = BarraTareas(ventana, bg="#fffcf2")
+    task_bar.grid(row=1, column=0, sticky="ew", padx=10)
+    task_runner = EjecutorTareas(ventana, task_bar)
+    
     # Crear un estilo personalizado
     estiloTabs = ttk.Style()
     
@@ -748,7 +1592,12 @@ def main():
     # Configurar las pestañas
     setup_confidence_interval_tab(conf_interval_tab) 
     setup_hypothesis_test_tab(hypothesis_test_tab)
-    setup_help_tab(help_tab)
+    
+    # La pestaña de ayuda se construye la primera vez que se muestra
+    def on_tab_changed(event):
+        if notebook.select() == str(help_tab) and not help_tab.winfo_children():
+            setup_help_tab(help_tab)
+    notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
     
     ventana.option_add('*TCombobox*Listbox.Background', '#fab005') # Color del fondo del menú
     ventana.option_add('*TCombobox*Listbox.selectBackground', '#f08c00') # Fondo de la opción seleccionada
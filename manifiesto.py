@@ -0,0 +1,267 @@
+"""Ejecución en paralelo de un manifiesto de trabajos (intervalo y prueba de media).
+
+Cada trabajo indica su archivo, columna, prueba y parámetros. Los trabajos
+se agrupan por (archivo, filtros) y cada grupo se envía en bloques a los
+procesos del ProcessPoolExecutor; cada proceso lee de una sola vez todas las
+columnas que piden los trabajos del bloque (resumen_archivo: una pasada por
+bloques en CSV grandes, una lectura de las columnas en los demás) y guarda
+sus estadísticos suficientes (AcumuladorMedia) en una caché del proceso; así
+los trabajos que comparten archivo no vuelven a leerlo. Un trabajo con
+parámetros inválidos o una columna que no existe solo deja su mensaje en
+la columna 'error'. Los resultados se escriben en la salida a medida que terminan los
+grupos, en CSV o JSON Lines. Con --ajuste, todos los trabajos del manifiesto
+se toman como una familia de pruebas: los resultados se escriben al final,
+con los valores p ajustados y la decisión de cada corrección.
+
+Manifiesto JSON (lista de objetos, o {"trabajos": [...]}) o CSV con las
+columnas: ruta, columna y, opcionales, id, prueba, confianza, alpha,
+direccion, mu0 y filtro.
+
+Uso: python manifiesto.py trabajos.json resultados.csv [--procesos N] [--ajuste holm]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from analisis_lotes import resumen_archivo
+from carga_datos import ArchivoDatos, interpretar_filtro
+from motor_estadistico import (METODOS_AJUSTE, AcumuladorMedia, ajustar_valores_p, intervalo_desde_resumen,
+                               normalizar_direccion, normalizar_prueba, prueba_desde_resumen)
+
+CAMPOS_RESULTADO = [
+    "id", "ruta", "columna", "filtro", "prueba", "confianza", "alpha", "direccion", "mu0",
+    "n", "media", "desv_std", "error_std", "gl", "critico_ic", "inferior", "superior",
+    "estadistico", "critico_prueba", "valor_p", "rechaza",
+    *(f"{campo}_{metodo}" for metodo in METODOS_AJUSTE for campo in ("valor_p", "rechaza")), "error",
+]
+# Columnas cargadas que conserva cada proceso (solo sus estadísticos suficientes)
+MAXIMO_COLUMNAS_EN_CACHE = 256
+TRABAJOS_POR_BLOQUE = 500
+
+_columnas_cargadas = OrderedDict()
+
+
+def leer_manifiesto(ruta):
+    """Lista de trabajos (diccionarios) de un manifiesto JSON o CSV"""
+    if os.path.splitext(ruta)[1].lower() == ".json":
+        with open(ruta, encoding="utf-8") as archivo:
+            trabajos = json.load(archivo)
+        if isinstance(trabajos, dict):
+            trabajos = trabajos["trabajos"]
+    else:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            trabajos = [{clave: valor for clave, valor in fila.items() if valor not in (None, "")}
+                        for fila in csv.DictReader(archivo)]
+    for posicion, trabajo in enumerate(trabajos):
+        if "ruta" not in trabajo or "columna" not in trabajo:
+            raise ValueError(f"El trabajo {posicion + 1} del manifiesto no indica ruta y columna")
+        trabajo.setdefault("id", posicion + 1)
+    return trabajos
+
+
+@lru_cache(maxsize=64)
+def _abrir(ruta, filtro):
+    """ArchivoDatos del proceso por archivo y filtro, para leer el esquema una sola vez"""
+    return ArchivoDatos(ruta, filtros=[interpretar_filtro(filtro)] if filtro else None)
+
+
+def _guardar(clave, acumulador):
+    _columnas_cargadas[clave] = acumulador
+    if len(_columnas_cargadas) > MAXIMO_COLUMNAS_EN_CACHE:
+        _columnas_cargadas.popitem(last=False)
+
+
+def _cargar(ruta, columna, filtro):
+    """AcumuladorMedia de la columna, tomado de la caché del proceso si ya se cargó"""
+    clave = (os.path.abspath(ruta), columna, filtro)
+    acumulador = _columnas_cargadas.get(clave)
+    if acumulador is not None:
+        _columnas_cargadas.move_to_end(clave)
+        return acumulador
+    datos = _abrir(clave[0], filtro).cargar_columna(columna)
+    acumulador = datos if isinstance(datos, AcumuladorMedia) else AcumuladorMedia.desde_arreglo(datos)
+    _guardar(clave, acumulador)
+    return acumulador
+
+
+def _cargar_columnas(ruta, columnas, filtro):
+    """Guarda en la caché del proceso las columnas que falten, leyéndolas juntas del archivo.
+
+    Las columnas que no están entre las numéricas del archivo se omiten, y si
+    la lectura conjunta falla no se guarda nada: en ambos casos cada trabajo
+    vuelve a cargar su columna con _cargar y, si falla, registra su propio error.
+    """
+    ruta = os.path.abspath(ruta)
+    disponibles = set(_abrir(ruta, filtro).columnas)
+    faltantes = [columna for columna in dict.fromkeys(columnas)
+                 if columna in disponibles and (ruta, columna, filtro) not in _columnas_cargadas]
+    if len(faltantes) < 2:
+        return
+    try:
+        nombres, n, media, desv_std = resumen_archivo(ruta, faltantes,
+                                                      [interpretar_filtro(filtro)] if filtro else None)
+    except Exception:
+        return
+    for columna, n, media, desv_std in zip(nombres, n.tolist(), media.tolist(), desv_std.tolist()):
+        m2 = desv_std * desv_std * (n - 1) if n > 1 else 0.0
+        _guardar((ruta, columna, filtro), AcumuladorMedia(int(n), media if n else 0.0, m2))
+
+
+def ejecutar_trabajo(trabajo):
+    """Fila de resultados de un trabajo; los errores se informan en la columna 'error'"""
+    fila = {
+        "id": trabajo.get("id"), "ruta": trabajo.get("ruta"), "columna": trabajo.get("columna"),
+        "filtro": trabajo.get("filtro", ""), "prueba": trabajo.get("prueba", "t"),
+        "direccion": trabajo.get("direccion", "dos colas"),
+    }
+    try:
+        # Los parámetros se interpretan aquí dentro: un valor inválido solo afecta a este trabajo
+        confianza = float(trabajo.get("confianza", 0.95))
+        fila.update(
+            confianza=confianza / 100 if confianza > 1 else confianza,
+            alpha=float(trabajo.get("alpha", 0.05)), mu0=float(trabajo.get("mu0", 0.0)),
+        )
+        prueba = normalizar_prueba(fila["prueba"])
+        direccion = normalizar_direccion(fila["direccion"])
+        n, media, desv_std = _cargar(fila["ruta"], fila["columna"], fila["filtro"]).resumen()
+        intervalo = intervalo_desde_resumen(n, media, desv_std, fila["confianza"], prueba)
+        resultado = prueba_desde_resumen(n, media, desv_std, fila["mu0"], fila["alpha"], direccion, prueba)
+        fila.update(
+            prueba=prueba, direccion=direccion, n=n, media=media, desv_std=desv_std,
+            error_std=intervalo.error_std, gl=intervalo.gl, critico_ic=intervalo.critico,
+            inferior=intervalo.inferior, superior=intervalo.superior,
+            estadistico=resultado.estadistico, critico_prueba=resultado.critico,
+            valor_p=resultado.valor_p, rechaza=resultado.rechaza,
+        )
+    except Exception as e:
+        fila["error"] = str(e)
+    return fila
+
+
+def ejecutar_bloque(trabajos):
+    """Ejecuta en un proceso un bloque de trabajos que comparten archivo y filtro.
+
+    Las columnas de todos los trabajos del bloque se leen juntas antes de empezar.
+    """
+    try:
+        _cargar_columnas(trabajos[0]["ruta"], [trabajo["columna"] for trabajo in trabajos],
+                         trabajos[0].get("filtro", ""))
+    except Exception:
+        # Cada trabajo vuelve a intentarlo y registra su propio error
+        pass
+    return [ejecutar_trabajo(trabajo) for trabajo in trabajos]
+
+
+def agrupar_trabajos(trabajos, trabajos_por_bloque=TRABAJOS_POR_BLOQUE):
+    """Bloques de trabajos con el mismo (archivo, filtro), de a lo más trabajos_por_bloque.
+
+    Dentro de cada grupo los trabajos se ordenan por columna, para que al
+    partirlo en bloques cada columna quede en el menor número de bloques.
+    """
+    grupos = defaultdict(list)
+    for trabajo in trabajos:
+        grupos[(trabajo["ruta"], trabajo.get("filtro", ""))].append(trabajo)
+    bloques = []
+    for grupo in grupos.values():
+        grupo.sort(key=lambda trabajo: str(trabajo["columna"]))
+        bloques.extend(grupo[i:i + trabajos_por_bloque] for i in range(0, len(grupo), trabajos_por_bloque))
+    # Los bloques más grandes primero, para que no queden al final en un solo proceso
+    bloques.sort(key=len, reverse=True)
+    return bloques
+
+
+def agregar_ajustes(filas, ajustes):
+    """Agrega a las filas los valores p ajustados y la decisión de cada corrección.
+
+    Las filas con error no cuentan en la familia; la decisión usa el α de cada trabajo.
+    """
+    valores_p = [fila.get("valor_p", float("nan")) for fila in filas]
+    for metodo, ajustados in ajustar_valores_p(valores_p, ajustes).items():
+        for fila, ajustado in zip(filas, ajustados.tolist()):
+            if "error" not in fila:
+                fila[f"valor_p_{metodo}"] = ajustado
+                fila[f"rechaza_{metodo}"] = ajustado <= fila["alpha"]
+    return filas
+
+
+class EscritorResultados:
+    """Escribe filas de resultados en CSV o JSON Lines (.jsonl) a medida que llegan"""
+
+    def __init__(self, archivo, formato="csv"):
+        self.archivo = archivo
+        self.formato = formato
+        if formato == "csv":
+            self._csv = csv.DictWriter(archivo, fieldnames=CAMPOS_RESULTADO, restval="")
+            self._csv.writeheader()
+
+    def escribir(self, filas):
+        for fila in filas:
+            if self.formato == "csv":
+                self._csv.writerow(fila)
+            else:
+                self.archivo.write(json.dumps(fila, ensure_ascii=False, default=float) + "\n")
+        self.archivo.flush()
+
+
+def ejecutar_manifiesto(trabajos, escritor, procesos=None, trabajos_por_bloque=TRABAJOS_POR_BLOQUE, ajustes=()):
+    """Reparte los trabajos entre procesos y escribe cada bloque al terminar; devuelve (trabajos, errores).
+
+    Con ajustes, las filas se guardan hasta que terminan todos los bloques,
+    porque cada valor p ajustado depende de la familia completa.
+    """
+    bloques = agrupar_trabajos(trabajos, trabajos_por_bloque)
+    total = errores = 0
+    pendientes_de_ajuste = []
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = [ejecutor.submit(ejecutar_bloque, bloque) for bloque in bloques]
+        for futuro in as_completed(pendientes):
+            filas = futuro.result()
+            if ajustes:
+                pendientes_de_ajuste.extend(filas)
+            else:
+                escritor.escribir(filas)
+            total += len(filas)
+            errores += sum(1 for fila in filas if fila.get("error"))
+    if ajustes:
+        escritor.escribir(agregar_ajustes(pendientes_de_ajuste, ajustes))
+    return total, errores
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Ejecuta en paralelo un manifiesto JSON o CSV de trabajos.")
+    parser.add_argument("manifiesto", help="archivo .json o .csv con los trabajos")
+    parser.add_argument("salida", help="archivo de resultados (.csv o .jsonl); '-' para la salida estándar")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="procesos de trabajo (por defecto, uno por núcleo)")
+    parser.add_argument("--bloque", type=int, default=TRABAJOS_POR_BLOQUE,
+                        help=f"trabajos por bloque enviado a un proceso (por defecto {TRABAJOS_POR_BLOQUE})")
+    parser.add_argument("--ajuste", action="append", dest="ajustes", default=[], metavar="METODO",
+                        choices=list(METODOS_AJUSTE),
+                        help="corrección por pruebas múltiples sobre todo el manifiesto "
+                             "(bonferroni, holm o bh); se puede repetir")
+    argumentos = parser.parse_args(args)
+
+    try:
+        trabajos = leer_manifiesto(argumentos.manifiesto)
+    except (ValueError, KeyError, OSError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+
+    formato = "jsonl" if argumentos.salida.lower().endswith((".jsonl", ".json")) else "csv"
+    if argumentos.salida == "-":
+        total, errores = ejecutar_manifiesto(trabajos, EscritorResultados(sys.stdout), argumentos.procesos,
+                                             argumentos.bloque, argumentos.ajustes)
+    else:
+        with open(argumentos.salida, "w", newline="", encoding="utf-8") as archivo:
+            total, errores = ejecutar_manifiesto(trabajos, EscritorResultados(archivo, formato),
+                                                 argumentos.procesos, argumentos.bloque, argumentos.ajustes)
+    print(f"{total} trabajos, {errores} con error", file=sys.stderr)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1388 @@
+"""Motor estadístico sin interfaz gráfica.
+
+Contiene los cálculos de intervalos de confianza y pruebas de hipótesis
+para la media que usan lastOne.py, pr2.py y 243785EVALUACION.py. No
+importa tkinter ni matplotlib, por lo que puede usarse en procesos por
+lotes o en servidores sin pantalla. scipy se importa en el primer cálculo
+y no al importar el módulo, para que las interfaces arranquen antes.
+"""
+import hashlib
+import re
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+DOS_COLAS = "dos colas"
+COLA_IZQUIERDA = "cola izquierda"
+COLA_DERECHA = "cola derecha"
+
+# Separadores aceptados en los campos de datos: coma, punto y coma y cualquier
+# espacio en blanco (tabulador, salto de línea). Se traducen a espacios para
+# que numpy lea todo el texto en una sola pasada.
+_SEPARADORES = str.maketrans({",": " ", ";": " "})
+_PATRON_SEPARADORES = re.compile(r"[,;\s]+")
+
+
+def normalizar_prueba(tipo_prueba):
+    """Devuelve "Z" o "t" a partir del texto del combobox de tipo de prueba.
+
+    Se toma la primera palabra sin distinguir mayúsculas ("Z (muestra grande)",
+    "z", "t (muestra pequeña)"); cualquier otro valor lanza ValueError en lugar
+    de caer en silencio en la t.
+    """
+    palabras = str(tipo_prueba).replace("(", " ").split()
+    primera = palabras[0].lower() if palabras else ""
+    if primera == "z":
+        return "Z"
+    if primera == "t":
+        return "t"
+    raise ValueError(f"Tipo de prueba no reconocido: '{tipo_prueba}' (use Z o t)")
+
+
+def normalizar_direccion(direccion):
+    """Devuelve la dirección canónica a partir del texto del combobox.
+
+    Acepta los textos de las interfaces ("Dos colas", "< (cola izquierda)"…)
+    y los de la línea de comandos ("dos-colas", "izquierda", "derecha"); otro
+    valor lanza ValueError en lugar de tomarse como cola derecha.
+    """
+    texto = str(direccion).lower().replace("-", " ").replace("_", " ")
+    if "dos colas" in texto:
+        return DOS_COLAS
+    if "izquierda" in texto:
+        return COLA_IZQUIERDA
+    if "derecha" in texto:
+        return COLA_DERECHA
+    raise ValueError(f"Dirección no reconocida: '{direccion}' (use dos colas, cola izquierda o cola derecha)")
+
+
+def _convertir_datos_por_valor(texto):
+    """Conversión valor por valor; señala la posición del primer dato inválido"""
+    valores = []
+    for posicion, valor in enumerate(v for v in _PATRON_SEPARADORES.split(texto) if v):
+        try:
+            valores.append(float(valor))
+        except ValueError:
+            raise ValueError(f"El dato {posicion + 1} ('{valor}') no es un número válido") from None
+    return np.array(valores, dtype=np.float64)
+
+
+def convertir_datos(texto):
+    """Convierte texto con números separados por , ; tabuladores o saltos de línea a un arreglo float64"""
+    if not texto or not texto.strip():
+        raise ValueError("No se ingresaron datos")
+    limpio = texto.translate(_SEPARADORES)
+    if not limpio.strip():
+        raise ValueError("No hay valores numéricos válidos")
+    try:
+        with warnings.catch_warnings():
+            # Versiones anteriores de numpy solo advierten y truncan el resultado
+            warnings.simplefilter("error", DeprecationWarning)
+            datos = np.fromstring(limpio, dtype=np.float64, sep=" ")
+    except (ValueError, DeprecationWarning):
+        # Formatos que numpy no reconoce pero float() sí (p. ej. "1_000"), o un dato inválido
+        return _convertir_datos_por_valor(texto)
+    return datos
+
+
+@dataclass
+class ResultadoIntervalo:
+    """Resultado de un intervalo de confianza para la media"""
+    prueba: str
+    n: int
+    media: float
+    desv_std: float
+    error_std: float
+    confianza: float
+    critico: float
+    margen: float
+    inferior: float
+    superior: float
+    gl: Optional[int] = None
+
+    def como_dict(self):
+        """Formato de diccionario usado por pr2.py y 243785EVALUACION.py"""
+        estadisticas = {
+            "n": self.n, "media": self.media, "desv_std": self.desv_std,
+            "error_std": self.error_std, "critico": self.critico,
+            "margen": self.margen, "prueba": self.prueba
+        }
+        if self.gl is not None:
+            estadisticas["gl"] = self.gl
+        return {"inferior": self.inferior, "superior": self.superior, "estadisticas": estadisticas}
+
+
+@dataclass
+class ResultadoPrueba:
+    """Resultado de una prueba de hipótesis para la media"""
+    prueba: str
+    n: int
+    media: float
+    desv_std: float
+    error_std: float
+    valor_nulo: float
+    alpha: float
+    direccion: str
+    estadistico: float
+    valor_p: float
+    critico: float
+    rechaza: bool
+    hipotesis_alt: str
+    gl: Optional[int] = None
+
+    def como_dict(self):
+        """Formato de diccionario usado por pr2.py y 243785EVALUACION.py"""
+        estadisticas = {
+            "n": self.n, "media": self.media, "desv_std": self.desv_std,
+            "error_std": self.error_std, "hipotesis_alt": self.hipotesis_alt,
+            "prueba": self.prueba
+        }
+        if self.gl is not None:
+            estadisticas["gl"] = self.gl
+        return {"estadistico": self.estadistico, "valor_p": self.valor_p, "estadisticas": estadisticas}
+
+
+@dataclass
+class ResultadoSecuencial:
+    """Estado de una prueba secuencial para la media (mSPRT) tras las observaciones recibidas"""
+    n: int
+    media: float
+    desv_std: float
+    valor_nulo: float
+    alpha: float
+    direccion: str
+    log_razon: float
+    umbral: float
+    valor_p: float
+    limite_inferior: Optional[float]
+    limite_superior: Optional[float]
+    rechaza: bool
+    parada: Optional[int]
+    hipotesis_alt: str
+
+    def como_dict(self):
+        return {
+            "n": self.n, "media": self.media, "desv_std": self.desv_std, "log_razon": self.log_razon,
+            "umbral": self.umbral, "valor_p": self.valor_p, "limite_inferior": self.limite_inferior,
+            "limite_superior": self.limite_superior, "rechaza": self.rechaza, "parada": self.parada,
+            "hipotesis_alt": self.hipotesis_alt
+        }
+
+
+@dataclass
+class ResultadoDosMuestras:
+    """Resultado de una prueba e intervalo para la diferencia de medias (μ₁ - μ₂).
+
+    error_std es el error estándar del intervalo. En la comparación de
+    proporciones el estadístico usa otro, el de la proporción agrupada bajo
+    H₀, que se guarda en error_std_prueba (None cuando es el mismo).
+    """
+    metodo: str
+    prueba: str
+    n1: int
+    n2: int
+    diferencia: float
+    error_std: float
+    diferencia_nula: float
+    alpha: float
+    direccion: str
+    estadistico: float
+    valor_p: float
+    critico: float
+    rechaza: bool
+    hipotesis_alt: str
+    confianza: float
+    inferior: float
+    superior: float
+    gl: Optional[float] = None
+    error_std_prueba: Optional[float] = None
+
+    def como_dict(self):
+        return {
+            "metodo": self.metodo, "prueba": self.prueba, "n1": self.n1, "n2": self.n2,
+            "diferencia": self.diferencia, "error_std": self.error_std, "estadistico": self.estadistico,
+            "valor_p": self.valor_p, "critico": self.critico, "rechaza": self.rechaza,
+            "hipotesis_alt": self.hipotesis_alt, "inferior": self.inferior, "superior": self.superior,
+            "gl": self.gl, "error_std_prueba": self.error_std_prueba
+        }
+
+
+@dataclass
+class ResultadoProporcion:
+    """Resultado de una prueba z e intervalo de confianza para una proporción"""
+    metodo: str
+    exitos: int
+    ensayos: int
+    proporcion: float
+    error_std: float
+    valor_nulo: float
+    alpha: float
+    direccion: str
+    estadistico: float
+    valor_p: float
+    critico: float
+    rechaza: bool
+    hipotesis_alt: str
+    confianza: float
+    critico_ic: float
+    inferior: float
+    superior: float
+
+    def como_dict(self):
+        return {
+            "metodo": self.metodo, "exitos": self.exitos, "ensayos": self.ensayos,
+            "proporcion": self.proporcion, "error_std": self.error_std, "estadistico": self.estadistico,
+            "valor_p": self.valor_p, "critico": self.critico, "rechaza": self.rechaza,
+            "hipotesis_alt": self.hipotesis_alt, "inferior": self.inferior, "superior": self.superior
+        }
+
+
+# Niveles de significancia precalculados en la tabla de valores críticos t
+# (confianza del 99.9%, 99%, 98%, 95%, 90% y 80%)
+NIVELES_COMUNES = (0.001, 0.01, 0.02, 0.05, 0.10, 0.20)
+
+
+def _cdf(prueba, gl, x):
+    """Función de distribución de Z o t; usa scipy.special para evitar el costo de scipy.stats"""
+    from scipy import special
+    return special.ndtr(x) if prueba == "Z" else special.stdtr(gl, x)
+
+
+def _sf(prueba, gl, x):
+    """Función de supervivencia (1 - cdf) de Z o t, ambas simétricas"""
+    return _cdf(prueba, gl, -np.asarray(x))
+
+
+def _cuantil(prueba, gl, probabilidad):
+    from scipy import special
+    return special.ndtri(probabilidad) if prueba == "Z" else special.stdtrit(gl, probabilidad)
+
+
+def _calcular_critico(prueba, gl, cola, alpha):
+    if cola == DOS_COLAS:
+        return _cuantil(prueba, gl, 1 - alpha / 2)
+    if cola == COLA_IZQUIERDA:
+        return _cuantil(prueba, gl, alpha)
+    return _cuantil(prueba, gl, 1 - alpha)
+
+
+class CacheCriticos:
+    """Valores críticos de Z y t memorizados por (distribución, gl, cola, α).
+
+    Para la t y los niveles de NIVELES_COMUNES usa una tabla precalculada con
+    gl de 1 a gl_maximo_tabla; el resto se guarda en una caché LRU acotada a
+    tamano_maximo entradas. Los contadores de aciertos y fallos se consultan
+    con estadisticas(). La comparten los hilos de EjecutorTareas y el servicio
+    HTTP, así que la LRU y los contadores se modifican bajo un candado; los
+    valores se calculan fuera de él.
+    """
+
+    def __init__(self, tamano_maximo=4096, gl_maximo_tabla=1000, niveles_tabla=NIVELES_COMUNES):
+        self.tamano_maximo = tamano_maximo
+        self.gl_maximo_tabla = gl_maximo_tabla
+        self.niveles_tabla = tuple(niveles_tabla)
+        self._entradas = OrderedDict()
+        self._tabla = None
+        self._candado = threading.Lock()
+        self.limpiar()
+
+    def limpiar(self):
+        """Vacía la caché LRU y reinicia los contadores (la tabla se conserva)"""
+        with self._candado:
+            self._entradas.clear()
+            self.aciertos_tabla = 0
+            self.aciertos = 0
+            self.fallos = 0
+
+    def _precalcular(self):
+        from scipy import special
+        gl = np.arange(1, self.gl_maximo_tabla + 1)
+        alphas = np.asarray(self.niveles_tabla)[:, np.newaxis]
+        # Filas: niveles; columnas: gl. La cola izquierda es la derecha con signo opuesto.
+        # El índice se asigna antes que la tabla: otro hilo que ya vea la tabla también verá el índice
+        self._indice_nivel = {_clave_nivel(alpha): i for i, alpha in enumerate(self.niveles_tabla)}
+        self._tabla = {
+            DOS_COLAS: special.stdtrit(gl, 1 - alphas / 2),
+            COLA_DERECHA: special.stdtrit(gl, 1 - alphas),
+        }
+
+    def _fila_tabla(self, cola, alpha):
+        """Fila de la tabla para (cola, α) y el signo a aplicar, o (None, 1) si α no está tabulado"""
+        if self._tabla is None:
+            self._precalcular()
+        indice = self._indice_nivel.get(alpha)
+        if indice is None:
+            return None, 1
+        fila = self._tabla[DOS_COLAS if cola == DOS_COLAS else COLA_DERECHA][indice]
+        return fila, (-1 if cola == COLA_IZQUIERDA else 1)
+
+    def valor(self, prueba, gl, cola, alpha):
+        """Valor crítico para un solo (distribución, gl, cola, α)"""
+        prueba = normalizar_prueba(prueba)
+        cola = normalizar_direccion(cola)
+        alpha = _clave_nivel(alpha)
+        if prueba == "Z":
+            gl = None
+        elif gl is None or np.isnan(gl):
+            return float("nan")
+        elif float(gl).is_integer() and 1 <= gl <= self.gl_maximo_tabla:
+            fila, signo = self._fila_tabla(cola, alpha)
+            if fila is not None:
+                with self._candado:
+                    self.aciertos_tabla += 1
+                return signo * float(fila[int(gl) - 1])
+
+        clave = (prueba, gl, cola, alpha)
+        with self._candado:
+            valor = self._entradas.get(clave)
+            if valor is not None:
+                self.aciertos += 1
+                self._entradas.move_to_end(clave)
+                return valor
+            self.fallos += 1
+        valor = float(_calcular_critico(prueba, gl, cola, alpha))
+        with self._candado:
+            self._entradas[clave] = valor
+            if len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+        return valor
+
+    def valores(self, prueba, gl, cola, alpha):
+        """Valores críticos para un arreglo de gl (mismo α y cola para todos)"""
+        prueba = normalizar_prueba(prueba)
+        cola = normalizar_direccion(cola)
+        alpha = _clave_nivel(alpha)
+        gl = np.asarray(gl, dtype=np.float64)
+        if prueba == "Z":
+            return np.full(gl.shape, self.valor("Z", None, cola, alpha))
+
+        resultado = np.full(gl.shape, np.nan)
+        fila, signo = self._fila_tabla(cola, alpha)
+        en_tabla = np.zeros(gl.shape, dtype=bool)
+        if fila is not None:
+            with np.errstate(invalid="ignore"):
+                en_tabla = (gl >= 1) & (gl <= self.gl_maximo_tabla) & (gl == np.round(gl))
+            resultado[en_tabla] = signo * fila[gl[en_tabla].astype(np.int64) - 1]
+            with self._candado:
+                self.aciertos_tabla += int(en_tabla.sum())
+
+        # Fuera de la tabla: un solo cálculo por cada gl distinto
+        resto = ~en_tabla & ~np.isnan(gl)
+        if resto.any():
+            unicos, inversa = np.unique(gl[resto], return_inverse=True)
+            with self._candado:
+                self.fallos += len(unicos)
+            resultado[resto] = _calcular_critico("t", unicos, cola, alpha)[inversa]
+        return resultado
+
+    def estadisticas(self):
+        """Contadores de aciertos (tabla y LRU), fallos y ocupación de la caché"""
+        with self._candado:
+            return {
+                "aciertos_tabla": self.aciertos_tabla, "aciertos": self.aciertos,
+                "fallos": self.fallos, "tamano": len(self._entradas),
+                "tamano_maximo": self.tamano_maximo,
+            }
+
+
+def _clave_nivel(alpha):
+    # 1 - 0.95 no es exactamente 0.05 en coma flotante; se redondea para usarlo como clave
+    return round(float(alpha), 12)
+
+
+cache_criticos = CacheCriticos()
+
+
+def valor_critico(prueba, gl, cola, alpha):
+    """Valor crítico de Z o t desde la caché compartida"""
+    return cache_criticos.valor(prueba, gl, cola, alpha)
+
+
+def resumen_muestra(datos):
+    """Tamaño, media y desviación estándar muestral (ddof=1) de los datos"""
+    if isinstance(datos, AcumuladorMedia):
+        return datos.resumen()
+    datos = np.asarray(datos, dtype=np.float64)
+    n = datos.size
+    if n < 2:
+        raise ValueError("Se necesitan al menos 2 puntos de datos")
+    return n, float(np.mean(datos)), float(np.std(datos, ddof=1))
+
+
+def intervalo_desde_resumen(n, media, desv_std, confianza, prueba="t"):
+    """Intervalo de confianza a partir de n, media y desviación estándar"""
+    if not 0 < confianza < 1:
+        raise ValueError("El nivel de confianza debe estar entre 0 y 1")
+    prueba = normalizar_prueba(prueba)
+    error_std = float(desv_std / np.sqrt(n))
+    gl = None if prueba == "Z" else n - 1
+    critico = valor_critico(prueba, gl, DOS_COLAS, 1 - confianza)
+    margen = critico * error_std
+    return ResultadoIntervalo(
+        prueba=prueba, n=n, media=media, desv_std=desv_std, error_std=error_std,
+        confianza=confianza, critico=float(critico), margen=float(margen),
+        inferior=float(media - margen), superior=float(media + margen), gl=gl
+    )
+
+
+def prueba_desde_resumen(n, media, desv_std, valor_nulo, alpha, direccion=DOS_COLAS, prueba="t"):
+    """Prueba de hipótesis para la media a partir de n, media y desviación estándar"""
+    if not 0 < alpha < 1:
+        raise ValueError("El nivel de significancia (α) debe estar entre 0 y 1")
+    prueba = normalizar_prueba(prueba)
+    direccion = normalizar_direccion(direccion)
+    gl = None if prueba == "Z" else n - 1
+
+    error_std = float(desv_std / np.sqrt(n))
+    estadistico = (media - valor_nulo) / error_std
+    critico = valor_critico(prueba, gl, direccion, alpha)
+
+    if direccion == DOS_COLAS:
+        valor_p = 2 * _sf(prueba, gl, abs(estadistico))
+        hipotesis_alt = f"μ ≠ {valor_nulo}"
+    elif direccion == COLA_IZQUIERDA:
+        valor_p = _cdf(prueba, gl, estadistico)
+        hipotesis_alt = f"μ < {valor_nulo}"
+    else:
+        valor_p = _sf(prueba, gl, estadistico)
+        hipotesis_alt = f"μ > {valor_nulo}"
+
+    return ResultadoPrueba(
+        prueba=prueba, n=n, media=media, desv_std=desv_std, error_std=error_std,
+        valor_nulo=valor_nulo, alpha=alpha, direccion=direccion,
+        estadistico=float(estadistico), valor_p=float(valor_p), critico=float(critico),
+        rechaza=bool(valor_p <= alpha), hipotesis_alt=hipotesis_alt, gl=gl
+    )
+
+
+def intervalos_vectorizados(n, media, desv_std, confianza, prueba="t"):
+    """Intervalos de confianza para muchas muestras a la vez a partir de arreglos de resúmenes.
+
+    Devuelve un diccionario de arreglos con las mismas claves que ResultadoIntervalo.
+    Las muestras con menos de 2 datos dan NaN.
+    """
+    if not 0 < confianza < 1:
+        raise ValueError("El nivel de confianza debe estar entre 0 y 1")
+    prueba = normalizar_prueba(prueba)
+    n = np.asarray(n, dtype=np.float64)
+    media = np.asarray(media, dtype=np.float64)
+    desv_std = np.where(n > 1, np.asarray(desv_std, dtype=np.float64), np.nan)
+    error_std = desv_std / np.sqrt(n)
+    if prueba == "Z":
+        gl = np.full(n.shape, np.nan)
+    else:
+        gl = np.where(n > 1, n - 1, np.nan)
+    critico = cache_criticos.valores(prueba, gl, DOS_COLAS, 1 - confianza)
+    margen = critico * error_std
+    return {
+        "n": n, "media": media, "desv_std": desv_std, "error_std": error_std,
+        "critico": critico, "margen": margen, "inferior": media - margen,
+        "superior": media + margen, "gl": gl
+    }
+
+
+def pruebas_vectorizadas(n, media, desv_std, valor_nulo, alpha, direccion=DOS_COLAS, prueba="t"):
+    """Pruebas de hipótesis para muchas muestras a la vez a partir de arreglos de resúmenes.
+
+    valor_nulo puede ser un escalar o un arreglo. Devuelve un diccionario de
+    arreglos con las mismas claves numéricas que ResultadoPrueba.
+    """
+    if not 0 < alpha < 1:
+        raise ValueError("El nivel de significancia (α) debe estar entre 0 y 1")
+    prueba = normalizar_prueba(prueba)
+    direccion = normalizar_direccion(direccion)
+    n = np.asarray(n, dtype=np.float64)
+    media = np.asarray(media, dtype=np.float64)
+    desv_std = np.where(n > 1, np.asarray(desv_std, dtype=np.float64), np.nan)
+    error_std = desv_std / np.sqrt(n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estadistico = (media - valor_nulo) / error_std
+
+    gl = np.full(n.shape, np.nan) if prueba == "Z" else np.where(n > 1, n - 1, np.nan)
+    critico = cache_criticos.valores(prueba, gl, direccion, alpha)
+
+    if direccion == DOS_COLAS:
+        valor_p = 2 * _sf(prueba, gl, np.abs(estadistico))
+    elif direccion == COLA_IZQUIERDA:
+        valor_p = _cdf(prueba, gl, estadistico)
+    else:
+        valor_p = _sf(prueba, gl, estadistico)
+
+    return {
+        "n": n, "media": media, "desv_std": desv_std, "error_std": error_std,
+        "estadistico": estadistico, "valor_p": valor_p, "critico": critico,
+        "rechaza": valor_p <= alpha, "gl": gl
+    }
+
+
+WELCH = "welch"
+AGRUPADA = "agrupada"
+PAREADA = "pareada"
+METODOS_DOS_MUESTRAS = (WELCH, AGRUPADA, PAREADA)
+
+
+def normalizar_metodo(metodo):
+    """Método canónico de comparación de dos medias ("student" y "pooled" equivalen a "agrupada")"""
+    texto = str(metodo).strip().lower()
+    if "welch" in texto:
+        return WELCH
+    if "agrupada" in texto or "student" in texto or "pooled" in texto:
+        return AGRUPADA
+    if "pareada" in texto or "paired" in texto:
+        return PAREADA
+    raise ValueError(f"Método no reconocido: {metodo} (use {', '.join(METODOS_DOS_MUESTRAS)})")
+
+
+def _valor_p(prueba, gl, estadistico, direccion):
+    if direccion == DOS_COLAS:
+        return 2 * _sf(prueba, gl, np.abs(estadistico))
+    if direccion == COLA_IZQUIERDA:
+        return _cdf(prueba, gl, estadistico)
+    return _sf(prueba, gl, estadistico)
+
+
+def _prueba_diferencia(diferencia, error_std, gl, diferencia_nula, alpha, direccion, confianza, prueba,
+                       error_std_prueba=None):
+    """Estadístico, valor p, valor crítico e intervalo de una diferencia con su error estándar y gl.
+
+    error_std_prueba, si se indica, es el error estándar bajo H₀ para el
+    estadístico (p. ej. la proporción agrupada); el intervalo usa error_std.
+    """
+    if not 0 < alpha < 1:
+        raise ValueError("El nivel de significancia (α) debe estar entre 0 y 1")
+    if not 0 < confianza < 1:
+        raise ValueError("El nivel de confianza debe estar entre 0 y 1")
+    if prueba == "Z":
+        gl = np.full(diferencia.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estadistico = (diferencia - diferencia_nula) / (error_std if error_std_prueba is None else error_std_prueba)
+    valor_p = _valor_p(prueba, gl, estadistico, direccion)
+    critico_ic = cache_criticos.valores(prueba, gl, DOS_COLAS, 1 - confianza)
+    margen = critico_ic * error_std
+    return {
+        "diferencia": diferencia, "error_std": error_std, "gl": gl, "estadistico": estadistico,
+        "valor_p": valor_p, "critico": cache_criticos.valores(prueba, gl, direccion, alpha),
+        "rechaza": valor_p <= alpha, "critico_ic": critico_ic, "margen": margen,
+        "inferior": diferencia - margen, "superior": diferencia + margen
+    }
+
+
+def pruebas_dos_muestras(n1, media1, desv_std1, n2, media2, desv_std2, diferencia_nula=0.0, alpha=0.05,
+                         direccion=DOS_COLAS, metodo=WELCH, confianza=0.95, prueba="t"):
+    """Pruebas e intervalos para μ₁ - μ₂ de muchos pares de muestras independientes a la vez.
+
+    Solo usa los resúmenes (n, media, desviación estándar) de cada muestra,
+    así que sirve igual para columnas completas, grupos o AcumuladorMedia de
+    datos en flujo. metodo "agrupada" es la t de Student con varianza común y
+    gl = n₁ + n₂ - 2; "welch" usa las varianzas por separado y los gl de
+    Welch–Satterthwaite (no enteros). Devuelve un diccionario de arreglos; los
+    pares con alguna muestra de menos de 2 datos dan NaN.
+    """
+    metodo = normalizar_metodo(metodo)
+    if metodo == PAREADA:
+        raise ValueError("La prueba pareada usa el resumen de las diferencias: use pruebas_pareadas")
+    prueba = normalizar_prueba(prueba)
+    direccion = normalizar_direccion(direccion)
+    n1 = np.asarray(n1, dtype=np.float64)
+    n2 = np.asarray(n2, dtype=np.float64)
+    validos = (n1 > 1) & (n2 > 1)
+    varianza1 = np.where(validos, np.square(np.asarray(desv_std1, dtype=np.float64)), np.nan)
+    varianza2 = np.where(validos, np.square(np.asarray(desv_std2, dtype=np.float64)), np.nan)
+    diferencia = np.asarray(media1, dtype=np.float64) - np.asarray(media2, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if metodo == AGRUPADA:
+            gl = n1 + n2 - 2
+            varianza_comun = ((n1 - 1) * varianza1 + (n2 - 1) * varianza2) / gl
+            error_std = np.sqrt(varianza_comun * (1 / n1 + 1 / n2))
+        else:
+            cuadrado1 = varianza1 / n1
+            cuadrado2 = varianza2 / n2
+            error_std = np.sqrt(cuadrado1 + cuadrado2)
+            gl = np.square(cuadrado1 + cuadrado2) / (np.square(cuadrado1) / (n1 - 1)
+                                                      + np.square(cuadrado2) / (n2 - 1))
+    gl = np.where(validos, gl, np.nan)
+    resultado = _prueba_diferencia(diferencia, error_std, gl, diferencia_nula, alpha, direccion, confianza, prueba)
+    resultado.update(n1=n1, n2=n2)
+    return resultado
+
+
+def pruebas_pareadas(n, media_diferencias, desv_std_diferencias, diferencia_nula=0.0, alpha=0.05,
+                     direccion=DOS_COLAS, confianza=0.95, prueba="t"):
+    """Pruebas t pareadas e intervalos para muchos pares a la vez, desde el resumen de las diferencias.
+
+    Cada par se resume con n, media y desviación estándar de las diferencias
+    x₁ - x₂ fila a fila; es la prueba de una muestra sobre esas diferencias.
+    Devuelve las mismas claves que pruebas_dos_muestras.
+    """
+    prueba = normalizar_prueba(prueba)
+    direccion = normalizar_direccion(direccion)
+    n = np.asarray(n, dtype=np.float64)
+    desv_std = np.where(n > 1, np.asarray(desv_std_diferencias, dtype=np.float64), np.nan)
+    error_std = desv_std / np.sqrt(n)
+    gl = np.where(n > 1, n - 1, np.nan)
+    resultado = _prueba_diferencia(np.asarray(media_diferencias, dtype=np.float64), error_std, gl,
+                                   diferencia_nula, alpha, direccion, confianza, prueba)
+    resultado.update(n1=n, n2=n)
+    return resultado
+
+
+def dos_muestras_desde_resumen(resumen1, resumen2, diferencia_nula=0.0, alpha=0.05, direccion=DOS_COLAS,
+                               metodo=WELCH, confianza=0.95, prueba="t"):
+    """ResultadoDosMuestras a partir de (n, media, desv_std) de cada muestra.
+
+    Con metodo "pareada", resumen1 es el resumen de las diferencias y resumen2 se ignora.
+    """
+    metodo = normalizar_metodo(metodo)
+    direccion = normalizar_direccion(direccion)
+    if metodo == PAREADA:
+        r = pruebas_pareadas(*resumen1, diferencia_nula, alpha, direccion, confianza, prueba)
+    else:
+        r = pruebas_dos_muestras(*resumen1, *resumen2, diferencia_nula, alpha, direccion, metodo, confianza, prueba)
+    if np.isnan(r["error_std"]):
+        raise ValueError("Se necesitan al menos 2 puntos de datos en cada muestra")
+    simbolo = {DOS_COLAS: "≠", COLA_IZQUIERDA: "<", COLA_DERECHA: ">"}[direccion]
+    gl = float(r["gl"])
+    return ResultadoDosMuestras(
+        metodo=metodo, prueba=normalizar_prueba(prueba), n1=int(r["n1"]), n2=int(r["n2"]),
+        diferencia=float(r["diferencia"]), error_std=float(r["error_std"]), diferencia_nula=diferencia_nula,
+        alpha=alpha, direccion=direccion, estadistico=float(r["estadistico"]), valor_p=float(r["valor_p"]),
+        critico=float(r["critico"]), rechaza=bool(r["rechaza"]),
+        hipotesis_alt=f"μ₁ - μ₂ {simbolo} {diferencia_nula}", confianza=confianza,
+        inferior=float(r["inferior"]), superior=float(r["superior"]), gl=None if np.isnan(gl) else gl
+    )
+
+
+WALD = "wald"
+WILSON = "wilson"
+AGRESTI_COULL = "agresti-coull"
+METODOS_PROPORCION = (WALD, WILSON, AGRESTI_COULL)
+
+
+def normalizar_metodo_proporcion(metodo):
+    """Método canónico de intervalo para una proporción ("agresti coull" y "ac" equivalen a "agresti-coull")"""
+    texto = str(metodo).strip().lower()
+    if "wald" in texto:
+        return WALD
+    if "wilson" in texto:
+        return WILSON
+    if "agresti" in texto or texto == "ac":
+        return AGRESTI_COULL
+    raise ValueError(f"Método no reconocido: {metodo} (use {', '.join(METODOS_PROPORCION)})")
+
+
+def _contar_bits(datos):
+    """Bits en 1 de un arreglo uint8 (np.bitwise_count si está disponible, si no una tabla de 256 valores)"""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(datos).sum(dtype=np.int64))
+    tabla = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1)
+    return int(tabla[datos].sum(dtype=np.int64))
+
+
+def contar_exitos(datos, n=None):
+    """(éxitos, ensayos) de una columna binaria, sin convertirla a float.
+
+    Acepta arreglos bool, enteros 0/1 o float 0/1 (los NaN cuentan como
+    faltantes). Si se indica n y datos es uint8, se toma como la salida de
+    np.packbits (orden de bits "big") con n valores: se cuentan los bits en 1
+    byte por byte, sin desempaquetarlos. Lanza ValueError si hay valores
+    distintos de 0 y 1.
+    """
+    datos = np.asarray(datos)
+    if n is not None:
+        if datos.dtype != np.uint8 or len(datos) != (n + 7) // 8:
+            raise ValueError("Los datos empaquetados deben ser uint8 con (n + 7) // 8 bytes")
+        completos, resto = divmod(n, 8)
+        exitos = _contar_bits(datos[:completos])
+        if resto:
+            # Solo los primeros 'resto' bits del último byte son datos
+            exitos += _contar_bits(datos[completos:] >> (8 - resto))
+        return exitos, n
+    if datos.dtype == bool:
+        return int(np.count_nonzero(datos)), datos.size
+    if np.issubdtype(datos.dtype, np.integer):
+        if datos.size and (datos.min() < 0 or datos.max() > 1):
+            raise ValueError("Los datos de una proporción deben ser 0 o 1")
+        return int(np.count_nonzero(datos)), datos.size
+    if np.issubdtype(datos.dtype, np.floating):
+        exitos = int(np.count_nonzero(datos == 1))
+        ensayos = datos.size - int(np.count_nonzero(np.isnan(datos)))
+        if exitos + int(np.count_nonzero(datos == 0)) != ensayos:
+            raise ValueError("Los datos de una proporción deben ser 0 o 1")
+        return exitos, ensayos
+    raise ValueError("Los datos de una proporción deben ser booleanos o numéricos (0 o 1)")
+
+
+def intervalos_proporcion(exitos, ensayos, confianza, metodo=WILSON):
+    """Intervalos de confianza para muchas proporciones a la vez a partir de conteos.
+
+    Wald es p̂ ± z·√(p̂(1-p̂)/n); se queda corto cerca de 0 y 1 y con n
+    pequeño. Wilson invierte la prueba z con el error estándar de H₀, y
+    Agresti–Coull es Wald sobre (x + z²/2) / (n + z²); ambos mantienen una
+    cobertura cercana a la nominal. Los límites se recortan a [0, 1]; los
+    casos sin ensayos dan NaN.
+    """
+    if not 0 < confianza < 1:
+        raise ValueError("El nivel de confianza debe estar entre 0 y 1")
+    metodo = normalizar_metodo_proporcion(metodo)
+    exitos = np.asarray(exitos, dtype=np.float64)
+    ensayos = np.where(np.asarray(ensayos) > 0, np.asarray(ensayos, dtype=np.float64), np.nan)
+    z = cache_criticos.valor("Z", None, DOS_COLAS, 1 - confianza)
+    proporcion = exitos / ensayos
+    if metodo == WALD:
+        centro = proporcion
+        margen = z * np.sqrt(proporcion * (1 - proporcion) / ensayos)
+    elif metodo == WILSON:
+        z2 = z * z
+        centro = (exitos + z2 / 2) / (ensayos + z2)
+        margen = z / (ensayos + z2) * np.sqrt(exitos * (ensayos - exitos) / ensayos + z2 / 4)
+    else:
+        ajustados = ensayos + z * z
+        centro = (exitos + z * z / 2) / ajustados
+        margen = z * np.sqrt(centro * (1 - centro) / ajustados)
+    return {
+        "exitos": exitos, "ensayos": ensayos, "proporcion": proporcion, "critico": z, "centro": centro,
+        "margen": margen, "inferior": np.clip(centro - margen, 0, 1), "superior": np.clip(centro + margen, 0, 1)
+    }
+
+
+def pruebas_proporcion(exitos, ensayos, valor_nulo, alpha, direccion=DOS_COLAS):
+    """Pruebas z de una proporción para muchos conteos a la vez, con el error estándar bajo H₀.
+
+    valor_nulo (p₀) puede ser un escalar o un arreglo dentro de (0, 1).
+    """
+    if not 0 < alpha < 1:
+        raise ValueError("El nivel de significancia (α) debe estar entre 0 y 1")
+    if np.any((np.asarray(valor_nulo) <= 0) | (np.asarray(valor_nulo) >= 1)):
+        raise ValueError("La proporción de la hipótesis nula (p₀) debe estar entre 0 y 1")
+    direccion = normalizar_direccion(direccion)
+    exitos = np.asarray(exitos, dtype=np.float64)
+    ensayos = np.where(np.asarray(ensayos) > 0, np.asarray(ensayos, dtype=np.float64), np.nan)
+    proporcion = exitos / ensayos
+    error_std = np.sqrt(valor_nulo * (1 - np.asarray(valor_nulo, dtype=np.float64)) / ensayos)
+    estadistico = (proporcion - valor_nulo) / error_std
+    valor_p = _valor_p("Z", None, estadistico, direccion)
+    return {
+        "exitos": exitos, "ensayos": ensayos, "proporcion": proporcion, "error_std": error_std,
+        "estadistico": estadistico, "valor_p": valor_p,
+        "critico": np.full(proporcion.shape, cache_criticos.valor("Z", None, direccion, alpha)),
+        "rechaza": valor_p <= alpha
+    }
+
+
+def pruebas_dos_proporciones(exitos1, ensayos1, exitos2, ensayos2, diferencia_nula=0.0, alpha=0.05,
+                             direccion=DOS_COLAS, confianza=0.95):
+    """Pruebas z e intervalos para p₁ - p₂ de muchos pares de conteos a la vez.
+
+    Con diferencia_nula 0 el estadístico usa la proporción agrupada, como es
+    habitual; con otra diferencia, y para el intervalo (Wald), se usan las
+    varianzas de cada muestra. Devuelve las mismas claves que
+    pruebas_dos_muestras ("error_std" es el del intervalo) y además
+    proporcion1, proporcion2, error_std_prueba (el que usa el estadístico) y
+    error_std_ic (igual a "error_std").
+    """
+    direccion = normalizar_direccion(direccion)
+    exitos1 = np.asarray(exitos1, dtype=np.float64)
+    exitos2 = np.asarray(exitos2, dtype=np.float64)
+    n1 = np.where(np.asarray(ensayos1) > 0, np.asarray(ensayos1, dtype=np.float64), np.nan)
+    n2 = np.where(np.asarray(ensayos2) > 0, np.asarray(ensayos2, dtype=np.float64), np.nan)
+    proporcion1 = exitos1 / n1
+    proporcion2 = exitos2 / n2
+    error_std = np.sqrt(proporcion1 * (1 - proporcion1) / n1 + proporcion2 * (1 - proporcion2) / n2)
+    error_std_prueba = None
+    if np.all(np.asarray(diferencia_nula) == 0):
+        agrupada = (exitos1 + exitos2) / (n1 + n2)
+        error_std_prueba = np.sqrt(agrupada * (1 - agrupada) * (1 / n1 + 1 / n2))
+    resultado = _prueba_diferencia(proporcion1 - proporcion2, error_std, None, diferencia_nula, alpha,
+                                   direccion, confianza, "Z", error_std_prueba)
+    resultado.update(n1=np.nan_to_num(n1), n2=np.nan_to_num(n2), proporcion1=proporcion1, proporcion2=proporcion2,
+                     error_std_prueba=error_std if error_std_prueba is None else error_std_prueba,
+                     error_std_ic=error_std)
+    return resultado
+
+
+def _validar_conteos(exitos, ensayos):
+    if ensayos < 1:
+        raise ValueError("Se necesita al menos un ensayo")
+    if not 0 <= exitos <= ensayos:
+        raise ValueError("Los éxitos deben estar entre 0 y el número de ensayos")
+
+
+def proporcion_desde_conteos(exitos, ensayos, valor_nulo, alpha, direccion=DOS_COLAS, confianza=0.95,
+                             metodo=WILSON):
+    """ResultadoProporcion (prueba z e intervalo) a partir de éxitos y ensayos"""
+    _validar_conteos(exitos, ensayos)
+    metodo = normalizar_metodo_proporcion(metodo)
+    direccion = normalizar_direccion(direccion)
+    intervalo = intervalos_proporcion(exitos, ensayos, confianza, metodo)
+    prueba = pruebas_proporcion(exitos, ensayos, valor_nulo, alpha, direccion)
+    simbolo = {DOS_COLAS: "≠", COLA_IZQUIERDA: "<", COLA_DERECHA: ">"}[direccion]
+    return ResultadoProporcion(
+        metodo=metodo, exitos=int(exitos), ensayos=int(ensayos), proporcion=float(prueba["proporcion"]),
+        error_std=float(prueba["error_std"]), valor_nulo=valor_nulo, alpha=alpha, direccion=direccion,
+        estadistico=float(prueba["estadistico"]), valor_p=float(prueba["valor_p"]),
+        critico=float(prueba["critico"]), rechaza=bool(prueba["rechaza"]),
+        hipotesis_alt=f"p {simbolo} {valor_nulo}", confianza=confianza, critico_ic=float(intervalo["critico"]),
+        inferior=float(intervalo["inferior"]), superior=float(intervalo["superior"])
+    )
+
+
+def dos_proporciones_desde_conteos(exitos1, ensayos1, exitos2, ensayos2, diferencia_nula=0.0, alpha=0.05,
+                                   direccion=DOS_COLAS, confianza=0.95):
+    """ResultadoDosMuestras (metodo "proporciones", prueba Z) para p₁ - p₂ a partir de los conteos"""
+    _validar_conteos(exitos1, ensayos1)
+    _validar_conteos(exitos2, ensayos2)
+    direccion = normalizar_direccion(direccion)
+    r = pruebas_dos_proporciones(exitos1, ensayos1, exitos2, ensayos2, diferencia_nula, alpha, direccion,
+                                 confianza)
+    simbolo = {DOS_COLAS: "≠", COLA_IZQUIERDA: "<", COLA_DERECHA: ">"}[direccion]
+    return ResultadoDosMuestras(
+        metodo="proporciones", prueba="Z", n1=int(ensayos1), n2=int(ensayos2),
+        diferencia=float(r["diferencia"]), error_std=float(r["error_std"]), diferencia_nula=diferencia_nula,
+        alpha=alpha, direccion=direccion, estadistico=float(r["estadistico"]), valor_p=float(r["valor_p"]),
+        critico=float(r["critico"]), rechaza=bool(r["rechaza"]),
+        hipotesis_alt=f"p₁ - p₂ {simbolo} {diferencia_nula}", confianza=confianza,
+        inferior=float(r["inferior"]), superior=float(r["superior"]),
+        error_std_prueba=float(r["error_std_prueba"])
+    )
+
+
+# Correcciones por pruebas múltiples: Bonferroni y Holm controlan la tasa de
+# error por familia (FWER); Benjamini–Hochberg, la tasa de falsos descubrimientos (FDR)
+METODOS_AJUSTE = ("bonferroni", "holm", "bh")
+
+
+def normalizar_ajuste(metodo):
+    """Nombre de la corrección en minúsculas ("benjamini-hochberg" y "fdr" equivalen a "bh")"""
+    metodo = str(metodo).strip().lower()
+    metodo = {"benjamini-hochberg": "bh", "fdr": "bh"}.get(metodo, metodo)
+    if metodo not in METODOS_AJUSTE:
+        raise ValueError(f"Corrección no reconocida: {metodo} (use {', '.join(METODOS_AJUSTE)})")
+    return metodo
+
+
+def ajustar_valores_p(valores_p, metodos=METODOS_AJUSTE):
+    """Valores p ajustados de una familia de pruebas para cada corrección de metodos.
+
+    Devuelve un diccionario metodo → arreglo, en el mismo orden que valores_p.
+    Holm y Benjamini–Hochberg comparten un solo ordenamiento de los valores p
+    (O(m log m)); los valores monótonos de cada paso se obtienen con un máximo
+    o mínimo acumulado en lugar de recorrer las pruebas. Los NaN (muestras sin
+    datos suficientes) no cuentan en m y quedan como NaN.
+    """
+    metodos = [normalizar_ajuste(metodo) for metodo in metodos]
+    valores_p = np.asarray(valores_p, dtype=np.float64)
+    validos = ~np.isnan(valores_p)
+    p = valores_p[validos]
+    m = p.size
+    ajustados = {}
+    if "bonferroni" in metodos:
+        ajustados["bonferroni"] = np.minimum(p * m, 1.0)
+    if "holm" in metodos or "bh" in metodos:
+        orden = np.argsort(p)
+        ordenados = p[orden]
+        rango = np.arange(1, m + 1, dtype=np.float64)
+        if "holm" in metodos:
+            # Paso descendente: (m - i + 1)·p(i), hecho monótono con el máximo acumulado
+            holm = np.empty(m)
+            holm[orden] = np.minimum(np.maximum.accumulate((m - rango + 1) * ordenados), 1.0)
+            ajustados["holm"] = holm
+        if "bh" in metodos:
+            # Paso ascendente: m·p(i) / i, hecho monótono con el mínimo acumulado desde el final
+            bh = np.empty(m)
+            bh[orden] = np.minimum(np.minimum.accumulate((m / rango * ordenados)[::-1])[::-1], 1.0)
+            ajustados["bh"] = bh
+    resultado = {}
+    for metodo in metodos:
+        completo = np.full(valores_p.shape, np.nan)
+        completo[validos] = ajustados[metodo]
+        resultado[metodo] = completo
+    return resultado
+
+
+def _ventanas_moviles(datos, ventana, desde, hasta):
+    """Media y M2 de las ventanas que empiezan en desde..hasta-1, con sumas acumuladas.
+
+    Cada suma de ventana es la diferencia de dos sumas acumuladas (O(1) por paso).
+    Los datos se centran en la media del tramo para no perder cifras al restar.
+    """
+    tramo = np.asarray(datos[desde:hasta + ventana - 1], dtype=np.float64)
+    referencia = tramo.mean()
+    centrados = tramo - referencia
+    suma = np.concatenate(([0.0], np.cumsum(centrados)))
+    suma_cuadrados = np.concatenate(([0.0], np.cumsum(np.square(centrados, out=centrados))))
+    s1 = suma[ventana:] - suma[:-ventana]
+    s2 = suma_cuadrados[ventana:] - suma_cuadrados[:-ventana]
+    return referencia + s1 / ventana, np.maximum(s2 - s1 * s1 / ventana, 0.0)
+
+
+def intervalos_moviles(datos, ventana, confianza, prueba="t", bloque=None):
+    """Intervalos de confianza de la media de cada ventana de `ventana` observaciones consecutivas.
+
+    La ventana i abarca datos[i:i + ventana]. Devuelve un diccionario con los
+    arreglos media, desv_std, inferior y superior (uno por ventana) y los
+    valores comunes a todas: ventana, gl, critico y el índice de la primera
+    ventana completa en la serie (inicio = ventana - 1). Los datos se recorren
+    por bloques de ventanas, así las copias temporales no dependen del largo
+    de la serie.
+    """
+    if not 0 < confianza < 1:
+        raise ValueError("El nivel de confianza debe estar entre 0 y 1")
+    ventana = int(ventana)
+    if ventana < 2:
+        raise ValueError("La ventana debe tener al menos 2 observaciones")
+    if ventana > len(datos):
+        raise ValueError(f"La ventana ({ventana}) es mayor que la serie ({len(datos)} datos)")
+    prueba = normalizar_prueba(prueba)
+    cantidad = len(datos) - ventana + 1
+    bloque = bloque or max(4 * ventana, 1 << 16)
+
+    media = np.empty(cantidad)
+    desv_std = np.empty(cantidad)
+    for desde in range(0, cantidad, bloque):
+        hasta = min(desde + bloque, cantidad)
+        media[desde:hasta], desv_std[desde:hasta] = _ventanas_moviles(datos, ventana, desde, hasta)
+    if not np.isfinite(media).all():
+        raise ValueError("La serie contiene valores no numéricos o infinitos")
+    np.sqrt(desv_std / (ventana - 1), out=desv_std)
+
+    gl = None if prueba == "Z" else ventana - 1
+    critico = valor_critico(prueba, gl, DOS_COLAS, 1 - confianza)
+    margen = desv_std * (critico / np.sqrt(ventana))
+    return {
+        "prueba": prueba, "ventana": ventana, "gl": gl, "critico": float(critico),
+        "inicio": ventana - 1, "media": media, "desv_std": desv_std,
+        "inferior": media - margen, "superior": np.add(media, margen, out=margen),
+    }
+
+
+class AcumuladorMedia:
+    """Estadísticos suficientes (n, media, M2) actualizados con el algoritmo de Welford.
+
+    Permite calcular intervalos y pruebas sin tener todos los datos en memoria:
+    los datos se agregan uno a uno o por bloques, se pueden quitar, y dos
+    acumuladores de partes distintas de la muestra se pueden combinar.
+    """
+
+    def __init__(self, n=0, media=0.0, m2=0.0):
+        self.n = n
+        self.media = media
+        self.m2 = m2
+
+    @classmethod
+    def desde_arreglo(cls, datos):
+        """Acumulador con los estadísticos de un arreglo completo"""
+        return cls().agregar_arreglo(datos)
+
+    def agregar(self, valor):
+        """Agrega una observación"""
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        return self
+
+    def agregar_arreglo(self, datos):
+        """Agrega un bloque de observaciones en una sola operación vectorizada"""
+        datos = np.asarray(datos, dtype=np.float64).ravel()
+        if datos.size == 0:
+            return self
+        media = float(np.mean(datos))
+        m2 = float(np.sum(np.square(datos - media)))
+        return self.combinar(AcumuladorMedia(datos.size, media, m2))
+
+    def quitar(self, valor):
+        """Quita una observación agregada anteriormente"""
+        if self.n <= 1:
+            self.n, self.media, self.m2 = 0, 0.0, 0.0
+            return self
+        media_anterior = self.media
+        self.n -= 1
+        self.media = (media_anterior * (self.n + 1) - valor) / self.n
+        self.m2 = max(self.m2 - (valor - media_anterior) * (valor - self.media), 0.0)
+        return self
+
+    def quitar_arreglo(self, datos):
+        """Quita un bloque de observaciones agregadas anteriormente (inverso de combinar)"""
+        parte = AcumuladorMedia.desde_arreglo(datos)
+        if parte.n == 0:
+            return self
+        if parte.n >= self.n:
+            self.n, self.media, self.m2 = 0, 0.0, 0.0
+            return self
+        n = self.n - parte.n
+        media = (self.media * self.n - parte.media * parte.n) / n
+        delta = parte.media - media
+        self.m2 = max(self.m2 - parte.m2 - delta * delta * n * parte.n / self.n, 0.0)
+        self.n, self.media = n, media
+        return self
+
+    def combinar(self, otro):
+        """Incorpora los estadísticos de otro acumulador (fórmula de Chan et al.)"""
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media, self.m2 = otro.n, otro.media, otro.m2
+            return self
+        n = self.n + otro.n
+        delta = otro.media - self.media
+        self.media += delta * otro.n / n
+        self.m2 += otro.m2 + delta * delta * self.n * otro.n / n
+        self.n = n
+        return self
+
+    @property
+    def varianza(self):
+        """Varianza muestral (ddof=1)"""
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    @property
+    def desv_std(self):
+        """Desviación estándar muestral (ddof=1)"""
+        return float(np.sqrt(self.varianza))
+
+    def resumen(self):
+        """Tamaño, media y desviación estándar, en el formato de resumen_muestra"""
+        if self.n < 2:
+            raise ValueError("Se necesitan al menos 2 puntos de datos")
+        return self.n, self.media, self.desv_std
+
+    def intervalo_confianza(self, confianza, prueba="t"):
+        """Intervalo de confianza con los estadísticos acumulados"""
+        return intervalo_desde_resumen(*self.resumen(), confianza, prueba)
+
+    def prueba_media(self, valor_nulo, alpha, direccion=DOS_COLAS, prueba="t"):
+        """Prueba de hipótesis para la media con los estadísticos acumulados"""
+        return prueba_desde_resumen(*self.resumen(), valor_nulo, alpha, direccion, prueba)
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return f"AcumuladorMedia(n={self.n}, media={self.media!r}, m2={self.m2!r})"
+
+
+class CacheResumenes:
+    """Estadísticos suficientes por hash del texto de los datos.
+
+    Al repetir un cálculo con los mismos datos y otro nivel de confianza, α,
+    dirección o μ₀ se evita convertir el texto y recorrer los datos. Las
+    entradas solo guardan la huella del texto y (n, media, M2), no los datos;
+    se descartan las menos usadas cuando se supera memoria_maxima (bytes).
+    Los arreglos (columnas cargadas) no se guardan: calcular su huella cuesta
+    más que recorrerlos. Es segura entre hilos, porque los cálculos corren en
+    tareas de fondo.
+    """
+
+    def __init__(self, memoria_maxima=1024 * 1024):
+        self.memoria_maxima = memoria_maxima
+        self.memoria = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._candado = threading.Lock()
+
+    def limpiar(self):
+        with self._candado:
+            self._entradas.clear()
+            self.memoria = 0
+            self.aciertos = self.fallos = 0
+
+    def resumen(self, datos, convertir=convertir_datos):
+        """AcumuladorMedia de los datos; el texto se convierte con convertir() solo si no está en la caché"""
+        if isinstance(datos, AcumuladorMedia):
+            return datos
+        if not isinstance(datos, str):
+            return AcumuladorMedia.desde_arreglo(datos)
+        clave = hashlib.blake2b(datos.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._candado:
+            acumulador = self._entradas.get(clave)
+            if acumulador is not None:
+                self.aciertos += 1
+                self._entradas.move_to_end(clave)
+                # Copia, para que quien lo reciba pueda modificarlo sin alterar la caché
+                return AcumuladorMedia(acumulador.n, acumulador.media, acumulador.m2)
+            self.fallos += 1
+
+        acumulador = AcumuladorMedia.desde_arreglo(convertir(datos))
+        with self._candado:
+            if clave not in self._entradas:
+                self._entradas[clave] = AcumuladorMedia(acumulador.n, acumulador.media, acumulador.m2)
+                self.memoria += _TAMANO_ENTRADA
+            while self.memoria > self.memoria_maxima and self._entradas:
+                self._entradas.popitem(last=False)
+                self.memoria -= _TAMANO_ENTRADA
+        return acumulador
+
+    def estadisticas(self):
+        """Aciertos, fallos, entradas y memoria ocupada (bytes) de la caché"""
+        return {
+            "aciertos": self.aciertos, "fallos": self.fallos, "tamano": len(self._entradas),
+            "memoria": self.memoria, "memoria_maxima": self.memoria_maxima,
+        }
+
+
+# Bytes por entrada: huella de 16 bytes, AcumuladorMedia con sus tres números y
+# el nodo del OrderedDict (aproximado)
+_TAMANO_ENTRADA = (sys.getsizeof(bytes(16)) + sys.getsizeof(AcumuladorMedia())
+                   + sys.getsizeof(AcumuladorMedia().__dict__) + 3 * sys.getsizeof(0.0) + 100)
+
+# Caché compartida por las pestañas de las interfaces
+cache_resumenes = CacheResumenes()
+
+
+_BLOQUE_COMPARACION = 4096
+
+
+def _prefijo_comun(a, b):
+    """Longitud del prefijo común de dos textos, comparando por bloques"""
+    limite = min(len(a), len(b))
+    i = 0
+    while i + _BLOQUE_COMPARACION <= limite and a[i:i + _BLOQUE_COMPARACION] == b[i:i + _BLOQUE_COMPARACION]:
+        i += _BLOQUE_COMPARACION
+    while i < limite and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def _sufijo_comun(a, b, limite):
+    """Longitud del sufijo común de dos textos, de a lo más limite caracteres"""
+    fin_a, fin_b = len(a), len(b)
+    i = 0
+    while (i + _BLOQUE_COMPARACION <= limite
+           and a[fin_a - i - _BLOQUE_COMPARACION:fin_a - i] == b[fin_b - i - _BLOQUE_COMPARACION:fin_b - i]):
+        i += _BLOQUE_COMPARACION
+    while i < limite and a[fin_a - i - 1] == b[fin_b - i - 1]:
+        i += 1
+    return i
+
+
+def region_modificada(anterior, nuevo):
+    """(inicio, fin_anterior, fin_nuevo): tramo que cambió entre dos textos de datos.
+
+    El tramo se extiende hasta separadores, de modo que anterior[inicio:fin_anterior]
+    contiene exactamente los valores quitados y nuevo[inicio:fin_nuevo] los agregados.
+    """
+    inicio = _prefijo_comun(anterior, nuevo)
+    comun = _sufijo_comun(anterior, nuevo, min(len(anterior), len(nuevo)) - inicio)
+    fin_anterior, fin_nuevo = len(anterior) - comun, len(nuevo) - comun
+    # Un valor cortado por el cambio (p. ej. "12" -> "123") se quita y se agrega completo
+    while inicio > 0 and not _es_separador(anterior[inicio - 1]):
+        inicio -= 1
+    while fin_anterior < len(anterior) and not _es_separador(anterior[fin_anterior]):
+        fin_anterior += 1
+        fin_nuevo += 1
+    return inicio, fin_anterior, fin_nuevo
+
+
+def _es_separador(caracter):
+    return caracter in ",;" or caracter.isspace()
+
+
+# Al restar se pierden cifras en proporción a cuánto baja M2; por encima de
+# esta caída los estadísticos se recalculan desde el texto
+_CAIDA_MAXIMA_M2 = 1e4
+
+
+class ResumenIncremental:
+    """Estadísticos de un campo de datos que se actualizan al editarlo.
+
+    actualizar() compara el texto nuevo con el último que se pudo convertir y
+    solo convierte los valores del tramo modificado: quita del acumulador los
+    que desaparecieron y agrega los nuevos. Si el texto cambió casi por
+    completo (p. ej. al pegar otra muestra) lo convierte entero.
+    """
+
+    def __init__(self, convertir=convertir_datos):
+        self.convertir = convertir
+        self.texto = ""
+        self.acumulador = AcumuladorMedia()
+        self._candado = threading.Lock()
+
+    def actualizar(self, texto):
+        """AcumuladorMedia del texto; si el tramo nuevo no es válido lanza ValueError y conserva el estado"""
+        with self._candado:
+            inicio, fin_anterior, fin_nuevo = region_modificada(self.texto, texto)
+            acumulador = None
+            if (fin_anterior - inicio) + (fin_nuevo - inicio) < len(texto):
+                quitados = self._valores(self.texto[inicio:fin_anterior])
+                # Quitar casi toda la muestra pierde precisión; en ese caso se convierte todo
+                if 2 * quitados.size < self.acumulador.n:
+                    acumulador = AcumuladorMedia(self.acumulador.n, self.acumulador.media, self.acumulador.m2)
+                    acumulador.quitar_arreglo(quitados)
+                    acumulador.agregar_arreglo(self._valores(texto[inicio:fin_nuevo]))
+                    # También si M2 cae varios órdenes de magnitud (p. ej. al borrar un valor atípico)
+                    if acumulador.m2 * _CAIDA_MAXIMA_M2 < self.acumulador.m2:
+                        acumulador = None
+            if acumulador is None:
+                acumulador = AcumuladorMedia.desde_arreglo(self.convertir(texto))
+            self.texto, self.acumulador = texto, acumulador
+            return AcumuladorMedia(acumulador.n, acumulador.media, acumulador.m2)
+
+    def _valores(self, tramo):
+        if not tramo.translate(_SEPARADORES).strip():
+            return np.empty(0)
+        return self.convertir(tramo)
+
+
+# Observaciones antes de evaluar la prueba secuencial: σ se estima con los datos
+# y con muy pocos la estimación hace que la prueba rechace de más
+N_MINIMO_SECUENCIAL = 10
+
+
+def _log_razon_mezcla(z, n, escala, direccion):
+    """Logaritmo de la razón de verosimilitudes mezclada del mSPRT normal.
+
+    z = √n (x̄ - μ₀) / s. La alternativa δ = μ - μ₀ tiene previa N(0, (escala·σ)²)
+    en dos colas, o su mitad positiva (negativa) en cola derecha (izquierda).
+    """
+    from scipy import special
+    r = n * escala * escala
+    log_razon = z * z * r / (2 * (r + 1)) - 0.5 * np.log1p(r)
+    if direccion == DOS_COLAS:
+        return log_razon
+    signo = 1 if direccion == COLA_DERECHA else -1
+    return log_razon + np.log(2) + special.log_ndtr(signo * z * np.sqrt(r / (r + 1)))
+
+
+class PruebaSecuencial:
+    """Prueba secuencial siempre válida para la media (mSPRT con mezcla normal).
+
+    Recibe las observaciones una a una o por bloques y en cada una evalúa la
+    razón de verosimilitudes mezclada Λₙ; la hipótesis nula se rechaza la
+    primera vez que Λₙ ≥ 1/α y se puede detener el muestreo en ese momento
+    sin inflar el error tipo I. El estado es O(1): los estadísticos
+    suficientes (AcumuladorMedia), el menor valor p y el momento de parada.
+    σ se estima con los datos (por eso no se evalúa antes de n_minimo
+    observaciones); escala fija la previa del efecto en unidades de σ.
+    """
+
+    def __init__(self, valor_nulo, alpha, direccion=DOS_COLAS, escala=1.0, n_minimo=N_MINIMO_SECUENCIAL):
+        if not 0 < alpha < 1:
+            raise ValueError("El nivel de significancia (α) debe estar entre 0 y 1")
+        if escala <= 0:
+            raise ValueError("La escala de la previa debe ser mayor que 0")
+        self.valor_nulo = valor_nulo
+        self.alpha = alpha
+        self.direccion = normalizar_direccion(direccion)
+        self.escala = escala
+        self.n_minimo = max(int(n_minimo), 2)
+        self.acumulador = AcumuladorMedia()
+        self.log_razon = 0.0
+        self.valor_p = 1.0
+        self.parada = None
+        self.media_parada = None
+
+    @property
+    def umbral(self):
+        return float(np.log(1 / self.alpha))
+
+    def agregar(self, valor):
+        return self.agregar_arreglo([valor])
+
+    def agregar_arreglo(self, datos):
+        """Agrega observaciones en orden y evalúa la prueba tras cada una (vectorizado por bloque)"""
+        datos = np.asarray(datos, dtype=np.float64).ravel()
+        if datos.size == 0:
+            return self
+        base = self.acumulador
+        referencia = base.media if base.n else datos[0]
+        centrados = datos - referencia
+        # Estadísticos de cada prefijo del bloque unidos a los anteriores
+        n = base.n + np.arange(1, datos.size + 1)
+        suma = base.n * (base.media - referencia) + np.cumsum(centrados)
+        media = referencia + suma / n
+        m2 = base.m2 + base.n * (base.media - referencia) ** 2 + np.cumsum(centrados * centrados) - suma * suma / n
+        evaluables = n >= self.n_minimo
+        if evaluables.any():
+            n_ev, media_ev = n[evaluables], media[evaluables]
+            desv_std = np.sqrt(np.maximum(m2[evaluables], 0.0) / (n_ev - 1))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z = np.sqrt(n_ev) * (media_ev - self.valor_nulo) / desv_std
+            # Sin variabilidad no hay evidencia que evaluar
+            z = np.where(desv_std > 0, z, 0.0)
+            log_razon = _log_razon_mezcla(z, n_ev, self.escala, self.direccion)
+            self.log_razon = float(log_razon[-1])
+            self.valor_p = min(self.valor_p, float(np.exp(-log_razon.max())))
+            if self.parada is None:
+                cruces = np.flatnonzero(log_razon >= self.umbral)
+                if cruces.size:
+                    self.parada = int(n_ev[cruces[0]])
+                    self.media_parada = float(media_ev[cruces[0]])
+        self.acumulador = AcumuladorMedia(int(n[-1]), float(media[-1]), max(float(m2[-1]), 0.0))
+        return self
+
+    def limites(self):
+        """Medias muestrales a partir de las cuales se rechazaría con el n y la s actuales"""
+        n, desv_std = self.acumulador.n, self.acumulador.desv_std
+        if n < self.n_minimo or not desv_std > 0:
+            return None, None
+        r = n * self.escala * self.escala
+        if self.direccion == DOS_COLAS:
+            z = np.sqrt(2 * (r + 1) / r * (self.umbral + 0.5 * np.log1p(r)))
+        else:
+            # Λ crece con z en la dirección de la alternativa: búsqueda por bisección
+            signo = 1 if self.direccion == COLA_DERECHA else -1
+            bajo, alto = 0.0, 1.0
+            while _log_razon_mezcla(signo * alto, n, self.escala, self.direccion) < self.umbral:
+                bajo, alto = alto, 2 * alto
+            for _ in range(60):
+                medio = (bajo + alto) / 2
+                if _log_razon_mezcla(signo * medio, n, self.escala, self.direccion) < self.umbral:
+                    bajo = medio
+                else:
+                    alto = medio
+            z = alto
+        margen = float(z * desv_std / np.sqrt(n))
+        if self.direccion == DOS_COLAS:
+            return self.valor_nulo - margen, self.valor_nulo + margen
+        if self.direccion == COLA_IZQUIERDA:
+            return self.valor_nulo - margen, None
+        return None, self.valor_nulo + margen
+
+    def resultado(self):
+        n = self.acumulador.n
+        inferior, superior = self.limites()
+        if self.direccion == DOS_COLAS:
+            hipotesis_alt = f"μ ≠ {self.valor_nulo}"
+        elif self.direccion == COLA_IZQUIERDA:
+            hipotesis_alt = f"μ < {self.valor_nulo}"
+        else:
+            hipotesis_alt = f"μ > {self.valor_nulo}"
+        return ResultadoSecuencial(
+            n=n, media=self.acumulador.media, desv_std=self.acumulador.desv_std if n > 1 else float("nan"),
+            valor_nulo=self.valor_nulo, alpha=self.alpha, direccion=self.direccion,
+            log_razon=self.log_razon, umbral=self.umbral, valor_p=self.valor_p,
+            limite_inferior=inferior, limite_superior=superior, rechaza=self.parada is not None,
+            parada=self.parada, hipotesis_alt=hipotesis_alt
+        )
+
+
+def intervalo_confianza(datos, confianza, prueba="t"):
+    """Intervalo de confianza Z o t para la media de los datos"""
+    n, media, desv_std = resumen_muestra(datos)
+    return intervalo_desde_resumen(n, media, desv_std, confianza, prueba)
+
+
+def prueba_media(datos, valor_nulo, alpha, direccion=DOS_COLAS, prueba="t"):
+    """Prueba de hipótesis Z o t para la media de los datos"""
+    n, media, desv_std = resumen_muestra(datos)
+    return prueba_desde_resumen(n, media, desv_std, valor_nulo, alpha, direccion, prueba)
+
+
+def comparar_medias(datos1, datos2, diferencia_nula=0.0, alpha=0.05, direccion=DOS_COLAS, metodo=WELCH,
+                    confianza=0.95, prueba="t"):
+    """Prueba e intervalo para la diferencia de medias de dos muestras (Welch, agrupada o pareada)"""
+    if normalizar_metodo(metodo) == PAREADA:
+        datos1 = np.asarray(datos1, dtype=np.float64)
+        datos2 = np.asarray(datos2, dtype=np.float64)
+        if datos1.shape != datos2.shape:
+            raise ValueError("La prueba pareada necesita el mismo número de datos en ambas muestras")
+        return dos_muestras_desde_resumen(resumen_muestra(datos1 - datos2), None, diferencia_nula, alpha,
+                                          direccion, metodo, confianza, prueba)
+    return dos_muestras_desde_resumen(resumen_muestra(datos1), resumen_muestra(datos2), diferencia_nula,
+                                      alpha, direccion, metodo, confianza, prueba)
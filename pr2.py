@@ -1,118 +1,42 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
-import numpy as np
-import pandas as pd
-from scipy import stats
-import os
+from motor_estadistico import ResumenIncremental, cache_resumenes, convertir_datos, intervalo_confianza, prueba_media
+from carga_datos import ArchivoDatos, vista_previa
+from tareas import BarraTareas, EjecutorTareas, VigilanteEdicion
 
 # =============================================================================
 # FUNCIONES ESTADÍSTICAS MODULARES (NUEVAS)
 # =============================================================================
 
-def validar_y_convertir_datos(datos_str):
-    """Valida datos de entrada y los convierte a numpy array."""
+def convertir_texto(datos):
     try:
-        if not datos_str.strip():
-            raise ValueError("No se ingresaron datos")
-        
-        datos_str = datos_str.replace('\n', ',').replace(';', ',').strip()
-        items_datos = [item.strip() for item in datos_str.split(',') if item.strip()]
-        datos = [float(item) for item in items_datos if item]
-        
-        if not datos:
-            raise ValueError("No hay valores numéricos válidos")
-            
-        return np.array(datos)
+        return convertir_datos(datos)
     except ValueError as e:
-        messagebox.showerror("Error", f"Datos inválidos: {str(e)}")
-        return None
+        raise ValueError(f"Datos inválidos: {str(e)}")
+
+def validar_y_convertir_datos(datos):
+    """Valida datos de entrada y devuelve sus estadísticos suficientes (n, media, M2).
+    
+    El texto pasa por la caché compartida por ambas pestañas, así que repetir el
+    cálculo con otros parámetros no vuelve a convertirlo. Se llama desde el hilo
+    de la tarea, por eso lanza ValueError en lugar de mostrar el error."""
+    return cache_resumenes.resumen(datos, convertir_texto)
 
 def calcular_intervalo_z(datos, confianza):
     """Calcula intervalo de confianza Z."""
-    n = len(datos)
-    media = np.mean(datos)
-    desv_std = np.std(datos, ddof=1)
-    error_std = desv_std / np.sqrt(n)
-    z_critico = stats.norm.ppf((1 + confianza) / 2)
-    margen = z_critico * error_std
-    return {
-        "inferior": media - margen,
-        "superior": media + margen,
-        "estadisticas": {
-            "n": n, "media": media, "desv_std": desv_std, "error_std": error_std,
-            "critico": z_critico, "margen": margen, "prueba": "Z"
-        }
-    }
+    return intervalo_confianza(datos, confianza, "Z").como_dict()
 
 def calcular_intervalo_t(datos, confianza):
     """Calcula intervalo de confianza t."""
-    n = len(datos)
-    media = np.mean(datos)
-    desv_std = np.std(datos, ddof=1)
-    error_std = desv_std / np.sqrt(n)
-    t_critico = stats.t.ppf((1 + confianza) / 2, df=n-1)
-    margen = t_critico * error_std
-    return {
-        "inferior": media - margen,
-        "superior": media + margen,
-        "estadisticas": {
-            "n": n, "media": media, "desv_std": desv_std, "error_std": error_std,
-            "critico": t_critico, "margen": margen, "gl": n-1, "prueba": "t"
-        }
-    }
+    return intervalo_confianza(datos, confianza, "t").como_dict()
 
 def realizar_prueba_z(datos, valor_nulo, alpha, direccion):
     """Realiza prueba Z de hipótesis."""
-    n = len(datos)
-    media = np.mean(datos)
-    desv_std = np.std(datos, ddof=1)
-    error_std = desv_std / np.sqrt(n)
-    estadistico = (media - valor_nulo) / error_std
-    
-    if "dos colas" in direccion:
-        valor_p = 2 * (1 - stats.norm.cdf(abs(estadistico)))
-        hipotesis_alt = f"μ ≠ {valor_nulo}"
-    elif "cola izquierda" in direccion:
-        valor_p = stats.norm.cdf(estadistico)
-        hipotesis_alt = f"μ < {valor_nulo}"
-    else:
-        valor_p = 1 - stats.norm.cdf(estadistico)
-        hipotesis_alt = f"μ > {valor_nulo}"
-    
-    return {
-        "estadistico": estadistico, "valor_p": valor_p,
-        "estadisticas": {
-            "n": n, "media": media, "desv_std": desv_std, "error_std": error_std,
-            "hipotesis_alt": hipotesis_alt, "prueba": "Z"
-        }
-    }
+    return prueba_media(datos, valor_nulo, alpha, direccion, "Z").como_dict()
 
 def realizar_prueba_t(datos, valor_nulo, alpha, direccion):
     """Realiza prueba t de hipótesis."""
-    n = len(datos)
-    gl = n - 1
-    media = np.mean(datos)
-    desv_std = np.std(datos, ddof=1)
-    error_std = desv_std / np.sqrt(n)
-    estadistico = (media - valor_nulo) / error_std
-    
-    if "dos colas" in direccion:
-        valor_p = 2 * (1 - stats.t.cdf(abs(estadistico), df=gl))
-        hipotesis_alt = f"μ ≠ {valor_nulo}"
-    elif "cola izquierda" in direccion:
-        valor_p = stats.t.cdf(estadistico, df=gl)
-        hipotesis_alt = f"μ < {valor_nulo}"
-    else:
-        valor_p = 1 - stats.t.cdf(estadistico, df=gl)
-        hipotesis_alt = f"μ > {valor_nulo}"
-    
-    return {
-        "estadistico": estadistico, "valor_p": valor_p,
-        "estadisticas": {
-            "n": n, "media": media, "desv_std": desv_std, "error_std": error_std,
-            "hipotesis_alt": hipotesis_alt, "gl": gl, "prueba": "t"
-        }
-    }
+    return prueba_media(datos, valor_nulo, alpha, direccion, "t").como_dict()
 
 # =============================================================================
 # CLASE PRINCIPAL (GUI - CÓDIGO ORIGINAL COMPLETO)
@@ -136,6 +60,11 @@ class AplicacionEstadistica:
             "texto_negro": "#000000"
         }
         
+        # Columnas cargadas desde archivo, por campo de datos: (vista previa, arreglo)
+        self.datos_cargados = {}
+        # Estadísticos del último texto de cada campo en modo en vivo (se actualizan por diferencias)
+        self.resumenes_en_vivo = {}
+        
         self.configurar_estilos()
         self.crear_interfaz()
         
@@ -180,6 +109,11 @@ class AplicacionEstadistica:
         self.contenido = ttk.Frame(self.contenedor_principal, style="Panel.TFrame")
         self.contenido.pack(side="right", fill="both", expand=True, padx=10, pady=10)
         
+        # Las cargas y cálculos corren en segundo plano; la barra muestra su avance
+        self.barra_tareas = BarraTareas(self.contenido, bg=self.colores["claro"])
+        self.barra_tareas.pack(side="bottom", fill="x")
+        self.tareas = EjecutorTareas(self.raiz, self.barra_tareas)
+        
         self.crear_pestanas()
         
     def crear_barra_lateral(self):
@@ -294,6 +228,10 @@ class AplicacionEstadistica:
         self.combo_tipo_prueba_ic.current(1)
         self.combo_tipo_prueba_ic.pack(anchor="w", pady=(0, 10))
         
+        self.crear_calculo_en_vivo(panel_izquierdo, self.entrada_datos_ic,
+                                   [self.entrada_datos_ic, self.entrada_confianza, self.combo_tipo_prueba_ic],
+                                   lambda: self.calcular_intervalo_confianza(en_vivo=True))
+        
         boton_calcular = ttk.Button(panel_izquierdo, text="Calcular Intervalo", style="Modern.TButton",
                              command=self.calcular_intervalo_confianza)
         boton_calcular.pack(pady=20)
@@ -364,6 +302,11 @@ class AplicacionEstadistica:
         self.combo_alpha.current(1)
         self.combo_alpha.pack(anchor="w", pady=(0, 10))
         
+        self.crear_calculo_en_vivo(panel_izquierdo, self.entrada_datos_prueba,
+                                   [self.entrada_datos_prueba, self.entrada_nulo, self.combo_tipo_prueba,
+                                    self.combo_direccion, self.combo_alpha],
+                                   lambda: self.calcular_prueba_media(en_vivo=True))
+        
         boton_calcular = ttk.Button(panel_izquierdo, text="Realizar Prueba", style="Modern.TButton",
                              command=self.calcular_prueba_media)
         boton_calcular.pack(pady=10)
@@ -381,25 +324,61 @@ class AplicacionEstadistica:
                                      command=lambda: self.guardar_resultados(fuente=self.resultado_prueba))
         boton_guardar.pack(side="right")
         
+    def crear_calculo_en_vivo(self, padre, entrada_datos, widgets, recalcular):
+        """Casilla "Cálculo en vivo": recalcula cuando se dejan de editar los campos de la pestaña."""
+        self.resumenes_en_vivo[entrada_datos] = ResumenIncremental(convertir_texto)
+        vigilantes = [VigilanteEdicion(widget, recalcular) for widget in widgets]
+        en_vivo = tk.BooleanVar(padre, False)
+        
+        def alternar():
+            for vigilante in vigilantes:
+                vigilante.activar(en_vivo.get())
+            if en_vivo.get():
+                recalcular()
+        
+        ttk.Checkbutton(padre, text="Cálculo en vivo", variable=en_vivo, command=alternar).pack(anchor="w", pady=(0, 5))
+        
+    def resumir_datos(self, datos, widget, en_vivo):
+        """Estadísticos de los datos; en vivo, solo se convierten los valores agregados o quitados."""
+        if en_vivo and isinstance(datos, str):
+            return self.resumenes_en_vivo[widget].actualizar(datos)
+        return validar_y_convertir_datos(datos)
+        
     def mostrar_pestana(self, indice_pestana):
         self.cuaderno.select(indice_pestana)
         
-    def calcular_intervalo_confianza(self):
-        """Usa funciones modulares para cálculos."""
+    def obtener_datos(self, widget):
+        """Usa la columna cargada si el campo no fue editado; si no, devuelve el texto para convertirlo."""
+        datos_str = widget.get('1.0', tk.END).strip()
+        vista, datos = self.datos_cargados.get(widget, (None, None))
+        if datos_str == vista:
+            return datos
+        return datos_str
+        
+    def mostrar_error(self, prefijo):
+        """Callback de error para las tareas en segundo plano."""
+        return lambda e: messagebox.showerror("Error", f"{prefijo}: {str(e)}")
+        
+    def calcular_intervalo_confianza(self, en_vivo=False):
+        """Usa funciones modulares para cálculos, en segundo plano. En vivo no muestra errores."""
         try:
-            datos_str = self.entrada_datos_ic.get("1.0", tk.END).strip()
-            datos = validar_y_convertir_datos(datos_str)
-            if datos is None:
-                return
-
+            datos = self.obtener_datos(self.entrada_datos_ic)
             confianza = float(self.entrada_confianza.get()) / 100
             tipo_prueba = self.combo_tipo_prueba_ic.get()
+        except Exception as e:
+            if not en_vivo:
+                messagebox.showerror("Error", f"Error en cálculo: {str(e)}")
+            return
 
-            if "Z" in tipo_prueba:
-                resultado = calcular_intervalo_z(datos, confianza)
-            else:
-                resultado = calcular_intervalo_t(datos, confianza)
-
+        calcular = calcular_intervalo_z if "Z" in tipo_prueba else calcular_intervalo_t
+        # Un nuevo clic (o edición en vivo) reemplaza al cálculo anterior si aún no termina
+        self.tareas.enviar("intervalo",
+                           lambda tarea: calcular(self.resumir_datos(datos, self.entrada_datos_ic, en_vivo), confianza),
+                           lambda resultado: self.mostrar_intervalo_confianza(resultado, confianza),
+                           None if en_vivo else self.mostrar_error("Error en cálculo"), mensaje="Calculando intervalo...")
+            
+    def mostrar_intervalo_confianza(self, resultado, confianza):
+        try:
             estadisticas = resultado["estadisticas"]
             
             salida = f"""RESULTADOS DEL INTERVALO DE CONFIANZA (PRUEBA {estadisticas['prueba']})\n
@@ -431,24 +410,29 @@ Con un {confianza*100:.1f}% de confianza, la media poblacional está entre {resu
         except Exception as e:
             messagebox.showerror("Error", f"Error en cálculo: {str(e)}")
             
-    def calcular_prueba_media(self):
-        """Usa funciones modulares para pruebas de hipótesis."""
+    def calcular_prueba_media(self, en_vivo=False):
+        """Usa funciones modulares para pruebas de hipótesis, en segundo plano. En vivo no muestra errores."""
         try:
-            datos_str = self.entrada_datos_prueba.get('1.0', tk.END).strip()
-            datos = validar_y_convertir_datos(datos_str)
-            if datos is None:
-                return
-
+            datos = self.obtener_datos(self.entrada_datos_prueba)
             valor_nulo = float(self.entrada_nulo.get())
             alpha = float(self.combo_alpha.get())
             direccion = self.combo_direccion.get()
             tipo_prueba = self.combo_tipo_prueba.get()
+        except Exception as e:
+            if not en_vivo:
+                messagebox.showerror("Error", f"Error en cálculo: {str(e)}")
+            return
 
-            if "Z" in tipo_prueba:
-                resultado = realizar_prueba_z(datos, valor_nulo, alpha, direccion)
-            else:
-                resultado = realizar_prueba_t(datos, valor_nulo, alpha, direccion)
+        realizar = realizar_prueba_z if "Z" in tipo_prueba else realizar_prueba_t
+        # Un nuevo clic (o edición en vivo) reemplaza a la prueba anterior si aún no termina
+        self.tareas.enviar("prueba",
+                           lambda tarea: realizar(self.resumir_datos(datos, self.entrada_datos_prueba, en_vivo),
+                                                  valor_nulo, alpha, direccion),
+                           lambda resultado: self.mostrar_prueba_media(resultado, valor_nulo, alpha),
+                           None if en_vivo else self.mostrar_error("Error en cálculo"), mensaje="Realizando prueba...")
 
+    def mostrar_prueba_media(self, resultado, valor_nulo, alpha):
+        try:
             estadisticas = resultado["estadisticas"]
             
             if resultado["valor_p"] <= alpha:
@@ -496,6 +480,9 @@ Decisión estadística:
                 ("Archivos CSV", "*.csv"),
                 ("Archivos Excel", "*.xlsx"),
                 ("Archivos Parquet", "*.parquet"),
+                ("Arreglos NumPy", "*.npy"),
+                ("Binarios float32/float64", "*.f32 *.f64"),
+                ("Archivos Arrow/Feather", "*.arrow *.feather"),
                 ("Todos los archivos", "*.*")
             ]
         )
@@ -503,33 +490,30 @@ Decisión estadística:
         if not ruta_archivo:
             return
             
-        try:
-            extension = os.path.splitext(ruta_archivo)[1].lower()
+        def leer(tarea):
+            archivo = ArchivoDatos(ruta_archivo)
+            if not destino or not archivo.columnas:
+                return archivo, None
+            # La lectura por bloques informa su avance y se puede cancelar entre bloques
+            return archivo, archivo.cargar_columna(archivo.columnas[0], tarea.progreso)
             
-            if extension == '.csv':
-                self.datos = pd.read_csv(ruta_archivo)
-            elif extension == '.xlsx':
-                self.datos = pd.read_excel(ruta_archivo)
-            elif extension == '.parquet':
-                self.datos = pd.read_parquet(ruta_archivo)
-            else:
-                messagebox.showerror("Error", "Formato de archivo no compatible")
-                return
-                
-            if destino:
-                destino.delete('1.0', tk.END)
-                columnas_numericas = self.datos.select_dtypes(include=[np.number]).columns
-                if len(columnas_numericas) > 0:
-                    datos_numericos = self.datos[columnas_numericas[0]].dropna().tolist()
-                    destino.insert(tk.END, ', '.join(map(str, datos_numericos)))
-                else:
-                    messagebox.showwarning("Advertencia", 
-                                          "No se encontraron columnas numéricas en el archivo")
-                    
-            messagebox.showinfo("Éxito", f"Datos cargados correctamente: {len(self.datos)} registros")
+        self.tareas.enviar("carga", leer, lambda resultado: self.mostrar_datos_cargados(destino, *resultado),
+                           self.mostrar_error("Error al cargar el archivo"), mensaje="Cargando archivo...")
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar el archivo: {str(e)}")
+    def mostrar_datos_cargados(self, destino, archivo, datos_numericos):
+        self.datos = archivo
+            
+        if destino:
+            destino.delete('1.0', tk.END)
+            columnas = self.datos.columnas
+            if len(columnas) > 0:
+                vista = vista_previa(datos_numericos, columnas[0])
+                destino.insert(tk.END, vista)
+                self.datos_cargados[destino] = (vista, datos_numericos)
+                messagebox.showinfo("Éxito", f"Datos cargados correctamente: {len(datos_numericos)} registros")
+            else:
+                messagebox.showwarning("Advertencia", 
+                                      "No se encontraron columnas numéricas en el archivo")
 
     def guardar_resultados(self, fuente=None):
         if fuente:
@@ -0,0 +1,350 @@
+"""Servicio HTTP local (JSON) con los intervalos de confianza y pruebas de media.
+
+Expone los mismos cálculos que las interfaces para que otras herramientas
+los usen sin lanzar procesos. Solo usa la biblioteca estándar (asyncio) y
+escucha por defecto en 127.0.0.1.
+
+Las solicitudes que llegan casi al mismo tiempo se juntan en lotes: las que
+el bucle de eventos recibe en la misma vuelta (o dentro de --ventana-ms,
+si se indica una espera) se agrupan por parámetros
+(prueba y confianza, o prueba, α y dirección) y cada grupo se resuelve con
+una sola llamada a intervalos_vectorizados o pruebas_vectorizadas.
+
+Rutas:
+    POST /intervalo     {"datos": [...]} o {"n", "media", "desv_std"}; "confianza", "prueba"
+    POST /prueba        igual que /intervalo, con "mu0", "alpha" y "direccion"
+    GET  /estadisticas  percentiles de latencia por ruta y tamaño de los lotes
+
+"prueba" acepta "Z" o "t" y "direccion" acepta "dos colas", "cola izquierda"
+o "cola derecha" (también con guiones, p. ej. "dos-colas"); cualquier otro
+valor se rechaza con 400 y un mensaje de error, sin suponer uno por defecto.
+
+El cuerpo puede ser un objeto o una lista de objetos; la respuesta tiene la
+misma forma. Los resultados usan el formato de como_dict() de
+ResultadoIntervalo y ResultadoPrueba.
+
+Uso: python servicio_http.py [--host 127.0.0.1] [--puerto 8765] [--ventana-ms 0]
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+from motor_estadistico import (COLA_IZQUIERDA, DOS_COLAS, cache_resumenes, intervalos_vectorizados,
+                               normalizar_direccion, normalizar_prueba, pruebas_vectorizadas)
+
+# Espera antes de resolver un lote; con 0 se resuelve al final de la vuelta
+# actual del bucle de eventos, que ya junta las solicitudes concurrentes
+VENTANA_LOTE = 0.0
+MAXIMO_POR_LOTE = 4096
+# Latencias que se conservan por ruta para calcular los percentiles
+MUESTRAS_LATENCIA = 10_000
+MAXIMO_CUERPO = 64 * 1024 * 1024
+
+_ESTADOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large"}
+
+
+class ErrorHTTP(Exception):
+    """Error que se responde al cliente con el código indicado"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _numero(valor):
+    """float de JSON; NaN e infinito se devuelven como null"""
+    valor = float(valor)
+    return valor if math.isfinite(valor) else None
+
+
+def _resumen_solicitud(solicitud):
+    """(n, media, desv_std) de los datos de la solicitud o de su resumen"""
+    if "datos" in solicitud:
+        # El texto repetido (p. ej. otra confianza para los mismos datos) sale de la caché de resúmenes
+        datos = solicitud["datos"]
+        return cache_resumenes.resumen(datos if isinstance(datos, str) else np.asarray(datos, dtype=np.float64)).resumen()
+    try:
+        n, media, desv_std = int(solicitud["n"]), float(solicitud["media"]), float(solicitud["desv_std"])
+    except KeyError as e:
+        raise ValueError(f"Falta el campo {e} (o 'datos')") from None
+    if n < 2:
+        raise ValueError("Se necesitan al menos 2 puntos de datos")
+    if not desv_std >= 0:
+        raise ValueError("La desviación estándar debe ser mayor o igual a 0")
+    return n, media, desv_std
+
+
+def _confianza(solicitud):
+    confianza = float(solicitud.get("confianza", 0.95))
+    return confianza / 100 if confianza >= 1 else confianza
+
+
+def _hipotesis_alt(direccion, valor_nulo):
+    if direccion == DOS_COLAS:
+        return f"μ ≠ {valor_nulo}"
+    if direccion == COLA_IZQUIERDA:
+        return f"μ < {valor_nulo}"
+    return f"μ > {valor_nulo}"
+
+
+class AgrupadorSolicitudes:
+    """Junta las solicitudes concurrentes y las resuelve por lotes vectorizados.
+
+    Cada solicitud espera un futuro; los lotes se resuelven cuando pasa la
+    ventana de espera o cuando un grupo llega a maximo_por_lote.
+    """
+
+    def __init__(self, ventana=VENTANA_LOTE, maximo_por_lote=MAXIMO_POR_LOTE):
+        self.ventana = ventana
+        self.maximo_por_lote = maximo_por_lote
+        self.lotes = 0
+        self.solicitudes = 0
+        self.lote_maximo = 0
+        self._pendientes = defaultdict(list)
+        self._programado = None
+
+    def intervalo(self, solicitud):
+        """Futuro con el intervalo de confianza de la solicitud"""
+        n, media, desv_std = _resumen_solicitud(solicitud)
+        confianza = _confianza(solicitud)
+        if not 0 < confianza < 1:
+            raise ValueError("El nivel de confianza debe estar entre 0 y 100")
+        clave = ("intervalo", normalizar_prueba(solicitud.get("prueba", "t")), confianza)
+        return self._agregar(clave, (n, media, desv_std, 0.0))
+
+    def prueba(self, solicitud):
+        """Futuro con la prueba de hipótesis de la solicitud"""
+        n, media, desv_std = _resumen_solicitud(solicitud)
+        alpha = float(solicitud.get("alpha", 0.05))
+        if not 0 < alpha < 1:
+            raise ValueError("El nivel de significancia (α) debe estar entre 0 y 1")
+        direccion = normalizar_direccion(solicitud.get("direccion", DOS_COLAS))
+        clave = ("prueba", normalizar_prueba(solicitud.get("prueba", "t")), alpha, direccion)
+        return self._agregar(clave, (n, media, desv_std, float(solicitud.get("mu0", 0.0))))
+
+    def estadisticas(self):
+        return {
+            "lotes": self.lotes, "solicitudes": self.solicitudes, "lote_maximo": self.lote_maximo,
+            "lote_promedio": self.solicitudes / self.lotes if self.lotes else 0.0,
+        }
+
+    def _agregar(self, clave, valores):
+        futuro = asyncio.get_running_loop().create_future()
+        grupo = self._pendientes[clave]
+        grupo.append((valores, futuro))
+        if len(grupo) >= self.maximo_por_lote:
+            self._resolver_grupo(clave, self._pendientes.pop(clave))
+        elif self._programado is None:
+            self._programado = asyncio.get_running_loop().call_later(self.ventana, self._resolver)
+        return futuro
+
+    def _resolver(self):
+        self._programado = None
+        pendientes, self._pendientes = self._pendientes, defaultdict(list)
+        for clave, grupo in pendientes.items():
+            self._resolver_grupo(clave, grupo)
+
+    def _resolver_grupo(self, clave, grupo):
+        n, media, desv_std, valor_nulo = (np.array(columna) for columna in zip(*(v for v, _ in grupo)))
+        try:
+            if clave[0] == "intervalo":
+                resultados = self._intervalos(clave, n, media, desv_std)
+            else:
+                resultados = self._pruebas(clave, n, media, desv_std, valor_nulo)
+        except Exception as e:
+            resultados = [e] * len(grupo)
+        for (_, futuro), resultado in zip(grupo, resultados):
+            if futuro.done():
+                continue
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+        self.lotes += 1
+        self.solicitudes += len(grupo)
+        self.lote_maximo = max(self.lote_maximo, len(grupo))
+
+    @staticmethod
+    def _intervalos(clave, n, media, desv_std):
+        _, prueba, confianza = clave
+        # Listas de Python: indexar arreglos de numpy elemento por elemento es más lento
+        r = {clave: valores.tolist() for clave, valores in
+             intervalos_vectorizados(n, media, desv_std, confianza, prueba).items()}
+        resultados = []
+        for i in range(len(n)):
+            estadisticas = {
+                "n": int(r["n"][i]), "media": _numero(r["media"][i]), "desv_std": _numero(r["desv_std"][i]),
+                "error_std": _numero(r["error_std"][i]), "critico": _numero(r["critico"][i]),
+                "margen": _numero(r["margen"][i]), "prueba": prueba
+            }
+            if prueba == "t":
+                estadisticas["gl"] = int(r["gl"][i])
+            resultados.append({"inferior": _numero(r["inferior"][i]), "superior": _numero(r["superior"][i]),
+                               "estadisticas": estadisticas})
+        return resultados
+
+    @staticmethod
+    def _pruebas(clave, n, media, desv_std, valor_nulo):
+        _, prueba, alpha, direccion = clave
+        r = {clave: valores.tolist() for clave, valores in
+             pruebas_vectorizadas(n, media, desv_std, valor_nulo, alpha, direccion, prueba).items()}
+        r_nulo = valor_nulo.tolist()
+        resultados = []
+        for i in range(len(n)):
+            estadisticas = {
+                "n": int(r["n"][i]), "media": _numero(r["media"][i]), "desv_std": _numero(r["desv_std"][i]),
+                "error_std": _numero(r["error_std"][i]),
+                "hipotesis_alt": _hipotesis_alt(direccion, r_nulo[i]), "prueba": prueba
+            }
+            if prueba == "t":
+                estadisticas["gl"] = int(r["gl"][i])
+            resultados.append({
+                "estadistico": _numero(r["estadistico"][i]), "valor_p": _numero(r["valor_p"][i]),
+                "critico": _numero(r["critico"][i]), "rechaza": bool(r["rechaza"][i]),
+                "estadisticas": estadisticas
+            })
+        return resultados
+
+
+async def _resultado_o_error(calcular, solicitud):
+    """En las listas, los errores de cada elemento se devuelven en su lugar como {"error": ...}"""
+    try:
+        return await calcular(solicitud)
+    except (ValueError, TypeError) as e:
+        return {"error": str(e)}
+
+
+class RegistroLatencias:
+    """Últimas latencias por ruta, para informar percentiles"""
+
+    def __init__(self, muestras=MUESTRAS_LATENCIA):
+        self._latencias = defaultdict(lambda: deque(maxlen=muestras))
+        self._totales = defaultdict(int)
+        self._errores = defaultdict(int)
+
+    def registrar(self, ruta, segundos, error=False):
+        self._latencias[ruta].append(segundos)
+        self._totales[ruta] += 1
+        self._errores[ruta] += error
+
+    def estadisticas(self):
+        """Solicitudes, errores y percentiles 50/90/99 y máximo en milisegundos por ruta"""
+        resultado = {}
+        for ruta, latencias in self._latencias.items():
+            ms = np.fromiter(latencias, dtype=np.float64) * 1000
+            p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+            resultado[ruta] = {
+                "solicitudes": self._totales[ruta], "errores": self._errores[ruta],
+                "p50_ms": float(p50), "p90_ms": float(p90), "p99_ms": float(p99), "max_ms": float(ms.max()),
+            }
+        return resultado
+
+
+class ServicioEstadistico:
+    """Servidor HTTP/1.1 mínimo sobre asyncio con conexiones persistentes"""
+
+    def __init__(self, ventana=VENTANA_LOTE, maximo_por_lote=MAXIMO_POR_LOTE):
+        self.agrupador = AgrupadorSolicitudes(ventana, maximo_por_lote)
+        self.latencias = RegistroLatencias()
+        self._rutas = {"/intervalo": self.agrupador.intervalo, "/prueba": self.agrupador.prueba}
+
+    async def iniciar(self, host="127.0.0.1", puerto=8765):
+        """Empieza a escuchar; con puerto 0 el sistema elige uno libre (ver servidor.sockets)"""
+        return await asyncio.start_server(self._atender, host, puerto)
+
+    async def responder(self, metodo, ruta, cuerpo):
+        """(estado, objeto JSON) de una solicitud"""
+        ruta = ruta.split("?", 1)[0]
+        if ruta == "/estadisticas":
+            if metodo != "GET":
+                raise ErrorHTTP(405, "Use GET")
+            return 200, {"rutas": self.latencias.estadisticas(), "lotes": self.agrupador.estadisticas()}
+        calcular = self._rutas.get(ruta)
+        if calcular is None:
+            raise ErrorHTTP(404, f"Ruta desconocida: {ruta}")
+        if metodo != "POST":
+            raise ErrorHTTP(405, "Use POST")
+        try:
+            solicitud = json.loads(cuerpo or b"null")
+        except ValueError as e:
+            raise ErrorHTTP(400, f"JSON inválido: {e}") from None
+        if isinstance(solicitud, dict):
+            return 200, await calcular(solicitud)
+        if not isinstance(solicitud, list) or not all(isinstance(s, dict) for s in solicitud):
+            raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON o una lista de objetos")
+        return 200, list(await asyncio.gather(*(_resultado_o_error(calcular, s) for s in solicitud)))
+
+    async def _atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea.strip():
+                    break
+                inicio = time.perf_counter()
+                metodo, ruta, version = linea.decode("latin-1").split(None, 2)
+                encabezados = {}
+                while (encabezado := await lector.readline()) not in (b"\r\n", b"\n", b""):
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                longitud = int(encabezados.get("content-length", 0))
+
+                error = False
+                if longitud > MAXIMO_CUERPO:
+                    estado, respuesta, error = 413, {"error": "Cuerpo demasiado grande"}, True
+                else:
+                    cuerpo = await lector.readexactly(longitud)
+                    try:
+                        estado, respuesta = await self.responder(metodo, ruta, cuerpo)
+                    except ErrorHTTP as e:
+                        estado, respuesta, error = e.estado, {"error": str(e)}, True
+                    except (ValueError, TypeError) as e:
+                        estado, respuesta, error = 400, {"error": str(e)}, True
+
+                cerrar = (encabezados.get("connection", "").lower() == "close"
+                          or version.strip() == "HTTP/1.0" or estado == 413)
+                datos = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+                escritor.write(
+                    f"HTTP/1.1 {estado} {_ESTADOS[estado]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(datos)}\r\nConnection: {'close' if cerrar else 'keep-alive'}\r\n\r\n"
+                    .encode("latin-1") + datos)
+                await escritor.drain()
+                self.latencias.registrar(ruta.split("?", 1)[0], time.perf_counter() - inicio, error)
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+
+async def _servir(host, puerto, ventana):
+    servidor = await ServicioEstadistico(ventana).iniciar(host, puerto)
+    direccion = servidor.sockets[0].getsockname()
+    print(f"Escuchando en http://{direccion[0]}:{direccion[1]}")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de intervalos de confianza y pruebas de media.")
+    parser.add_argument("--host", default="127.0.0.1", help="dirección en la que escucha (por defecto 127.0.0.1)")
+    parser.add_argument("--puerto", type=int, default=8765, help="puerto (por defecto 8765)")
+    parser.add_argument("--ventana-ms", type=float, default=VENTANA_LOTE * 1000,
+                        help=f"espera para juntar solicitudes en un lote (por defecto {VENTANA_LOTE * 1000:g} ms)")
+    argumentos = parser.parse_args(args)
+    try:
+        asyncio.run(_servir(argumentos.host, argumentos.puerto, argumentos.ventana_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
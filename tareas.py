@@ -0,0 +1,228 @@
+"""Ejecución de cargas y cálculos fuera del hilo principal de Tk.
+
+Cada tarea corre en un hilo propio y se comunica con la interfaz solo por
+una cola que el hilo principal revisa con after(); así ningún widget se
+toca desde otro hilo. Las tareas se agrupan por canal ("intervalo",
+"carga", ...): enviar una tarea nueva a un canal cancela la anterior y
+descarta su resultado, en lugar de esperar a que termine.
+
+La cancelación es cooperativa: la función de la tarea recibe la Tarea y
+llama a tarea.progreso() entre bloques, que lanza TareaCancelada si se
+pidió cancelarla.
+
+VigilanteEdicion avisa, con un retardo, cuando el usuario deja de editar
+un campo; se usa para recalcular en vivo.
+"""
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+# Milisegundos entre revisiones de la cola mientras hay tareas activas
+INTERVALO_SONDEO = 50
+# Milisegundos sin cambios en un campo antes de recalcular en vivo
+ESPERA_EDICION = 300
+
+
+class TareaCancelada(Exception):
+    """Se lanza dentro de una tarea cuando se pidió cancelarla"""
+
+
+class Tarea:
+    """Trabajo en segundo plano de un canal; la función que lo ejecuta la recibe como argumento"""
+
+    def __init__(self, ejecutor, canal):
+        self.canal = canal
+        self._ejecutor = ejecutor
+        self._cancelada = threading.Event()
+
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+
+    def cancelar(self):
+        self._cancelada.set()
+
+    def verificar(self):
+        """Lanza TareaCancelada si se pidió cancelar la tarea"""
+        if self._cancelada.is_set():
+            raise TareaCancelada()
+
+    def progreso(self, fraccion=None, mensaje=None):
+        """Informa el avance (0 a 1, o None si no se conoce) y es punto de cancelación"""
+        self.verificar()
+        self._ejecutor._cola.put(("progreso", self, (fraccion, mensaje)))
+
+
+class EjecutorTareas:
+    """Ejecuta funciones en hilos de fondo y entrega sus resultados en el hilo de Tk.
+
+    Los callbacks al_terminar, al_error y al_progreso siempre se llaman desde
+    el hilo principal; los de tareas reemplazadas o canceladas no se llaman.
+    Si se indica una BarraTareas, muestra el progreso de la última tarea.
+    """
+
+    def __init__(self, raiz, barra=None, intervalo_ms=INTERVALO_SONDEO):
+        self.raiz = raiz
+        self.barra = barra
+        self.intervalo_ms = intervalo_ms
+        self._cola = queue.Queue()
+        self._activas = {}
+        self._callbacks = {}
+        self._sondeando = False
+        if barra is not None:
+            barra.ejecutor = self
+
+    def enviar(self, canal, funcion, al_terminar, al_error=None, al_progreso=None, mensaje=""):
+        """Ejecuta funcion(tarea) en segundo plano, cancelando la tarea anterior del canal"""
+        self.cancelar(canal)
+        tarea = Tarea(self, canal)
+        self._activas[canal] = tarea
+        self._callbacks[tarea] = (al_terminar, al_error, al_progreso)
+        if self.barra is not None:
+            self.barra.iniciar(mensaje)
+        threading.Thread(target=self._ejecutar, args=(tarea, funcion), daemon=True).start()
+        if not self._sondeando:
+            self._sondeando = True
+            self.raiz.after(self.intervalo_ms, self._sondear)
+        return tarea
+
+    def cancelar(self, canal=None):
+        """Cancela la tarea activa del canal, o todas si no se indica canal"""
+        canales = list(self._activas) if canal is None else [canal]
+        for nombre in canales:
+            tarea = self._activas.pop(nombre, None)
+            if tarea is not None:
+                tarea.cancelar()
+                self._callbacks.pop(tarea, None)
+        if self.barra is not None and canales and not self._activas:
+            self.barra.terminar("Cancelado" if canal is None else "")
+
+    def ocupado(self, canal=None):
+        return bool(self._activas) if canal is None else canal in self._activas
+
+    def _ejecutar(self, tarea, funcion):
+        try:
+            self._cola.put(("terminada", tarea, funcion(tarea)))
+        except TareaCancelada:
+            self._cola.put(("cancelada", tarea, None))
+        except Exception as e:
+            self._cola.put(("error", tarea, e))
+
+    def _sondear(self):
+        while True:
+            try:
+                evento, tarea, valor = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            # Los eventos de tareas reemplazadas o canceladas se descartan
+            if self._activas.get(tarea.canal) is not tarea:
+                continue
+            al_terminar, al_error, al_progreso = self._callbacks[tarea]
+            if evento == "progreso":
+                if self.barra is not None:
+                    self.barra.actualizar(*valor)
+                if al_progreso is not None:
+                    al_progreso(*valor)
+                continue
+            del self._activas[tarea.canal]
+            del self._callbacks[tarea]
+            if self.barra is not None and not self._activas:
+                self.barra.terminar()
+            if evento == "terminada":
+                al_terminar(valor)
+            elif evento == "error" and al_error is not None:
+                al_error(valor)
+
+        if self._activas:
+            self.raiz.after(self.intervalo_ms, self._sondear)
+        else:
+            self._sondeando = False
+
+
+class VigilanteEdicion:
+    """Llama a al_cambiar cuando un Entry o Text deja de cambiar durante espera_ms.
+
+    Solo avisa mientras está activo (activar(True)); cada cambio reinicia la
+    espera, así que al escribir o pegar se calcula una sola vez al final.
+    """
+
+    def __init__(self, widget, al_cambiar, espera_ms=ESPERA_EDICION):
+        self.widget = widget
+        self.al_cambiar = al_cambiar
+        self.espera_ms = espera_ms
+        self.activo = False
+        self._pendiente = None
+        if isinstance(widget, tk.Text):
+            widget.bind("<<Modified>>", self._modificado, add="+")
+        else:
+            # El Entry no tiene evento de cambio; se le asocia una variable y se vigila su escritura
+            self._variable = tk.StringVar(widget, widget.get())
+            widget.configure(textvariable=self._variable)
+            self._variable.trace_add("write", lambda *_: self._programar())
+
+    def activar(self, activo):
+        self.activo = activo
+        if not activo and self._pendiente is not None:
+            self.widget.after_cancel(self._pendiente)
+            self._pendiente = None
+
+    def _modificado(self, evento):
+        # <<Modified>> solo se repite si se baja la marca de modificado
+        if self.widget.edit_modified():
+            self.widget.edit_modified(False)
+            self._programar()
+
+    def _programar(self):
+        if not self.activo:
+            return
+        if self._pendiente is not None:
+            self.widget.after_cancel(self._pendiente)
+        self._pendiente = self.widget.after(self.espera_ms, self._avisar)
+
+    def _avisar(self):
+        self._pendiente = None
+        self.al_cambiar()
+
+
+class BarraTareas(tk.Frame):
+    """Barra de estado con el mensaje y el progreso de la tarea en curso y un botón para cancelarla"""
+
+    def __init__(self, master, **opciones):
+        super().__init__(master, **opciones)
+        self.ejecutor = None
+        self.etiqueta = tk.Label(self, text="", bg=self["bg"], anchor="w")
+        self.etiqueta.pack(side=tk.LEFT, padx=10)
+        self.barra = ttk.Progressbar(self, mode="determinate", maximum=100, length=250)
+        self.boton = ttk.Button(self, text="Cancelar", state="disabled",
+                                command=lambda: self.ejecutor and self.ejecutor.cancelar())
+        self.boton.pack(side=tk.RIGHT, padx=10)
+        self.barra.pack(side=tk.RIGHT, padx=10)
+
+    def iniciar(self, mensaje):
+        self.etiqueta.config(text=mensaje)
+        self.boton.config(state="normal")
+        self._indeterminada()
+
+    def actualizar(self, fraccion=None, mensaje=None):
+        if mensaje:
+            self.etiqueta.config(text=mensaje)
+        if fraccion is None:
+            self._indeterminada()
+            return
+        if str(self.barra["mode"]) != "determinate":
+            self.barra.stop()
+            self.barra.config(mode="determinate")
+        self.barra["value"] = fraccion * 100
+
+    def terminar(self, mensaje=""):
+        self.barra.stop()
+        self.barra.config(mode="determinate")
+        self.barra["value"] = 0
+        self.etiqueta.config(text=mensaje)
+        self.boton.config(state="disabled")
+
+    def _indeterminada(self):
+        if str(self.barra["mode"]) != "indeterminate":
+            self.barra.config(mode="indeterminate")
+            self.barra.start(15)